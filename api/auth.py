@@ -1,16 +1,24 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Annotated, Optional
+from typing import Annotated, Callable, Optional
 import os
 
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from api.database import get_db
 from api.models import User
 from api.schemas import TokenData
+from utils.config_loader import load_config
 
 # Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "09d25e094faa6ca2556c818166b7a9563b93f7099f6f0f4caa6cf63b88e8d3e7")
@@ -20,12 +28,108 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
+_auth_cfg = load_config().get("auth", {})
+
+# argon2 is deliberately slow and CPU-bound; async routes hash in this pool so
+# a burst of logins queues here instead of stalling the event loop
+_hash_executor = ThreadPoolExecutor(max_workers=_auth_cfg.get("hash_workers") or min(4, os.cpu_count() or 1),
+                                    thread_name_prefix="pwd-hash")
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+async def averify_password(plain_password, hashed_password):
+    return await asyncio.get_running_loop().run_in_executor(_hash_executor, verify_password, plain_password, hashed_password)
+
+async def aget_password_hash(password):
+    return await asyncio.get_running_loop().run_in_executor(_hash_executor, get_password_hash, password)
+
+
+class PrincipalCache:
+    """
+    Token subject -> detached User, for ``ttl_seconds``. Saves the user query
+    on every authenticated request; entries are dropped whenever a User row
+    is updated or deleted through the ORM in this process (see the events
+    below).
+
+    The cache is per process. Changes made by another worker process, or
+    written with Core statements that bypass the ORM, are not seen until the
+    entry expires, so a deleted or renamed user can keep authenticating for
+    up to ``ttl_seconds`` there. Set ``principal_cache_ttl_seconds: 0`` where
+    that window is unacceptable.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 1024,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[str, tuple[float, User]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, subject: str) -> Optional[User]:
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None:
+                return None
+            if entry[0] < self.clock():
+                del self._entries[subject]
+                return None
+            self._entries.move_to_end(subject)
+            return entry[1]
+
+    def put(self, subject: str, user: User) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[subject] = (self.clock() + self.ttl_seconds, user)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, subject: str) -> None:
+        with self._lock:
+            self._entries.pop(subject, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=_auth_cfg.get("principal_cache_ttl_seconds", 30),
+    max_entries=_auth_cfg.get("principal_cache_entries", 1024),
+)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_principal(mapper, connection, target):
+    principal_cache.invalidate(target.user_name)
+    # After a rename the old subject would still resolve to this user
+    for old_name in inspect(target).attrs.user_name.history.deleted:
+        principal_cache.invalidate(old_name)
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_principals_on_bulk_write(orm_execute_state):
+    # Bulk update()/delete() statements skip the mapper events and don't say which rows changed
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and \
+            any(mapper.class_ is User for mapper in orm_execute_state.all_mappers):
+        principal_cache.clear()
+
+async def _load_principal(db: AsyncSession, username: str) -> Optional[User]:
+    user = principal_cache.get(username)
+    if user is not None:
+        return user
+    user = (await db.execute(select(User).where(User.user_name == username))).scalars().first()
+    if user is not None:
+        # Detach so the request's commit cannot expire the cached instance
+        db.expunge(user)
+        principal_cache.put(username, user)
+    return user
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -36,7 +140,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: Session = Depends(get_db)):
+async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: AsyncSession = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -51,12 +155,12 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: Se
     except JWTError:
         raise credentials_exception
         
-    user = db.query(User).filter(User.user_name == token_data.username).first()
+    user = await _load_principal(db, token_data.username)
     if user is None:
         raise credentials_exception
     return user
 
-async def get_current_user_from_cookie(request: Request, db: Session = Depends(get_db)):
+async def get_current_user_from_cookie(request: Request, db: AsyncSession = Depends(get_db)):
     token = request.cookies.get("access_token")
     if not token:
         return None
@@ -74,5 +178,4 @@ async def get_current_user_from_cookie(request: Request, db: Session = Depends(g
     except JWTError:
         return None
         
-    user = db.query(User).filter(User.user_name == token_data.username).first()
-    return user
+    return await _load_principal(db, token_data.username)
@@ -1,24 +1,73 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+import os
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./checkmate.db"
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+from utils.config_loader import load_config
+
+_db_cfg = load_config().get("database", {})
+
+# Sync URLs (e.g. a DATABASE_URL shared with other tools) are mapped to their async driver
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+def _database_url():
+    url = make_url(os.getenv("DATABASE_URL") or _db_cfg.get("url", "sqlite+aiosqlite:///./checkmate.db"))
+    return url.set(drivername=_ASYNC_DRIVERS.get(url.drivername, url.drivername))
+
+SQLALCHEMY_DATABASE_URL = _database_url()
+IS_SQLITE = SQLALCHEMY_DATABASE_URL.get_backend_name() == "sqlite"
+
+engine = create_async_engine(
+    SQLALCHEMY_DATABASE_URL,
+    echo=_db_cfg.get("echo", False),
+    pool_size=_db_cfg.get("pool_size", 5),
+    max_overflow=_db_cfg.get("max_overflow", 10),
+    pool_timeout=_db_cfg.get("pool_timeout_seconds", 30),
+    pool_recycle=_db_cfg.get("pool_recycle_seconds", 1800),
+    pool_pre_ping=not IS_SQLITE,
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+if IS_SQLITE:
+    _sqlite_cfg = _db_cfg.get("sqlite", {})
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL lets readers proceed while a writer commits; busy_timeout makes
+        # writers wait for the lock instead of failing with "database is locked"
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA journal_mode={_sqlite_cfg.get('journal_mode', 'WAL')}")
+        cursor.execute(f"PRAGMA busy_timeout={int(_sqlite_cfg.get('busy_timeout_ms', 5000))}")
+        cursor.execute(f"PRAGMA synchronous={_sqlite_cfg.get('synchronous', 'NORMAL')}")
+        cursor.close()
+
+# expire_on_commit=False: attributes stay readable after commit without an implicit (sync) refresh
+SessionLocal = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
-
-def create_db_and_tables():
-    Base.metadata.create_all(bind=engine)
 
+def _add_missing_columns(connection):
+    # create_all never alters existing tables; add new nullable columns so older databases keep working
+    inspector = inspect(connection)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing and column.nullable:
+                column_type = column.type.compile(dialect=connection.dialect)
+                connection.exec_driver_sql(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}')
 
+async def create_db_and_tables():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
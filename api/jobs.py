@@ -0,0 +1,319 @@
+import asyncio
+import json
+import os
+import shutil
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy import or_, select, update
+
+from api.database import SessionLocal
+from api.models import CheckJob
+from utils.config_loader import load_config
+from utils.file_io import save_uploaded_file
+from logger import GLOBAL_LOGGER as log
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+FINISHED = {SUCCEEDED, FAILED, CANCELLED}
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+class JobQueue:
+    """
+    SQLite-backed queue of claim-check jobs drained by in-process asyncio workers.
+
+    Jobs live in the ``check_jobs`` table, so they survive restarts. A worker
+    claims a job with a conditional UPDATE, so several processes can share
+    the table without running a job twice, and refreshes ``heartbeat_at``
+    every ``heartbeat_seconds`` while it runs. Jobs whose heartbeat is older
+    than ``stale_after_seconds`` are re-queued (until ``max_attempts`` is
+    reached) by any live process. Cancellation is recorded in the table and
+    picked up by whichever worker is running the job.
+    """
+
+    def __init__(self, workers: int = 2, max_attempts: int = 3,
+                 poll_interval: float = 1.0, upload_dir: str = "data/jobs",
+                 max_upload_bytes: Optional[int] = None, heartbeat_seconds: float = 10.0,
+                 stale_after_seconds: float = 60.0):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.upload_dir = Path(upload_dir)
+        self.max_upload_bytes = max_upload_bytes
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_after_seconds = stale_after_seconds
+        self.instance_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._tasks: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._results_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+
+    @classmethod
+    def from_config(cls) -> "JobQueue":
+        config = load_config()
+        cfg = config.get("jobs", {})
+        return cls(
+            workers=cfg.get("workers", 2),
+            max_attempts=cfg.get("max_attempts", 3),
+            poll_interval=cfg.get("poll_interval_seconds", 1.0),
+            upload_dir=cfg.get("upload_dir", "data/jobs"),
+            max_upload_bytes=config.get("uploads", {}).get("max_bytes"),
+            heartbeat_seconds=cfg.get("heartbeat_seconds", 10.0),
+            stale_after_seconds=cfg.get("stale_after_seconds", 60.0),
+        )
+
+    # ---------------- DB helpers ---------------- #
+
+    def _stale(self):
+        cutoff = _now() - timedelta(seconds=self.stale_after_seconds)
+        return or_(CheckJob.heartbeat_at.is_(None), CheckJob.heartbeat_at < cutoff)
+
+    async def _recover(self) -> None:
+        """Re-queue running jobs whose worker stopped heartbeating; live jobs are left alone."""
+        async with SessionLocal() as db:
+            stale = (await db.execute(
+                select(CheckJob.id, CheckJob.attempts).where(CheckJob.status == RUNNING, self._stale())
+            )).all()
+            for job_id, attempts in stale:
+                fields = {"status": QUEUED} if attempts < self.max_attempts else \
+                    {"status": FAILED, "error": "Worker crashed too many times"}
+                # Re-check staleness in the UPDATE so a heartbeat that lands meanwhile wins
+                result = await db.execute(
+                    update(CheckJob)
+                    .where(CheckJob.id == job_id, CheckJob.status == RUNNING, self._stale())
+                    .values(worker_id=None, heartbeat_at=None, updated_at=_now(), **fields)
+                )
+                if result.rowcount:
+                    log.warning("Recovered orphaned job", job_id=job_id, status=fields["status"], attempts=attempts)
+            await db.commit()
+
+    async def _claim_next(self, worker_id: str) -> Optional[Dict]:
+        async with SessionLocal() as db:
+            candidates = (await db.execute(
+                select(CheckJob.id).where(CheckJob.status == QUEUED).order_by(CheckJob.created_at).limit(5)
+            )).scalars().all()
+            for job_id in candidates:
+                now = _now()
+                result = await db.execute(
+                    update(CheckJob)
+                    .where(CheckJob.id == job_id, CheckJob.status == QUEUED)
+                    .values(status=RUNNING, worker_id=worker_id, heartbeat_at=now, updated_at=now,
+                            attempts=CheckJob.attempts + 1)
+                )
+                await db.commit()
+                if result.rowcount != 1:
+                    # Another worker (possibly in another process) got there first
+                    continue
+                job = await db.get(CheckJob, job_id)
+                return {"id": job.id, "sources": job.sources, "collection_id": job.collection_id,
+                        "file_path": job.file_path, "worker_id": worker_id}
+            return None
+
+    async def _heartbeat(self, job: Dict) -> bool:
+        """Refresh the claim; False once this worker no longer owns the running job."""
+        async with SessionLocal() as db:
+            result = await db.execute(
+                update(CheckJob)
+                .where(CheckJob.id == job["id"], CheckJob.status == RUNNING, CheckJob.worker_id == job["worker_id"])
+                .values(heartbeat_at=_now())
+            )
+            await db.commit()
+            return result.rowcount == 1
+
+    async def _update(self, job_id: str, expected_status: Optional[str] = None,
+                      worker_id: Optional[str] = None, **fields) -> None:
+        async with SessionLocal() as db:
+            job = await db.get(CheckJob, job_id)
+            if job is None or (expected_status and job.status != expected_status):
+                return
+            if worker_id and job.worker_id != worker_id:
+                return
+            for key, value in fields.items():
+                setattr(job, key, value)
+            job.updated_at = _now()
+            await db.commit()
+
+    async def _append_result(self, job_id: str, item: Dict, worker_id: Optional[str] = None) -> Optional[str]:
+        # Claims finish concurrently; serialize the read-modify-write of the JSON column
+        async with self._results_lock, SessionLocal() as db:
+            job = await db.get(CheckJob, job_id)
+            if job is None:
+                return None
+            if worker_id and job.worker_id != worker_id:
+                # The claim went stale and the job was handed to another worker
+                return CANCELLED
+            if job.status == RUNNING:
+                results = json.loads(job.results or "[]")
+                results.append(item)
+                job.results = json.dumps(results)
+                job.updated_at = _now()
+                await db.commit()
+            return job.status
+
+    # ---------------- public API ---------------- #
+
+    async def submit(self, owner_id: int, uploaded_file, sources: Optional[List[str]] = None,
+                     collection_id: Optional[int] = None) -> str:
+        job_id = uuid.uuid4().hex
+        path = await asyncio.to_thread(save_uploaded_file, uploaded_file, self.upload_dir / job_id,
+                                       self.max_upload_bytes)
+        async with SessionLocal() as db:
+            db.add(CheckJob(
+                id=job_id,
+                owner_id=owner_id,
+                status=QUEUED,
+                sources=json.dumps(sources) if sources else None,
+                collection_id=collection_id,
+                file_path=str(path),
+                results="[]",
+            ))
+            await db.commit()
+        log.info("Job queued", job_id=job_id)
+        self._wakeup.set()
+        return job_id
+
+    async def cancel(self, job_id: str) -> None:
+        async with SessionLocal() as db:
+            job = await db.get(CheckJob, job_id)
+            if job is None or job.status in FINISHED:
+                return
+            job.status = CANCELLED
+            job.updated_at = _now()
+            await db.commit()
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+        log.info("Job cancelled", job_id=job_id)
+
+    async def start(self) -> None:
+        await self._recover()
+        self._tasks = [asyncio.create_task(self._worker(f"{self.instance_id}/{i}")) for i in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._reaper()))
+        log.info("Job workers started", workers=self.workers, instance=self.instance_id)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Hand our unfinished jobs back right away instead of waiting for them to go stale
+        async with SessionLocal() as db:
+            await db.execute(
+                update(CheckJob)
+                .where(CheckJob.status == RUNNING, CheckJob.worker_id.startswith(f"{self.instance_id}/"))
+                .values(status=QUEUED, worker_id=None, heartbeat_at=None, updated_at=_now())
+            )
+            await db.commit()
+
+    # ---------------- workers ---------------- #
+
+    @staticmethod
+    def _cleanup(job: Dict) -> None:
+        shutil.rmtree(Path(job["file_path"]).parent, ignore_errors=True)
+
+    async def _reaper(self) -> None:
+        # Picks up jobs of crashed workers in any process sharing the table
+        while True:
+            await asyncio.sleep(self.stale_after_seconds / 2)
+            try:
+                await self._recover()
+            except Exception as e:
+                log.error("Job recovery failed", error=str(e))
+            else:
+                self._wakeup.set()
+
+    async def _keep_alive(self, job: Dict, task: asyncio.Task) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                owned = await self._heartbeat(job)
+            except Exception as e:
+                log.warning("Job heartbeat failed", job_id=job["id"], error=str(e))
+                continue
+            if not owned:
+                # Cancelled, or recovered as stale and re-queued elsewhere: stop working on it
+                task.cancel()
+                return
+
+    async def _worker(self, worker_id: str) -> None:
+        while True:
+            job = await self._claim_next(worker_id)
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(self._run(job))
+            self._running[job["id"]] = task
+            keep_alive = asyncio.create_task(self._keep_alive(job, task))
+            try:
+                await task
+            except asyncio.CancelledError:
+                if not task.cancelled():
+                    # The worker itself is shutting down; leave the job for recovery
+                    task.cancel()
+                    raise
+                log.info("Job stopped after cancellation", job_id=job["id"], worker=worker_id)
+                if await self._may_cleanup(job):
+                    self._cleanup(job)
+            except Exception as e:
+                log.error("Job failed", job_id=job["id"], error=str(e))
+                await self._update(job["id"], RUNNING, worker_id, status=FAILED, error=str(e))
+                if await self._may_cleanup(job):
+                    self._cleanup(job)
+            finally:
+                keep_alive.cancel()
+                self._running.pop(job["id"], None)
+
+    async def _may_cleanup(self, job: Dict) -> bool:
+        # A re-queued or re-claimed job still needs its upload
+        async with SessionLocal() as db:
+            row = await db.get(CheckJob, job["id"])
+            return row is None or row.status in FINISHED or row.worker_id == job["worker_id"]
+
+    async def _run(self, job: Dict) -> None:
+        # Imported here so the queue module stays light for the API process
+        from src.checker.claims_checker import ClaimsChecker
+        from src.data_ingestion.data_ingestion import SourcesDataIngestion
+        from src.data_ingestion.source_collections import SourceCollectionIngestion
+
+        job_id = job["id"]
+        log.info("Job started", job_id=job_id)
+        worker_id = job["worker_id"]
+        # A retried job starts from scratch
+        await self._update(job_id, RUNNING, worker_id, results="[]", total_claims=None, error=None)
+
+        if job["collection_id"] is not None:
+            ingestion = SourceCollectionIngestion(collection_id=job["collection_id"])
+        else:
+            ingestion = SourcesDataIngestion(sources=json.loads(job["sources"]))
+        retriever = await ingestion.abuild_retriever()
+        checker = ClaimsChecker()
+        current = asyncio.current_task()
+
+        async def on_claims(claims):
+            await self._update(job_id, RUNNING, worker_id, total_claims=len(claims))
+
+        async def on_result(index, item):
+            if "error" in item:
+                return
+            status = await self._append_result(job_id, {"index": index, **item}, worker_id)
+            if status == CANCELLED:
+                # Cancelled from another process: stop the remaining claims
+                current.cancel()
+
+        with open(job["file_path"], "rb") as f:
+            results = await checker.acheck_claims(f, retriever, on_claims=on_claims, on_result=on_result)
+
+        await self._update(job_id, RUNNING, worker_id, status=SUCCEEDED, results=json.dumps(results))
+        self._cleanup(job)
+        log.info("Job finished", job_id=job_id, results=len(results))
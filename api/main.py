@@ -1,19 +1,55 @@
+import asyncio
+import signal
+import sys
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from api.database import create_db_and_tables
-from api.routers import auth, users, frontend
+from api.database import create_db_and_tables, engine
+from api.jobs import JobQueue
+from api.routers import auth, users, frontend, collections, jobs
+from utils.model_loader import reload_model_loader
+from logger import GLOBAL_LOGGER as log
 import api.models # Register models
 
+def _reload_models() -> None:
+    # SIGHUP: re-read .env and config.yaml and swap models; in-flight checks finish on the old clients
+    try:
+        reload_model_loader()
+    except Exception as e:
+        log.error("Model reload failed, keeping the current models", error=str(e))
+
+def _install_reload_handler() -> bool:
+    sighup = getattr(signal, "SIGHUP", None)
+    if sighup is None:
+        return False
+    try:
+        asyncio.get_running_loop().add_signal_handler(sighup, _reload_models)
+    except (NotImplementedError, RuntimeError, ValueError):
+        # Not the main thread (e.g. TestClient) or no loop signal support
+        return False
+    return True
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    create_db_and_tables()
+    await create_db_and_tables()
+    app.state.job_queue = JobQueue.from_config()
+    await app.state.job_queue.start()
+    reload_installed = _install_reload_handler()
     yield
+    if reload_installed:
+        asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+    await app.state.job_queue.stop()
+    if "src.data_ingestion.source_cache" in sys.modules:
+        # Only loaded once a check has fetched sources
+        await sys.modules["src.data_ingestion.source_cache"].close_sessions()
+    await engine.dispose()
 
 app = FastAPI(lifespan=lifespan)
 
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(frontend.router)
+app.include_router(collections.router)
+app.include_router(jobs.router)
 from api.routers import check
 app.include_router(check.router)
 
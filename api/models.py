@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
 from api.database import Base
 
 class User(Base):
@@ -9,3 +10,29 @@ class User(Base):
     full_name = Column(String)
     email = Column(String, unique=True)
     hashed_password = Column(String)
+
+class SourceCollection(Base):
+    __tablename__ = "source_collections"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String)
+    owner_id = Column(Integer, ForeignKey("users.id"), index=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+class CheckJob(Base):
+    __tablename__ = "check_jobs"
+
+    id = Column(String, primary_key=True, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), index=True)
+    status = Column(String, index=True, default="queued")
+    sources = Column(Text)  # JSON list of URLs, or NULL when collection_id is set
+    collection_id = Column(Integer, nullable=True)
+    file_path = Column(String)
+    attempts = Column(Integer, default=0)
+    total_claims = Column(Integer, nullable=True)
+    results = Column(Text, default="[]")  # JSON list, filled in as claims complete
+    error = Column(Text, nullable=True)
+    worker_id = Column(String, nullable=True)  # holder of the claim while running
+    heartbeat_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
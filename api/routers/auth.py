@@ -3,13 +3,13 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Form
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.auth import ACCESS_TOKEN_EXPIRE_MINUTES, create_access_token, get_password_hash, verify_password
+from api.auth import ACCESS_TOKEN_EXPIRE_MINUTES, aget_password_hash, averify_password, create_access_token
 from api.database import get_db
 from api.models import User
 from api.schemas import Token, UserCreate
-from sqlalchemy.future import select
 
 router = APIRouter(
     prefix="/auth",
@@ -17,16 +17,20 @@ router = APIRouter(
 )
 
 @router.post("/register", response_model=Token)
-def register(user_in: UserCreate, db: Session = Depends(get_db)):
+async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
     # Check existing user
-    user = db.query(User).filter((User.user_name == user_in.user_name) | (User.email == user_in.email)).first()
+    user = (await db.execute(
+        select(User).where(or_(User.user_name == user_in.user_name, User.email == user_in.email))
+    )).scalars().first()
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username or email already registered"
         )
         
-    hashed_password = get_password_hash(user_in.password)
+    # End the read transaction so no connection is held while waiting on the hash pool
+    await db.rollback()
+    hashed_password = await aget_password_hash(user_in.password)
     new_user = User(
         user_name=user_in.user_name,
         full_name=user_in.full_name,
@@ -34,8 +38,8 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
         hashed_password=hashed_password
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -46,11 +50,14 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    user = db.query(User).filter(User.user_name == form_data.username).first()
-    
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = (await db.execute(select(User).where(User.user_name == form_data.username))).scalars().first()
+    # Give the connection back before queueing for a hash worker; a login storm
+    # would otherwise exhaust the pool for every other route
+    await db.close()
+
+    if not user or not await averify_password(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -68,10 +75,11 @@ async def login_cookie(
     response: Response,
     username: str = Form(...),
     password: str = Form(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    user = db.query(User).filter(User.user_name == username).first()
-    if not user or not verify_password(password, user.hashed_password):
+    user = (await db.execute(select(User).where(User.user_name == username))).scalars().first()
+    await db.close()
+    if not user or not await averify_password(password, user.hashed_password):
         # Return to login page with error (handled by frontend logic usually, 
         # but for simplicity we might redirect or return error)
         # return RedirectResponse(url="/login?error=Invalid Credentials", status_code=303)
@@ -1,55 +1,159 @@
-from typing import List, Annotated
+from typing import List, Annotated, Optional
 import json
-from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
+import os
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from api.auth import get_current_user_from_cookie
+from api.database import get_db
 from api.models import User
+from api.routers.collections import get_owned_collection
 from src.checker.claims_checker import ClaimsChecker
+from utils.model_loader import get_model_loader
+from utils.file_io import UploadTooLarge
 from src.data_ingestion.data_ingestion import SourcesDataIngestion
+from src.data_ingestion.source_collections import SourceCollectionIngestion
 from logger import GLOBAL_LOGGER as log
 
 router = APIRouter(tags=["check"])
 
+# For save_uploaded_file compatibility, we need to ensure the file object
+# behaves as expected or pass the raw file-like object if it has the attributes.
+# However, save_uploaded_file calls .read(). FastAPI's UploadFile.read() is async.
+# But UploadFile.file.read() is sync.
+# Let's wrap it to ensure compatibility.
+class FileWrapper:
+    def __init__(self, upload_file):
+        self.name = upload_file.filename
+        self.file = upload_file.file
+    def read(self, size: int = -1):
+        return self.file.read(size)
+
+def _upload_size(file: UploadFile) -> Optional[int]:
+    # Starlette has already spooled the body to a temp file; measure it if it didn't record the size
+    if file.size is not None:
+        return file.size
+    try:
+        position = file.file.tell()
+        size = file.file.seek(0, os.SEEK_END)
+        file.file.seek(position)
+        return size
+    except (AttributeError, OSError):
+        return None
+
+def _max_upload_bytes() -> Optional[int]:
+    # Read per request from the shared loader, so a config reload (SIGHUP) applies to the next upload
+    return get_model_loader().config.get("uploads", {}).get("max_bytes")
+
+def _check_upload_size(file: UploadFile) -> None:
+    size = _upload_size(file)
+    if size is None:
+        return
+    limit = _max_upload_bytes()
+    if limit is not None and size > limit:
+        raise HTTPException(status_code=413, detail=f"Upload exceeds the {limit} byte limit")
+
+def _upload_too_large(exc: BaseException) -> Optional[UploadTooLarge]:
+    """The UploadTooLarge behind a pipeline error, which arrives wrapped in DocumentPortalException."""
+    while exc is not None:
+        if isinstance(exc, UploadTooLarge):
+            return exc
+        exc = exc.__cause__ or exc.__context__
+    return None
+
+async def _resolve_sources(db: AsyncSession, user: User, sources: Optional[str],
+                           collection_id: Optional[int]) -> Optional[List[str]]:
+    """Validate the request's source selection; returns the URL list, or None for a collection."""
+    if collection_id is not None:
+        await get_owned_collection(db, collection_id, user)
+        return None
+    source_list = json.loads(sources) if sources else []
+    if not source_list:
+         raise HTTPException(status_code=400, detail="No sources provided")
+    return source_list
+
+def _make_ingestion(source_list: Optional[List[str]], collection_id: Optional[int]):
+    if collection_id is not None:
+        return SourceCollectionIngestion(collection_id=collection_id)
+    return SourcesDataIngestion(sources=source_list)
+
 @router.post("/check-claims")
 async def check_claims_endpoint(
+    request: Request,
     file: UploadFile = File(...),
-    sources: str = Form(...), # JSON string of sources
-    current_user: User = Depends(get_current_user_from_cookie)
+    sources: Optional[str] = Form(None), # JSON string of sources
+    collection_id: Optional[int] = Form(None), # or a saved source collection
+    background: bool = Form(False), # enqueue and return a job id instead of waiting
+    current_user: User = Depends(get_current_user_from_cookie),
+    db: AsyncSession = Depends(get_db)
 ):
     if not current_user:
         raise HTTPException(status_code=401, detail="Not authenticated")
-        
+
     try:
-        source_list = json.loads(sources)
-        if not source_list:
-             raise HTTPException(status_code=400, detail="No sources provided")
-             
+        _check_upload_size(file)
+        source_list = await _resolve_sources(db, current_user, sources, collection_id)
+        # A claim check runs for minutes; don't keep a pooled connection meanwhile
+        await db.close()
+        wrapped_file = FileWrapper(file)
+
+        if background:
+            job_id = await request.app.state.job_queue.submit(
+                current_user.id, wrapped_file, source_list, collection_id,
+            )
+            return JSONResponse(status_code=202, content={"job_id": job_id, "status": "queued"})
+
         # Initialize Ingestion
-        ingestion = SourcesDataIngestion(sources=source_list)
-        retriever = ingestion.build_retriever()
+        ingestion = _make_ingestion(source_list, collection_id)
+        retriever = await ingestion.abuild_retriever()
         
         # Initialize Checker
         checker = ClaimsChecker()
         
-        # For save_uploaded_file compatibility, we need to ensure the file object 
-        # behaves as expected or pass the raw file-like object if it has the attributes.
-        # FastAPI UploadFile works with the updated utility.
-        # However, save_uploaded_file calls .read(). FastAPI's UploadFile.read() is async.
-        # But UploadFile.file.read() is sync.
-        # Let's wrap it to ensure compatibility.
+        results = await checker.acheck_claims(wrapped_file, retriever)
         
-        class FileWrapper:
-            def __init__(self, upload_file):
-                self.name = upload_file.filename
-                self.file = upload_file.file
-            def read(self):
-                return self.file.read()
-        
-        wrapped_file = FileWrapper(file)
-        
-        results = checker.check_claims(wrapped_file, retriever)
-        
-        return {"results": results}
+        return {"results": results, "skipped_sources": ingestion.skipped_sources}
         
+    except HTTPException:
+        raise
     except Exception as e:
+        if too_large := _upload_too_large(e):
+            raise HTTPException(status_code=413, detail=str(too_large))
         log.error("Error during claim check", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/check-claims/stream")
+async def check_claims_stream_endpoint(
+    file: UploadFile = File(...),
+    sources: Optional[str] = Form(None), # JSON string of sources
+    collection_id: Optional[int] = Form(None), # or a saved source collection
+    current_user: User = Depends(get_current_user_from_cookie),
+    db: AsyncSession = Depends(get_db)
+):
+    """Same as /check-claims but streams NDJSON events as each verdict lands."""
+    if not current_user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+
+    _check_upload_size(file)
+    source_list = await _resolve_sources(db, current_user, sources, collection_id)
+    await db.close()
+    wrapped_file = FileWrapper(file)
+
+    async def events():
+        try:
+            ingestion = _make_ingestion(source_list, collection_id)
+            retriever = await ingestion.abuild_retriever()
+            if ingestion.skipped_sources:
+                yield json.dumps({"type": "sources_skipped", "sources": ingestion.skipped_sources}) + "\n"
+            checker = ClaimsChecker()
+            async for event in checker.astream_check_claims(wrapped_file, retriever):
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            if too_large := _upload_too_large(e):
+                # Only reachable when the size was unknown up front; headers are already sent
+                yield json.dumps({"type": "error", "status": 413, "detail": str(too_large)}) + "\n"
+                return
+            log.error("Error during streamed claim check", error=str(e))
+            yield json.dumps({"type": "error", "detail": str(e)}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
@@ -0,0 +1,126 @@
+import asyncio
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.auth import get_current_user_from_cookie
+from api.database import get_db
+from api.models import SourceCollection, User
+from api.schemas import CollectionCreate, CollectionResponse, CollectionSourcesUpdate
+from src.data_ingestion.source_collections import SourceCollectionIngestion, delete_collection_index, load_manifest
+from logger import GLOBAL_LOGGER as log
+
+router = APIRouter(prefix="/collections", tags=["collections"])
+
+# Sources are fetched concurrently on the event loop; embedding and index I/O
+# block, so they run in worker threads (asyncio.to_thread).
+
+def _require_user(user: User | None) -> User:
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    return user
+
+async def get_owned_collection(db: AsyncSession, collection_id: int, user: User) -> SourceCollection:
+    collection = (await db.execute(select(SourceCollection).where(
+        SourceCollection.id == collection_id, SourceCollection.owner_id == user.id
+    ))).scalars().first()
+    if not collection:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Collection not found")
+    return collection
+
+async def _to_response(collection: SourceCollection, skipped_sources: List[dict] | None = None) -> CollectionResponse:
+    # The manifest read can wait on a file lock held by a writer in another worker
+    manifest = await asyncio.to_thread(load_manifest, collection.id)
+    return CollectionResponse(id=collection.id, name=collection.name, sources=list(manifest),
+                              skipped_sources=skipped_sources or [])
+
+@router.post("", response_model=CollectionResponse, status_code=status.HTTP_201_CREATED)
+async def create_collection(
+    collection_in: CollectionCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User | None = Depends(get_current_user_from_cookie),
+):
+    user = _require_user(current_user)
+    collection = SourceCollection(name=collection_in.name, owner_id=user.id)
+    db.add(collection)
+    await db.commit()
+    await db.refresh(collection)
+
+    skipped = []
+    if collection_in.sources:
+        try:
+            ingestion = SourceCollectionIngestion(collection_id=collection.id)
+            await ingestion.aadd_sources(collection_in.sources)
+            skipped = ingestion.skipped_sources
+        except Exception as e:
+            log.error("Failed to index collection sources", collection_id=collection.id, error=str(e))
+            await db.delete(collection)
+            await db.commit()
+            raise HTTPException(status_code=500, detail=str(e))
+
+    return await _to_response(collection, skipped)
+
+@router.get("", response_model=List[CollectionResponse])
+async def list_collections(
+    db: AsyncSession = Depends(get_db),
+    current_user: User | None = Depends(get_current_user_from_cookie),
+):
+    user = _require_user(current_user)
+    collections = (await db.execute(
+        select(SourceCollection).where(SourceCollection.owner_id == user.id)
+    )).scalars().all()
+    return list(await asyncio.gather(*(_to_response(c) for c in collections)))
+
+@router.get("/{collection_id}", response_model=CollectionResponse)
+async def read_collection(
+    collection_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User | None = Depends(get_current_user_from_cookie),
+):
+    user = _require_user(current_user)
+    return await _to_response(await get_owned_collection(db, collection_id, user))
+
+@router.delete("/{collection_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_collection(
+    collection_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User | None = Depends(get_current_user_from_cookie),
+):
+    user = _require_user(current_user)
+    collection = await get_owned_collection(db, collection_id, user)
+    await asyncio.to_thread(delete_collection_index, collection.id)
+    await db.delete(collection)
+    await db.commit()
+
+@router.post("/{collection_id}/sources", response_model=CollectionResponse)
+async def add_collection_sources(
+    collection_id: int,
+    update: CollectionSourcesUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User | None = Depends(get_current_user_from_cookie),
+):
+    user = _require_user(current_user)
+    collection = await get_owned_collection(db, collection_id, user)
+    try:
+        ingestion = SourceCollectionIngestion(collection_id=collection.id)
+        await ingestion.aadd_sources(update.urls)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return await _to_response(collection, ingestion.skipped_sources)
+
+@router.delete("/{collection_id}/sources", response_model=CollectionResponse)
+async def remove_collection_sources(
+    collection_id: int,
+    update: CollectionSourcesUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User | None = Depends(get_current_user_from_cookie),
+):
+    user = _require_user(current_user)
+    collection = await get_owned_collection(db, collection_id, user)
+    try:
+        await asyncio.to_thread(SourceCollectionIngestion(collection_id=collection.id).remove_sources, update.urls)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return await _to_response(collection)
@@ -0,0 +1,65 @@
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.auth import get_current_user_from_cookie
+from api.database import get_db
+from api.jobs import FINISHED, SUCCEEDED
+from api.models import CheckJob, User
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+async def _get_owned_job(db: AsyncSession, job_id: str, user: User | None) -> CheckJob:
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    job = (await db.execute(
+        select(CheckJob).where(CheckJob.id == job_id, CheckJob.owner_id == user.id)
+    )).scalars().first()
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+@router.get("/{job_id}")
+async def read_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User | None = Depends(get_current_user_from_cookie),
+):
+    """Status plus whatever verdicts have been produced so far."""
+    job = await _get_owned_job(db, job_id, current_user)
+    partial = json.loads(job.results or "[]")
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "attempts": job.attempts,
+        "total_claims": job.total_claims,
+        "completed_claims": len(partial),
+        "results": partial,
+        "error": job.error,
+    }
+
+@router.get("/{job_id}/results")
+async def read_job_results(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User | None = Depends(get_current_user_from_cookie),
+):
+    job = await _get_owned_job(db, job_id, current_user)
+    if job.status != SUCCEEDED:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Job is {job.status}")
+    return {"results": json.loads(job.results)}
+
+@router.delete("/{job_id}")
+async def cancel_job(
+    job_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User | None = Depends(get_current_user_from_cookie),
+):
+    job = await _get_owned_job(db, job_id, current_user)
+    if job.status in FINISHED:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Job is already {job.status}")
+    await request.app.state.job_queue.cancel(job.id)
+    return {"job_id": job.id, "status": "cancelled"}
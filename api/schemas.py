@@ -20,3 +20,16 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     username: str | None = None
+
+class CollectionCreate(BaseModel):
+    name: str
+    sources: list[str] = []
+
+class CollectionSourcesUpdate(BaseModel):
+    urls: list[str]
+
+class CollectionResponse(BaseModel):
+    id: int
+    name: str
+    sources: list[str]
+    skipped_sources: list[dict] = []
@@ -0,0 +1,76 @@
+"""
+Recall@k vs latency vs memory for the FAISS index types in config.yaml's faiss_db block.
+
+Uses synthetic clustered vectors (roughly how chunk embeddings from a few
+sources behave) and exact Flat search as ground truth.
+
+    python -m benchmarks.faiss_indexes --n 200000 --dim 384 --queries 1000 --k 10
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.data_ingestion.faiss_index import INDEX_TYPES, apply_search_params, factory_string, index_settings
+from utils.config_loader import load_config
+
+
+def make_data(n: int, dim: int, queries: int, clusters: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=n + queries)
+    data = centers[labels] + 0.3 * rng.normal(size=(n + queries, dim)).astype(np.float32)
+    return data[:n], data[n:]
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    hits = sum(len(set(f[f >= 0]) & set(t)) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+def run(args) -> None:
+    cfg = load_config().get("faiss_db", {})
+    base, queries = make_data(args.n, args.dim, args.queries, args.clusters)
+
+    exact = faiss.IndexFlatL2(args.dim)
+    exact.add(base)
+    _, truth = exact.search(queries, args.k)
+
+    print(f"n={args.n} dim={args.dim} queries={args.queries} k={args.k}")
+    print(f"{'index':<22}{'build s':>9}{'recall@k':>10}{'ms/query':>10}{'MiB':>9}")
+    for index_type in args.types:
+        settings = index_settings({**cfg, "index_type": index_type})
+        description = factory_string(settings, args.dim, args.n)
+
+        start = time.perf_counter()
+        index = faiss.index_factory(args.dim, description)
+        if hasattr(index, "hnsw"):
+            index.hnsw.efConstruction = settings["ef_construction"]
+        if not index.is_trained:
+            index.train(base)
+        index.add(base)
+        build = time.perf_counter() - start
+        apply_search_params(index, cfg)
+
+        start = time.perf_counter()
+        _, found = index.search(queries, args.k)
+        latency = (time.perf_counter() - start) * 1000 / args.queries
+
+        size = faiss.serialize_index(index).nbytes / 2 ** 20
+        print(f"{description:<22}{build:>9.2f}{recall_at_k(found, truth):>10.3f}{latency:>10.3f}{size:>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--types", nargs="+", default=list(INDEX_TYPES), choices=INDEX_TYPES)
+    run(parser.parse_args())
@@ -0,0 +1,95 @@
+"""
+Latency of an unrelated authenticated route (GET /users/me) while a storm of
+logins hits /auth/token, against an in-process app on one event loop.
+
+Prints p50/p95/p99 for a quiet baseline and for the storm. ``--inline``
+verifies passwords on the event loop (the old behaviour) for comparison.
+
+    python -m benchmarks.login_storm --probes 300 --storm-concurrency 32
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import api.models  # noqa: F401  (register models)
+from api.database import create_db_and_tables
+from api.main import app
+
+USER = {"user_name": "loadtest", "email": "loadtest@example.com", "password": "loadtest-password",
+        "full_name": "Load Test"}
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def token(client: httpx.AsyncClient) -> str:
+    await client.post("/auth/register", json=USER)
+    response = await client.post("/auth/token", data={"username": USER["user_name"], "password": USER["password"]})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def probe(client: httpx.AsyncClient, headers: dict, count: int, interval: float):
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = await client.get("/users/me", headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def storm(client: httpx.AsyncClient, stop: asyncio.Event, counter: list):
+    credentials = {"username": USER["user_name"], "password": USER["password"]}
+    while not stop.is_set():
+        await client.post("/auth/token", data=credentials)
+        counter[0] += 1
+
+
+async def run(args) -> None:
+    await create_db_and_tables()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        headers = {"Authorization": f"Bearer {await token(client)}"}
+
+        print(f"{'phase':<10}{'logins':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        for phase in ("baseline", "storm"):
+            stop, counter = asyncio.Event(), [0]
+            workers = []
+            if phase == "storm":
+                workers = [asyncio.create_task(storm(client, stop, counter)) for _ in range(args.storm_concurrency)]
+            latencies = await probe(client, headers, args.probes, args.interval)
+            stop.set()
+            await asyncio.gather(*workers)
+            print(f"{phase:<10}{counter[0]:>8}{percentile(latencies, 0.5):>9.1f}"
+                  f"{percentile(latencies, 0.95):>9.1f}{percentile(latencies, 0.99):>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--probes", type=int, default=300)
+    parser.add_argument("--interval", type=float, default=0.005, help="seconds between probe requests")
+    parser.add_argument("--storm-concurrency", type=int, default=32)
+    parser.add_argument("--inline", action="store_true", help="verify passwords on the event loop")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    if args.inline:
+        import api.routers.auth as auth_routes
+        from api.auth import verify_password
+
+        async def verify_inline(plain, hashed):
+            return verify_password(plain, hashed)
+
+        auth_routes.averify_password = verify_inline
+    asyncio.run(run(args))
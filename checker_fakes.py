@@ -0,0 +1,105 @@
+"""
+Test doubles shared by the claim checker tests: a scripted LLM, a
+ClaimsChecker built without loading any models, a small FAISS retriever
+and an in-memory upload.
+"""
+import asyncio
+import io
+import json
+import re
+from types import SimpleNamespace
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.runnables import RunnableLambda
+
+from model.models import PromptLoader
+from prompt.prompt_library import PROMPT_REGISTRY, prompt_version
+from src.checker.claims_checker import ClaimsChecker
+
+CLAIMS = ["The sky is blue.", "Water boils at 100C.", "Grass is green.", "Snow is cold."]
+SINGLE_VERDICT = "**Verdict**: NOT_MENTIONED\n**Explanation**: single"
+
+
+def _supported(numbers):
+    return json.dumps([{"index": n, "verdict": "SUPPORTED", "explanation": "batched"} for n in numbers])
+
+
+class FakeLLM:
+    """
+    Answers by prompt kind: ``extract(text)`` for claim extraction,
+    ``batch_answer(numbers)`` for batched verification and ``answer(claim)``
+    for single-claim verification. ``delay(claim)`` adds latency to async
+    single-claim calls so they can finish out of order.
+    """
+
+    def __init__(self, answer=None, batch_answer=None, extract=None, delay=None):
+        self.answer = answer or (lambda claim: SINGLE_VERDICT)
+        self.batch_answer = batch_answer or _supported
+        self.extract = extract or (lambda text: f"1. {text}")
+        self.delay = delay
+        self.single_calls = 0
+        self.batch_calls = 0
+        self.extract_calls = 0
+
+    @staticmethod
+    def _claim(text):
+        return re.search(r"Claim: (.*)", text).group(1).strip()
+
+    def _answer(self, prompt):
+        text = prompt.to_string()
+        if "Extract key claims" in text:
+            self.extract_calls += 1
+            return self.extract(re.search(r"Text:\s*(.*?)\s*Key Claims:", text, re.S).group(1))
+        if "JSON array" in text:
+            self.batch_calls += 1
+            return self.batch_answer([int(n) for n in re.findall(r"Claim \[(\d+)\]", text)])
+        self.single_calls += 1
+        return self.answer(self._claim(text))
+
+    async def _aanswer(self, prompt):
+        text = prompt.to_string()
+        if self.delay is not None and "Claim: " in text:
+            await asyncio.sleep(self.delay(self._claim(text)))
+        return self._answer(prompt)
+
+    def runnable(self):
+        return RunnableLambda(self._answer, afunc=self._aanswer)
+
+
+def make_checker(llm=None, tmp_path=None, **config):
+    """
+    ClaimsChecker with the real prompts and a fake model loader; keyword
+    arguments become config sections (default: single-claim verification).
+    Caches are off; tests that need one set it on the returned checker.
+    """
+    llm = llm or FakeLLM()
+    checker = ClaimsChecker.__new__(ClaimsChecker)
+    for name, prompt in (("fetch_claims", PromptLoader.FETCH_KEY_CLAIMS), ("fact_check", PromptLoader.FACT_CHECK),
+                         ("batch_fact_check", PromptLoader.BATCH_FACT_CHECK)):
+        setattr(checker, f"{name}_prompt", PROMPT_REGISTRY[prompt.value])
+        setattr(checker, f"{name}_version", prompt_version(prompt.value))
+    checker.verdict_cache = None
+    checker.document_cache = None
+    checker.temp_dir = tmp_path / "uploads" if tmp_path is not None else None
+    config.setdefault("verification", {"mode": "single", "max_concurrency": 4})
+    checker.model_loader = SimpleNamespace(
+        config=config,
+        load_llm=llm.runnable,
+        llm_identity=lambda: "fake",
+        load_embeddings=lambda: DeterministicFakeEmbedding(size=8),
+    )
+    return checker
+
+
+def make_retriever(texts=None, embedding=None, k=2):
+    from langchain_community.vectorstores import FAISS
+
+    texts = texts or [f"source text {i}" for i in range(6)]
+    store = FAISS.from_texts(texts, embedding or DeterministicFakeEmbedding(size=8))
+    return store.as_retriever(search_kwargs={"k": k})
+
+
+def make_upload(payload=b"%PDF-1.4 fake", name="doc.pdf"):
+    upload = io.BytesIO(payload)
+    upload.name = name
+    return upload
@@ -16,7 +16,8 @@ class CustomLogger:
         logger_name = os.path.basename(name)
 
         # Configure logging for console + file (both JSON)
-        file_handler = logging.FileHandler(self.log_file_path)
+        # delay=True: the file is only created when the first record is written
+        file_handler = logging.FileHandler(self.log_file_path, delay=True)
         file_handler.setLevel(logging.INFO)
         file_handler.setFormatter(logging.Formatter("%(message)s"))  # Raw JSON lines
 
@@ -1,5 +1,14 @@
 from enum import Enum
+from typing import Literal
+from pydantic import BaseModel
 
 class PromptLoader(str, Enum):
     FETCH_KEY_CLAIMS = "fetch_key_claims"
     FACT_CHECK = "fact_check"
+    BATCH_FACT_CHECK = "batch_fact_check"
+
+class ClaimVerdict(BaseModel):
+    """One entry of the batch_fact_check JSON array."""
+    index: int
+    verdict: Literal["SUPPORTED", "CONTRADICTED", "NOT_MENTIONED"]
+    explanation: str
@@ -1,3 +1,4 @@
+import hashlib
 from langchain_core.prompts import PromptTemplate, ChatPromptTemplate, MessagesPlaceholder
 
 fetch_key_claims_prompt = PromptTemplate.from_template(
@@ -31,9 +32,30 @@ fact_check_prompt = PromptTemplate.from_template(
     """
 )
 
+batch_fact_check_prompt = PromptTemplate.from_template(
+    """
+    You are a strict fact-checker. Verify each numbered claim below based ONLY on the context listed under that same claim.
+    Never use one claim's context to judge another claim.
+    
+    {claims}
+    
+    For every claim, determine if it is SUPPORTED, CONTRADICTED, or NOT_MENTIONED by its context.
+    Provide a brief explanation citing specific parts of the context.
+    
+    Output Format:
+    Return ONLY a JSON array with one object per claim and no other text:
+    [{{"index": <claim number>, "verdict": "SUPPORTED" | "CONTRADICTED" | "NOT_MENTIONED", "explanation": "<your explanation>"}}]
+    """
+)
+
 
 PROMPT_REGISTRY = {
     "fetch_key_claims": fetch_key_claims_prompt,
     "fact_check": fact_check_prompt,
+    "batch_fact_check": batch_fact_check_prompt,
 }
 
+
+def prompt_version(name: str) -> str:
+    """Short hash of a registered prompt's template; changes whenever the wording does."""
+    return hashlib.sha256(PROMPT_REGISTRY[name].template.encode("utf-8")).hexdigest()[:12]
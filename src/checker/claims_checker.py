@@ -1,16 +1,26 @@
 from utils.file_io import generate_session_id
 from logger import GLOBAL_LOGGER as log
 from exception.custom_exception import DocumentPortalException
-from utils.model_loader import ModelLoader
+from utils.model_loader import get_model_loader
 from pathlib import Path
-from typing import Optional
-from utils.file_io import save_uploaded_file
-from utils.document_ops import load_documents
-from model.models import PromptLoader
-from prompt.prompt_library import PROMPT_REGISTRY
-from langchain_core.runnables import RunnablePassthrough
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from utils.file_io import save_uploaded_file_hashed
+from utils.document_ops import lazy_load
+from model.models import ClaimVerdict, PromptLoader
+from prompt.prompt_library import PROMPT_REGISTRY, prompt_version
+from utils.verdict_cache import VerdictCache, context_fingerprint
+from utils.document_cache import DocumentCache
+from utils.vector_search import batch_searchable, batch_similarity_search, search_embeddings
 from langchain_core.output_parsers import StrOutputParser
+from langchain_core.documents import Document
+from pydantic import ValidationError
+import asyncio
+import json
 import re
+import numpy as np
+
+ClaimsCallback = Callable[[List[str]], Awaitable[None]]
+ResultCallback = Callable[[int, Dict[str, Any]], Awaitable[None]]
 
 class ClaimsChecker:
     def __init__( self,
@@ -19,7 +29,7 @@ class ClaimsChecker:
         session_id: Optional[str] = None,
     ):
         try:
-            self.model_loader = ModelLoader()
+            self.model_loader = get_model_loader()
             self.session_id = session_id or generate_session_id()
             
             self.temp_base = Path(temp_base); self.temp_base.mkdir(parents=True, exist_ok=True)
@@ -31,6 +41,28 @@ class ClaimsChecker:
             # Use PROMPT_REGISTRY to load prompts
             self.fetch_claims_prompt = PROMPT_REGISTRY[PromptLoader.FETCH_KEY_CLAIMS.value]
             self.fact_check_prompt = PROMPT_REGISTRY[PromptLoader.FACT_CHECK.value]
+            self.fact_check_version = prompt_version(PromptLoader.FACT_CHECK.value)
+            self.batch_fact_check_prompt = PROMPT_REGISTRY[PromptLoader.BATCH_FACT_CHECK.value]
+            self.batch_fact_check_version = prompt_version(PromptLoader.BATCH_FACT_CHECK.value)
+            self.fetch_claims_version = prompt_version(PromptLoader.FETCH_KEY_CLAIMS.value)
+
+            cache_cfg = self.model_loader.config.get("verdict_cache", {})
+            self.verdict_cache = None
+            if cache_cfg.get("enabled", False):
+                self.verdict_cache = VerdictCache.shared(
+                    cache_cfg.get("path", "verdict_cache/verdicts.db"),
+                    ttl_seconds=cache_cfg.get("ttl_seconds", 86400),
+                    memory_entries=cache_cfg.get("memory_entries", 1024),
+                )
+
+            doc_cache_cfg = self.model_loader.config.get("document_cache", {})
+            self.document_cache = None
+            if doc_cache_cfg.get("enabled", False):
+                self.document_cache = DocumentCache(
+                    doc_cache_cfg.get("dir", "document_cache"),
+                    ttl_seconds=doc_cache_cfg.get("ttl_seconds", 7 * 86400),
+                    max_bytes=doc_cache_cfg.get("max_bytes", 1024 * 1024 * 1024),
+                )
             
             log.info("ChatIngestor initialized",
                           session_id=self.session_id,
@@ -40,67 +72,462 @@ class ClaimsChecker:
             log.error("Failed to initialize ChatIngestor", error=str(e))
             raise DocumentPortalException("Initialization error in ChatIngestor", e) from e
 
-    def check_claims(self, uploaded_file, retriever):
+    def _parse_claims(self, claims_raw: str) -> List[str]:
+        # Parse and clean claims
+        claims = []
+        for line in claims_raw.split('\n'):
+            line = line.strip()
+            if line and (line[0].isdigit() or line.startswith('-')):
+                # Remove numbering/bullets e.g. "1. " or "- "
+                cleaned = re.sub(r'^[\d\-\.\s]+', '', line)
+                if cleaned:
+                    claims.append(cleaned)
+        return claims
+
+    @staticmethod
+    def _windows(pages: Iterable[str], window_chars: int, overlap: int = 0) -> Iterator[str]:
+        """
+        Group consecutive pages into windows of at most ``window_chars``. Oversize
+        pages are sliced, each slice repeating the last ``overlap`` characters of
+        the previous one so a claim cut at a slice boundary is seen whole once.
+        """
+        step = window_chars - min(max(overlap, 0), window_chars - 1)
+        buf: List[str] = []
+        size = 0
+        for text in pages:
+            for start in range(0, len(text), step):
+                piece = text[start:start + window_chars]
+                if buf and size + len(piece) > window_chars:
+                    yield "\n".join(buf)
+                    buf, size = [], 0
+                buf.append(piece)
+                size += len(piece)
+                if start + window_chars >= len(text):
+                    break
+        if buf:
+            yield "\n".join(buf)
+
+    @staticmethod
+    def _merge_claims(claim_lists: Iterable[List[str]]) -> List[str]:
+        """Concatenate per-window claims, dropping repeats that differ only in case/punctuation."""
+        seen = set()
+        merged = []
+        for claims in claim_lists:
+            for claim in claims:
+                key = re.sub(r'\W+', ' ', claim.lower()).strip()
+                if key and key not in seen:
+                    seen.add(key)
+                    merged.append(claim)
+        return merged
+
+    def _page_texts(self, path: Path, doc_hash: Optional[str]) -> Iterator[str]:
+        """Page text of the upload: replayed from the document cache, or parsed lazily and cached."""
+        if self.document_cache is None or doc_hash is None:
+            yield from (doc.page_content for doc in lazy_load(path))
+            return
+        cached = self.document_cache.iter_pages(doc_hash)
+        if cached is not None:
+            yield from cached
+            return
+        with self.document_cache.page_writer(doc_hash) as write:
+            for doc in lazy_load(path):
+                write(doc.page_content)
+                yield doc.page_content
+
+    async def _extract_windowed(self, claim_chain, pages: Iterator[str],
+                                cfg: Dict[str, Any]) -> Tuple[List[str], int]:
+        """Merged claims of every window that succeeded, and how many windows failed."""
+        window_chars = cfg.get("window_chars", 12000)
+        overlap = cfg.get("window_overlap_chars", 0)
+        max_concurrency = cfg.get("max_concurrency", 4)
+        log.info("Extracting claims per window", window_chars=window_chars, overlap=overlap,
+                 max_concurrency=max_concurrency)
+
+        # Pages are parsed lazily in a worker thread; the semaphore is taken before
+        # pulling the next window, so at most max_concurrency windows are in memory
+        loop = asyncio.get_running_loop()
+        windows = self._windows(pages, window_chars, overlap)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        done = object()
+
+        async def extract(i: int, text: str) -> Optional[List[str]]:
+            # Map: one extraction call per window
+            try:
+                return self._parse_claims(await claim_chain.ainvoke({"text": text}))
+            except Exception as e:
+                log.error("Claim extraction failed for window", window=i, error=str(e))
+                return None
+            finally:
+                semaphore.release()
+
+        tasks: List[asyncio.Task] = []
         try:
-            
-            path = save_uploaded_file(uploaded_file, self.temp_dir)
-            docs = load_documents(path)
+            while True:
+                await semaphore.acquire()
+                window = await loop.run_in_executor(None, next, windows, done)
+                if window is done:
+                    semaphore.release()
+                    break
+                tasks.append(asyncio.create_task(extract(len(tasks), window)))
+            outputs = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        claim_lists = [claims for claims in outputs if claims is not None]
+        if tasks and not claim_lists:
+            raise RuntimeError("Claim extraction failed for every window")
+        log.info("Windows processed", windows=len(tasks), failed=len(tasks) - len(claim_lists))
 
-            pdf_text = "\n".join([doc.page_content for doc in docs])
+        # Reduce: merge in document order and de-duplicate
+        return self._merge_claims(claim_lists), len(tasks) - len(claim_lists)
 
-            log.info(f"PDF Text Length: {len(pdf_text)} characters")
+    async def _extract_claims(self, uploaded_file) -> List[str]:
+        loop = asyncio.get_running_loop()
+        upload_cfg = self.model_loader.config.get("uploads", {})
+        # Disk I/O and PyPDF parsing are blocking; keep them off the event loop
+        path, doc_hash = await loop.run_in_executor(
+            None, save_uploaded_file_hashed, uploaded_file, self.temp_dir,
+            upload_cfg.get("max_bytes"), upload_cfg.get("chunk_bytes", 1024 * 1024),
+        )
 
-            log.info("Extracting key claims from the PDF...")
+        cfg = self.model_loader.config.get("claim_extraction", {})
+        claims_key = None
+        if self.document_cache is not None and doc_hash is not None:
+            # Claims depend on the prompt, the model and how the text was windowed
+            mode = cfg.get("mode", "single")
+            settings = f"{mode}/{cfg.get('window_chars', 12000)}" if mode == "windowed" else mode
+            if mode == "windowed" and cfg.get("window_overlap_chars", 0):
+                settings += f"/{cfg['window_overlap_chars']}"
+            claims_key = DocumentCache.claims_key(doc_hash, self.fetch_claims_version,
+                                                  self.model_loader.llm_identity(), settings)
+            claims = await loop.run_in_executor(None, self.document_cache.get_claims, claims_key)
+            if claims is not None:
+                log.info("Claims cache hit, skipping extraction", doc_hash=doc_hash[:12], claims=len(claims))
+                return claims
 
-            claim_extraction_prompt = self.fetch_claims_prompt
+        log.info("Extracting key claims from the PDF...")
 
-            claim_chain = claim_extraction_prompt | self.model_loader.load_llm() | StrOutputParser()
+        claim_chain = self.fetch_claims_prompt | self.model_loader.load_llm() | StrOutputParser()
+        pages = self._page_texts(path, doc_hash)
 
-            # Invoke with the full PDF text (assuming it fits in context, otherwise we'd chunk)
-            claims_raw = claim_chain.invoke({"text": pdf_text})
+        failed_windows = 0
+        if cfg.get("mode", "single") == "windowed":
+            claims, failed_windows = await self._extract_windowed(claim_chain, pages, cfg)
+        else:
+            # Invoke with the full PDF text (assumes it fits in context; use windowed mode otherwise)
+            text = await loop.run_in_executor(None, "\n".join, pages)
+            log.info(f"PDF Text Length: {len(text)} characters")
+            claims_raw = await claim_chain.ainvoke({"text": text})
 
             log.info("--- Raw Extracted Claims ---")
             log.info(claims_raw)
 
-            # Parse and clean claims
-            claims = []
-            for line in claims_raw.split('\n'):
-                line = line.strip()
-                if line and (line[0].isdigit() or line.startswith('-')):
-                    # Remove numbering/bullets e.g. "1. " or "- "
-                    cleaned = re.sub(r'^[\d\-\.\s]+', '', line)
-                    if cleaned:
-                        claims.append(cleaned)
-
-            log.info(f"\nExtracted {len(claims)} individual claims.")
-
-            verification_chain = (
-                {"context": retriever, "claim": RunnablePassthrough()}
-                | self.fact_check_prompt
-                | self.model_loader.load_llm()
-                | StrOutputParser()
-            )
-
-            results = []
-
-            for i, claim in enumerate(claims):
-                log.info(f"Checking Claim {i+1}/{len(claims)}")
-                log.info(f"Claim: {claim}")
-                
+            claims = self._parse_claims(claims_raw)
+
+        log.info(f"\nExtracted {len(claims)} individual claims.")
+        if claims_key is not None and failed_windows:
+            # A partial list would hide the missing windows' claims from every later check
+            log.warning("Not caching partial claims", doc_hash=doc_hash[:12], failed_windows=failed_windows)
+        elif claims_key is not None:
+            await loop.run_in_executor(None, self.document_cache.put_claims, claims_key, doc_hash, claims)
+        return claims
+
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        # Rough provider-agnostic estimate (~4 characters per token) for reporting only
+        return max(1, len(text) // 4)
+
+    def _format_batch(self, batch: List[Tuple[str, List[Document]]]) -> str:
+        blocks = []
+        for number, (claim, docs) in enumerate(batch, start=1):
+            context = "\n\n".join(doc.page_content for doc in docs)
+            blocks.append(f"Claim [{number}]: {claim}\nContext [{number}]:\n{context}")
+        return "\n\n".join(blocks)
+
+    @staticmethod
+    def _parse_batch_verdicts(raw: str, size: int) -> Dict[int, str]:
+        """Validate the model's JSON array; returns batch position -> verdict text for valid entries."""
+        match = re.search(r'\[.*\]', raw, re.S)
+        if not match:
+            raise ValueError("No JSON array in batched verification output")
+        entries = json.loads(match.group(0))
+        if not isinstance(entries, list):
+            raise ValueError("Batched verification output is not a JSON array")
+        parsed = {}
+        for entry in entries:
+            # Entries are validated one by one so a single bad verdict only costs that claim a retry
+            try:
+                v = ClaimVerdict.model_validate(entry)
+            except ValidationError as e:
+                log.warning("Invalid batched verdict ignored", error=str(e))
+                continue
+            if 1 <= v.index <= size and v.index - 1 not in parsed:
+                # Same shape as the single-claim prompt so downstream rendering is unchanged
+                parsed[v.index - 1] = f"**Verdict**: {v.verdict}\n**Explanation**: {v.explanation}"
+        return parsed
+
+    async def _verify_claims(self, claims: List[str], retriever, on_result: Optional[ResultCallback] = None) -> List[Dict[str, Any]]:
+        llm = self.model_loader.load_llm()
+        answer_chain = self.fact_check_prompt | llm | StrOutputParser()
+        batch_chain = self.batch_fact_check_prompt | llm | StrOutputParser()
+
+        cfg = self.model_loader.config.get("verification", {})
+        max_concurrency = cfg.get("max_concurrency", 1)
+        batched = cfg.get("mode", "single") == "batched"
+        batch_size = max(1, cfg.get("batch_size", 5))
+        # Batched verdicts come from a different prompt, so they are cached separately;
+        # batched runs also reuse single-claim verdicts, e.g. those of earlier fallbacks
+        versions = [self.batch_fact_check_version] if batched else []
+        versions.append(self.fact_check_version)
+        stats = {"hits": 0, "misses": 0, "llm_calls": 0, "fallbacks": 0, "batched_claims": 0,
+                 "single_tokens": 0, "batch_tokens": 0}
+        log.info("Verifying claims", claims=len(claims), max_concurrency=max_concurrency,
+                 mode="batched" if batched else "single", batch_size=batch_size if batched else 1)
+
+        # One embedding per claim serves both de-duplication and retrieval
+        vectorstore = batch_searchable(retriever)
+        vectors, searchable = await self._embed_claims(claims, vectorstore)
+
+        # Only one representative per cluster of near-duplicate claims is verified
+        clusters = self._cluster_claims(claims, vectors)
+        contexts: Dict[int, List[Document]] = {}
+        if searchable:
+            reps = list(clusters)
+            k = retriever.search_kwargs.get("k", 4)
+            found = await asyncio.to_thread(batch_similarity_search, vectorstore, vectors[reps], k)
+            contexts = dict(zip(reps, found))
+            log.info("Batch retrieval complete", queries=len(reps), k=k)
+        items: List[Optional[Dict[str, Any]]] = [None] * len(claims)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def publish(rep: int, result, cached: bool = False):
+            claim = claims[rep]
+            members = clusters[rep]
+            log.info(f"Checked Claim {rep+1}/{len(claims)}", claim=claim, duplicates=len(members) - 1)
+            if isinstance(result, Exception):
+                log.error(f"Error verifying claim: {result}")
+            else:
+                log.info(result)
+
+            # Fan the representative's verdict out to every member of its cluster
+            for index in members:
+                item: Dict[str, Any] = {"claim": claims[index]}
+                if isinstance(result, Exception):
+                    item["error"] = str(result)
+                else:
+                    item["verification"] = result
+                if cached:
+                    item["cached"] = True
+                if index != rep:
+                    item["duplicate_of"] = claim
+                items[index] = item
+                if on_result is not None:
+                    await on_result(index, item)
+
+        def cache_key(rep: int, docs: List[Document], version: str) -> Optional[str]:
+            if self.verdict_cache is None:
+                return None
+            return VerdictCache.make_key(claims[rep], context_fingerprint(docs), version,
+                                         self.model_loader.llm_identity())
+
+        async def lookup(rep: int):
+            # Retrieval runs before the LLM call so the evidence can be part of the cache key
+            docs = contexts[rep] if rep in contexts else await retriever.ainvoke(claims[rep])
+            key, cached = cache_key(rep, docs, versions[0]), None
+            if key is not None:
+                for version in versions:
+                    cached = await asyncio.to_thread(self.verdict_cache.get, cache_key(rep, docs, version))
+                    if cached is not None:
+                        break
+                stats["hits" if cached is not None else "misses"] += 1
+            return docs, key, cached
+
+        async def store(key: Optional[str], result: str):
+            if key is not None:
+                await asyncio.to_thread(self.verdict_cache.put, key, result)
+
+        async def verify_one(rep: int, docs: List[Document], key: Optional[str]) -> str:
+            stats["llm_calls"] += 1
+            result = await answer_chain.ainvoke({"claim": claims[rep], "context": docs})
+            await store(key, result)
+            return result
+
+        async def verify_single(rep: int):
+            async with semaphore:
+                cached = False
                 try:
-                    result = verification_chain.invoke(claim)
-                    log.info(result)
-                    results.append({"claim": claim, "verification": result})
+                    docs, key, result = await lookup(rep)
+                    cached = result is not None
+                    if not cached:
+                        result = await verify_one(rep, docs, key)
                 except Exception as e:
-                    log.error(f"Error verifying claim: {e}")
-                
-                log.info("-" * 50)
+                    # Isolate failures per claim
+                    result = e
+            await publish(rep, result, cached)
 
-            log.info("Verification Complete.")
+        async def prepare(rep: int):
+            async with semaphore:
+                try:
+                    return rep, await lookup(rep)
+                except Exception as e:
+                    return rep, e
+
+        async def verify_batch(batch: List[Tuple[int, List[Document], Optional[str]]]):
+            prompt_text = self._format_batch([(claims[rep], docs) for rep, docs, _ in batch])
+            async with semaphore:
+                stats["llm_calls"] += 1
+                try:
+                    raw = await batch_chain.ainvoke({"claims": prompt_text})
+                    verdicts = self._parse_batch_verdicts(raw, len(batch))
+                except Exception as e:
+                    log.warning("Batched verification failed, falling back per claim", claims=len(batch), error=str(e))
+                    verdicts = {}
+            stats["batch_tokens"] += self._estimate_tokens(self.batch_fact_check_prompt.format(claims=prompt_text))
 
-            return results
+            for pos, (rep, docs, key) in enumerate(batch):
+                if pos in verdicts:
+                    result = verdicts[pos]
+                    stats["batched_claims"] += 1
+                    stats["single_tokens"] += self._estimate_tokens(
+                        self.fact_check_prompt.format(claim=claims[rep], context=docs))
+                    await store(key, result)
+                else:
+                    stats["fallbacks"] += 1
+                    async with semaphore:
+                        try:
+                            # Answered by the single-claim prompt, so cached under its version
+                            result = await verify_one(rep, docs, cache_key(rep, docs, self.fact_check_version))
+                        except Exception as e:
+                            result = e
+                await publish(rep, result)
 
+        if not batched:
+            await asyncio.gather(*(verify_single(rep) for rep in clusters))
+        else:
+            pending = []
+            for rep, outcome in await asyncio.gather(*(prepare(rep) for rep in clusters)):
+                if isinstance(outcome, Exception):
+                    await publish(rep, outcome)
+                elif outcome[2] is not None:
+                    await publish(rep, outcome[2], cached=True)
+                else:
+                    pending.append((rep, outcome[0], outcome[1]))
+            batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+            await asyncio.gather(*(verify_batch(batch) for batch in batches))
+
+            saved_calls = stats["batched_claims"] - len(batches)
+            log.info("Batched verification savings", batches=len(batches), batched_claims=stats["batched_claims"],
+                     fallbacks=stats["fallbacks"], provider_calls_saved=saved_calls,
+                     est_prompt_tokens_saved=stats["single_tokens"] - stats["batch_tokens"])
+
+        # Failed claims are logged above and left out of the results, in input order
+        results = [item for item in items if item is not None and "error" not in item]
+
+        log.info("Verification Complete.", verified=len(results), llm_calls=stats["llm_calls"],
+                 verdict_cache_hits=stats["hits"], verdict_cache_misses=stats["misses"])
+        if self.verdict_cache is not None:
+            log.info("Verdict cache totals", **self.verdict_cache.stats())
+        if hasattr(llm, "routing_stats"):
+            log.info("LLM routing totals", **llm.routing_stats())
+        return results
+
+    async def _embed_claims(self, claims: List[str], vectorstore) -> Tuple[Optional[np.ndarray], bool]:
+        """
+        Embed every claim as a search query, the way per-claim retrieval does;
+        this also keeps claims out of the chunk embedding cache. Returns the
+        vectors (None if not needed or on failure) and whether they come from
+        the FAISS store's own embedding model, i.e. can be searched directly.
+        """
+        dedup = self.model_loader.config.get("claim_dedup", {}).get("enabled", False) and len(claims) >= 2
+        embeddings = search_embeddings(vectorstore) if vectorstore is not None else None
+        searchable = embeddings is not None
+        if embeddings is None and dedup:
+            embeddings = self.model_loader.load_embeddings()
+        if embeddings is None or not claims:
+            return None, False
+
+        try:
+            queries = await asyncio.gather(*(embeddings.aembed_query(claim) for claim in claims))
+            vectors = np.asarray(queries, dtype=np.float32)
         except Exception as e:
-            log.error("Failed to build retriever", error=str(e))
-            raise DocumentPortalException("Failed to build retriever", e) from e
+            log.warning("Claim embedding failed; retrieving per claim without de-duplication", error=str(e))
+            return None, False
+        return vectors, searchable
+
+    def _cluster_claims(self, claims: List[str], vectors: Optional[np.ndarray]) -> Dict[int, List[int]]:
+        """
+        Greedy cosine-similarity clustering of the claim vectors.
+        Returns representative index -> member indices (the representative included).
+        """
+        identity = {i: [i] for i in range(len(claims))}
+        cfg = self.model_loader.config.get("claim_dedup", {})
+        if not cfg.get("enabled", False) or len(claims) < 2 or vectors is None:
+            return identity
+
+        threshold = cfg.get("similarity_threshold", 0.92)
+        # Normalized copy: the raw vectors are still needed for the index search
+        unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True).clip(min=1e-12)
+        similarity = unit @ unit.T
+
+        clusters: Dict[int, List[int]] = {}
+        reps: List[int] = []
+        for i in range(len(claims)):
+            if reps:
+                best = max(reps, key=lambda r: similarity[i, r])
+                if similarity[i, best] >= threshold:
+                    clusters[best].append(i)
+                    continue
+            reps.append(i)
+            clusters[i] = [i]
+
+        log.info("Claims de-duplicated", claims=len(claims), unique=len(clusters), threshold=threshold)
+        return clusters
+
+    async def acheck_claims(self, uploaded_file, retriever,
+                            on_claims: Optional[ClaimsCallback] = None,
+                            on_result: Optional[ResultCallback] = None) -> List[Dict[str, Any]]:
+        """
+        Extract and verify claims. ``on_claims`` receives the parsed claim list
+        and ``on_result`` each (index, result item) as soon as it finishes, so
+        callers can report progress. Items carry ``verification`` or ``error``,
+        plus ``duplicate_of`` when the verdict was shared from a near-duplicate.
+        """
+        try:
+            claims = await self._extract_claims(uploaded_file)
+            if on_claims is not None:
+                await on_claims(claims)
+            return await self._verify_claims(claims, retriever, on_result)
+        except Exception as e:
+            log.error("Failed to check claims", error=str(e))
+            raise DocumentPortalException("Failed to check claims", e) from e
+
+    async def astream_check_claims(self, uploaded_file, retriever) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield progress events: one ``claims`` event with the extracted list,
+        then one ``verdict`` (or ``claim_error``) event per claim in completion
+        order, then ``done``. Closing the generator cancels the remaining work.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def on_claims(claims):
+            await queue.put({"type": "claims", "claims": claims})
+
+        async def on_result(index, item):
+            event_type = "claim_error" if "error" in item else "verdict"
+            await queue.put({"type": event_type, "index": index, **item})
+
+        task = asyncio.create_task(self.acheck_claims(uploaded_file, retriever, on_claims, on_result))
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while (event := await queue.get()) is not None:
+                yield event
+            results = await task
+            yield {"type": "done", "verified": len(results)}
+        finally:
+            if not task.done():
+                task.cancel()
 
+    def check_claims(self, uploaded_file, retriever) -> List[Dict[str, Any]]:
+        """Blocking entry point for scripts; the API awaits acheck_claims directly."""
+        return asyncio.run(self.acheck_claims(uploaded_file, retriever))
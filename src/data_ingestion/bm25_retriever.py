@@ -0,0 +1,136 @@
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _doc_key(doc: Document) -> Tuple[str, str]:
+    return doc.metadata.get("source", ""), doc.page_content
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a fixed list of chunks.
+
+    Postings are stored per term as two compact numpy arrays (chunk ids and
+    term frequencies), so scoring a query touches only the postings of its
+    terms and never calls out to an embedding model.
+    """
+
+    def __init__(self, texts: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.size = len(texts)
+
+        postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        lengths = np.zeros(self.size, dtype=np.float32)
+        for i, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            lengths[i] = sum(counts.values())
+            for term, tf in counts.items():
+                postings[term].append((i, tf))
+
+        self.avg_length = float(lengths.mean()) if self.size else 0.0
+        # Length normalization is per chunk, so precompute it once
+        self._norm = self.k1 * (1 - self.b + self.b * lengths / max(self.avg_length, 1e-9))
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray, float]] = {}
+        for term, entries in postings.items():
+            ids = np.fromiter((i for i, _ in entries), dtype=np.int32, count=len(entries))
+            tfs = np.fromiter((tf for _, tf in entries), dtype=np.float32, count=len(entries))
+            idf = float(np.log(1 + (self.size - len(entries) + 0.5) / (len(entries) + 0.5)))
+            self._postings[term] = (ids, tfs, idf)
+
+    def scores(self, query: str) -> np.ndarray:
+        scores = np.zeros(self.size, dtype=np.float32)
+        for term in set(tokenize(query)):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            ids, tfs, idf = posting
+            scores[ids] += idf * tfs * (self.k1 + 1) / (tfs + self._norm[ids])
+        return scores
+
+    def search(self, query: str, k: int) -> List[Tuple[int, float]]:
+        scores = self.scores(query)
+        if not self.size:
+            return []
+        k = min(k, self.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(i), float(scores[i])) for i in top if scores[i] > 0]
+
+
+class BM25Retriever(BaseRetriever):
+    """Lexical retriever over split chunks; no network calls."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    index: BM25Index
+    docs: List[Document]
+    k: int = 4
+
+    @classmethod
+    def from_documents(cls, docs: List[Document], k: int = 4) -> "BM25Retriever":
+        return cls(index=BM25Index([d.page_content for d in docs]), docs=list(docs), k=k)
+
+    def search_with_scores(self, query: str, k: int) -> List[Tuple[Document, float]]:
+        return [(self.docs[i], score) for i, score in self.index.search(query, k)]
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        return [doc for doc, _ in self.search_with_scores(query, self.k)]
+
+
+def _min_max(scores: Dict[Tuple[str, str], float]) -> Dict[Tuple[str, str], float]:
+    if not scores:
+        return {}
+    low, high = min(scores.values()), max(scores.values())
+    span = high - low
+    return {key: (value - low) / span if span > 0 else 1.0 for key, value in scores.items()}
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    Fuses BM25 and FAISS relevance: each side's top ``fetch_k`` scores are
+    min-max normalized and combined as ``alpha * vector + (1 - alpha) * bm25``.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    bm25: BM25Retriever
+    vectorstore: object
+    k: int = 4
+    fetch_k: int = 20
+    alpha: float = 0.5
+
+    def _fuse(self, lexical: List[Tuple[Document, float]], vector: List[Tuple[Document, float]]) -> List[Document]:
+        docs: Dict[Tuple[str, str], Document] = {}
+        for doc, _ in lexical + vector:
+            docs.setdefault(_doc_key(doc), doc)
+        lexical_scores = _min_max({_doc_key(d): s for d, s in lexical})
+        vector_scores = _min_max({_doc_key(d): s for d, s in vector})
+
+        fused = {key: self.alpha * vector_scores.get(key, 0.0) + (1 - self.alpha) * lexical_scores.get(key, 0.0)
+                 for key in docs}
+        ranked = sorted(fused, key=fused.get, reverse=True)[:self.k]
+        return [docs[key] for key in ranked]
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        lexical = self.bm25.search_with_scores(query, self.fetch_k)
+        vector = self.vectorstore.similarity_search_with_relevance_scores(query, k=self.fetch_k)
+        return self._fuse(lexical, vector)
+
+    async def _aget_relevant_documents(self, query: str, *, run_manager) -> List[Document]:
+        lexical = self.bm25.search_with_scores(query, self.fetch_k)
+        vector = await self.vectorstore.asimilarity_search_with_relevance_scores(query, k=self.fetch_k)
+        return self._fuse(lexical, vector)
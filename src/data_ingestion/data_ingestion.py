@@ -1,26 +1,48 @@
 from utils.file_io import generate_session_id
 from logger import GLOBAL_LOGGER as log
 from exception.custom_exception import DocumentPortalException
-from langchain_community.document_loaders import PyPDFLoader, WebBaseLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.vectorstores import FAISS
-from langchain_core.runnables import RunnablePassthrough
-from utils.model_loader import ModelLoader
+from utils.model_loader import get_model_loader
+from src.data_ingestion.source_cache import SourceCache
+from src.data_ingestion.bm25_retriever import BM25Retriever, HybridRetriever
+from src.data_ingestion.faiss_index import build_vectorstore, index_settings, load_vectorstore
+from utils.embedding_cache import EmbeddingCache, CachedEmbeddings
 from pathlib import Path
-from typing import Optional
-from utils.file_io import save_uploaded_file
-from utils.document_ops import load_documents
+from typing import Optional, TYPE_CHECKING
 from model.models import PromptLoader
 from prompt.prompt_library import PROMPT_REGISTRY
 from langchain_core.documents import Document
 from typing import List
 from typing import Dict, Any
+from urllib.parse import urlsplit, urlunsplit
+import asyncio
 import json
 import hashlib
-import sys
+import os
+import shutil
+import threading
+import uuid
+import weakref
 
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import FAISS
 
 
+# One lock per fingerprint so concurrent requests for the same source set build once;
+# weakly held, so an entry goes away once no build is holding or waiting on it
+_build_locks: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+_build_locks_guard = threading.Lock()
+
+
+def _build_lock(fingerprint: str) -> threading.Lock:
+    with _build_locks_guard:
+        return _build_locks.setdefault(fingerprint, threading.Lock())
+
+
+def normalize_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+
 
 class SourcesDataIngestion:
 
@@ -29,10 +51,14 @@ class SourcesDataIngestion:
         temp_base: str = "data",
         faiss_base: str = "faiss_index",
         session_id: Optional[str] = None,   
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
     ):
         try:
             self.sources = sources
-            self.model_loader = ModelLoader()
+            self.chunk_size = chunk_size
+            self.chunk_overlap = chunk_overlap
+            self.model_loader = get_model_loader()
             self.session_id = session_id or generate_session_id()
             
             self.temp_base = Path(temp_base); self.temp_base.mkdir(parents=True, exist_ok=True)
@@ -41,6 +67,18 @@ class SourcesDataIngestion:
             self.temp_dir = self.temp_base / self.session_id
             self.faiss_dir = self.faiss_base / self.session_id
             self.prompt_loader = PROMPT_REGISTRY[PromptLoader.FACT_CHECK.value]
+
+            cache_cfg = self.model_loader.config.get("source_cache", {})
+            self.source_cache = SourceCache(
+                cache_dir=cache_cfg.get("dir", "source_cache"),
+                ttl_seconds=cache_cfg.get("ttl_seconds", 3600),
+                timeout=cache_cfg.get("timeout_seconds", 30),
+                connect_timeout=cache_cfg.get("connect_timeout_seconds", 10),
+                read_timeout=cache_cfg.get("read_timeout_seconds", 20),
+                max_connections=cache_cfg.get("max_connections", 20),
+                per_host_limit=cache_cfg.get("per_host_limit", 4),
+                max_body_bytes=cache_cfg.get("max_body_bytes", 10 * 1024 * 1024),
+            )
             
             log.info("SourcesDataIngestion initialized",
                           session_id=self.session_id,
@@ -50,33 +88,134 @@ class SourcesDataIngestion:
             log.error("Failed to initialize SourcesDataIngestion", error=str(e))
             raise DocumentPortalException("Initialization error in SourcesDataIngestion", e) from e
 
-    def _split(self, docs: List[Document], chunk_size=1000, chunk_overlap=200) -> List[Document]:
+    def _retriever_cfg(self) -> Dict[str, Any]:
+        cfg = self.model_loader.config.get("retriever", {})
+        mode = cfg.get("mode", "vector")
+        if mode not in ("vector", "bm25", "hybrid"):
+            raise ValueError(f"Unsupported retriever mode: {mode}")
+        return {"mode": mode, "top_k": cfg.get("top_k", 4), "fetch_k": cfg.get("fetch_k", 20),
+                "alpha": cfg.get("hybrid_alpha", 0.5)}
+
+    @staticmethod
+    def _stored_chunks(vectorstore: "FAISS") -> List[Document]:
+        # Chunks in index order, straight from the saved docstore
+        return [vectorstore.docstore.search(vectorstore.index_to_docstore_id[i])
+                for i in range(len(vectorstore.index_to_docstore_id))]
+
+    def _make_retriever(self, vectorstore: "FAISS"):
+        """Wrap a FAISS store in the retriever selected by ``retriever.mode``."""
+        cfg = self._retriever_cfg()
+        log.info("Retriever ready", mode=cfg["mode"], k=cfg["top_k"])
+        if cfg["mode"] == "vector":
+            return vectorstore.as_retriever(search_kwargs={"k": cfg["top_k"]})
+        bm25 = BM25Retriever.from_documents(self._stored_chunks(vectorstore), k=cfg["top_k"])
+        if cfg["mode"] == "bm25":
+            return bm25
+        return HybridRetriever(bm25=bm25, vectorstore=vectorstore, k=cfg["top_k"],
+                               fetch_k=cfg["fetch_k"], alpha=cfg["alpha"])
+
+    @property
+    def skipped_sources(self) -> List[Dict[str, str]]:
+        """Sources dropped by the last load because they failed, timed out or were too large."""
+        return self.source_cache.skipped()
+
+    def _split(self, docs: List[Document], chunk_size=None, chunk_overlap=None) -> List[Document]:
+        chunk_size = chunk_size or self.chunk_size
+        chunk_overlap = self.chunk_overlap if chunk_overlap is None else chunk_overlap
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+
         splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
         chunks = splitter.split_documents(docs)
         log.info("Documents split", chunks=len(chunks), chunk_size=chunk_size, overlap=chunk_overlap)
         return chunks
 
+    def _embedding_model_name(self) -> str:
+        embedding_cfg = self.model_loader.config["embedding_model"]
+        name = f"{embedding_cfg['provider']}/{embedding_cfg['model_name']}"
+        if embedding_cfg.get("dimensions"):
+            name += f"/{embedding_cfg['dimensions']}"
+        return name
+
+    def _fingerprint(self, docs: List[Document]) -> str:
+        """Hash everything that determines the index contents."""
+        content_hashes = {normalize_url(d.metadata["source"]): d.metadata["content_hash"] for d in docs}
+        payload = {
+            "sources": sorted(content_hashes.items()),
+            "chunk_size": self.chunk_size,
+            "chunk_overlap": self.chunk_overlap,
+            "embedding_model": self._embedding_model_name(),
+            "faiss_index": index_settings(self.model_loader.config.get("faiss_db", {})),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+
+    def _embeddings(self) -> CachedEmbeddings:
+        cache_cfg = self.model_loader.config.get("embedding_cache", {})
+        cache = EmbeddingCache.shared(
+            cache_dir=cache_cfg.get("dir", "embedding_cache"),
+            model_name=self._embedding_model_name(),
+            max_bytes=cache_cfg.get("max_bytes", 512 * 1024 * 1024),
+        )
+        return CachedEmbeddings(self.model_loader.load_embeddings(), cache)
+
+    def _save_atomic(self, vectorstore: "FAISS", target: Path) -> None:
+        # Save next to the target and rename so readers never see a half-written index
+        tmp = target.parent / f".{target.name}.{uuid.uuid4().hex[:8]}.tmp"
+        vectorstore.save_local(str(tmp))
+        try:
+            os.replace(tmp, target)
+        except OSError:
+            # Another process won the race; its index is equivalent
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def _index(self, web_docs: List[Document]):
+        """Load or build the FAISS index for the fetched docs. Blocking: call from a worker thread in async code."""
+        cfg = self._retriever_cfg()
+        if cfg["mode"] == "bm25":
+            # Lexical only: no embeddings, no FAISS, no network calls for retrieval
+            chunks = self._split(web_docs)
+            log.info("Retriever ready", mode="bm25", k=cfg["top_k"])
+            return BM25Retriever.from_documents(chunks, k=cfg["top_k"])
+
+        faiss_cfg = self.model_loader.config.get("faiss_db", {})
+        fingerprint = self._fingerprint(web_docs)
+        self.faiss_dir = self.faiss_base / fingerprint
+        embeddings = self._embeddings()
+
+        with _build_lock(fingerprint):
+            if (self.faiss_dir / "index.faiss").exists():
+                log.info("Reusing saved index", fingerprint=fingerprint)
+                vectorstore = load_vectorstore(self.faiss_dir, embeddings, faiss_cfg)
+            else:
+                chunks = self._split(web_docs)
+                vectorstore = build_vectorstore(chunks, embeddings, faiss_cfg)
+                self._save_atomic(vectorstore, self.faiss_dir)
+                log.info("Saved index", fingerprint=fingerprint, faiss_dir=str(self.faiss_dir))
+
+        log.info("Vector Store ready.")
+        return self._make_retriever(vectorstore)
 
     def build_retriever(self):
         try:
             log.info("Loading web sources...")
-            web_loader = WebBaseLoader(self.sources)
-            web_docs = web_loader.load()
+            web_docs = self.source_cache.load(self.sources)
             log.info(f"Loaded {len(web_docs)} web documents.")
 
-            chunks = self._split(web_docs)
-
-            vectorstore = FAISS.from_documents(chunks, self.model_loader.load_embeddings())
-            vectorstore.save_local(self.faiss_dir)
-            retriever = vectorstore.as_retriever(search_kwargs={"k": 3})
-            log.info("Vector Store ready.")
-            
-            return retriever
+            return self._index(web_docs)
             
         except Exception as e:
             log.error("Failed to build retriever", error=str(e))
             raise DocumentPortalException("Failed to build retriever", e) from e
 
+    async def abuild_retriever(self):
+        try:
+            log.info("Loading web sources...")
+            web_docs = await self.source_cache.aload(self.sources)
+            log.info(f"Loaded {len(web_docs)} web documents.")
 
+            # Splitting, embedding and FAISS work are blocking
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._index, web_docs)
 
-
+        except Exception as e:
+            log.error("Failed to build retriever", error=str(e))
+            raise DocumentPortalException("Failed to build retriever", e) from e
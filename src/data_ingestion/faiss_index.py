@@ -0,0 +1,102 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from logger import GLOBAL_LOGGER as log
+
+INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "hnsw")
+
+# k-means wants roughly this many training points per centroid
+_MIN_POINTS_PER_CENTROID = 39
+
+
+def index_settings(cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalized ``faiss_db`` settings; also what goes into index fingerprints."""
+    index_type = cfg.get("index_type", "flat")
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unsupported FAISS index type: {index_type}")
+    return {
+        "index_type": index_type,
+        "nlist": cfg.get("nlist", 1024),
+        "pq_m": cfg.get("pq_m", 16),
+        "pq_nbits": cfg.get("pq_nbits", 8),
+        "hnsw_m": cfg.get("hnsw_m", 32),
+        "ef_construction": cfg.get("ef_construction", 200),
+    }
+
+
+def factory_string(settings: Dict[str, Any], dim: int, n: int) -> str:
+    """faiss.index_factory description for ``n`` vectors; small corpora degrade to Flat."""
+    index_type = settings["index_type"]
+    if index_type == "hnsw":
+        return f"HNSW{settings['hnsw_m']},Flat"
+    if index_type in ("ivf_flat", "ivf_pq"):
+        nlist = min(settings["nlist"], n // _MIN_POINTS_PER_CENTROID)
+        if index_type == "ivf_pq":
+            if dim % settings["pq_m"] or n < _MIN_POINTS_PER_CENTROID * 2 ** settings["pq_nbits"]:
+                log.warning("Not enough vectors or incompatible dimension for IVF-PQ, using IVF-Flat",
+                            vectors=n, dim=dim, pq_m=settings["pq_m"])
+            elif nlist >= 1:
+                return f"IVF{nlist},PQ{settings['pq_m']}x{settings['pq_nbits']}"
+        if nlist >= 1:
+            return f"IVF{nlist},Flat"
+        log.warning("Too few vectors to train IVF, using Flat", vectors=n)
+    return "Flat"
+
+
+def apply_search_params(index, cfg: Dict[str, Any]) -> None:
+    """Query-time knobs are set on every load; they are cheap and not tied to the saved file."""
+    import faiss
+
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.nprobe = min(cfg.get("nprobe", 16), ivf.nlist)
+    if hasattr(index, "hnsw"):
+        index.hnsw.efSearch = cfg.get("ef_search", 64)
+
+
+def build_vectorstore(chunks: List[Document], embeddings: Embeddings, cfg: Dict[str, Any],
+                      ids: Optional[List[str]] = None):
+    """FAISS.from_documents with the index type from ``faiss_db``; trains the index when needed."""
+    import faiss
+    from langchain_community.docstore.in_memory import InMemoryDocstore
+    from langchain_community.vectorstores import FAISS
+
+    settings = index_settings(cfg)
+    if settings["index_type"] == "flat":
+        return FAISS.from_documents(chunks, embeddings, ids=ids)
+
+    texts = [c.page_content for c in chunks]
+    vectors = np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+    description = factory_string(settings, vectors.shape[1], len(vectors))
+    index = faiss.index_factory(vectors.shape[1], description)
+    if hasattr(index, "hnsw"):
+        index.hnsw.efConstruction = settings["ef_construction"]
+    if not index.is_trained:
+        index.train(vectors)
+    apply_search_params(index, cfg)
+
+    vectorstore = FAISS(embeddings, index, InMemoryDocstore(), {})
+    vectorstore.add_embeddings(zip(texts, vectors.tolist()), metadatas=[c.metadata for c in chunks], ids=ids)
+    log.info("FAISS index built", index=description, vectors=len(vectors))
+    return vectorstore
+
+
+def load_vectorstore(folder: Path, embeddings: Embeddings, cfg: Dict[str, Any], read_only: bool = True):
+    """
+    Load a saved index. Read-only loads are memory-mapped (IO_FLAG_MMAP), so
+    workers on one host share a single page-cached copy instead of each
+    holding their own; mutate only indexes loaded with ``read_only=False``.
+    """
+    import faiss
+    from langchain_community.vectorstores import FAISS
+
+    io_flags = 0
+    if read_only and cfg.get("mmap", True):
+        io_flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+    vectorstore = FAISS.load_local(str(folder), embeddings, allow_dangerous_deserialization=True, io_flags=io_flags)
+    apply_search_params(vectorstore.index, cfg)
+    return vectorstore
@@ -0,0 +1,296 @@
+import asyncio
+import json
+import os
+import time
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from langchain_core.documents import Document
+
+from logger import GLOBAL_LOGGER as log
+from exception.custom_exception import DocumentPortalException
+
+if TYPE_CHECKING:
+    # HTTP clients and the HTML parser load on first fetch, keeping them off the API's import path
+    import aiohttp
+    import requests
+    from bs4 import BeautifulSoup
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _build_metadata(soup: "BeautifulSoup", url: str) -> dict:
+    # Same metadata shape as WebBaseLoader so downstream code does not change
+    metadata = {"source": url}
+    if title := soup.find("title"):
+        metadata["title"] = title.get_text()
+    if description := soup.find("meta", attrs={"name": "description"}):
+        metadata["description"] = description.get("content", "No description found.")
+    if html := soup.find("html"):
+        metadata["language"] = html.get("lang", "No language found.")
+    return metadata
+
+
+class SourceTooLarge(ValueError):
+    pass
+
+
+# One pooled aiohttp session per client configuration, shared by every request
+# in the process so connection reuse and the per-host cap span requests
+_sessions: Dict[Tuple, Tuple[asyncio.AbstractEventLoop, "aiohttp.ClientSession"]] = {}
+
+
+async def close_sessions() -> None:
+    """Close the pooled sessions; call on application shutdown."""
+    loop = asyncio.get_running_loop()
+    for key, (owner, session) in list(_sessions.items()):
+        if owner is loop:
+            await session.close()
+        _sessions.pop(key, None)
+
+
+class SourceCache:
+    """
+    On-disk cache of fetched web sources, one JSON entry per URL.
+
+    Each entry stores the extracted text, its SHA-256, and the ETag /
+    Last-Modified validators. Entries younger than ``ttl_seconds`` are served
+    without touching the network; older ones are revalidated with a
+    conditional GET.
+
+    Fetches are bounded by connect/read deadlines, an overall ``timeout`` and
+    ``max_body_bytes``; at most ``per_host_limit`` requests hit one host at once
+    across the whole process, since async fetches share one pooled session.
+    Sources that fail are skipped and recorded in ``failures``.
+    """
+
+    def __init__(self, cache_dir: str = "source_cache", ttl_seconds: int = 3600, timeout: float = 30.0,
+                 connect_timeout: float = 10.0, read_timeout: float = 20.0, max_connections: int = 20,
+                 per_host_limit: int = 4, max_body_bytes: int = 10 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir); self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_connections = max_connections
+        self.per_host_limit = per_host_limit
+        self.max_body_bytes = max_body_bytes
+        self.failures: Dict[str, str] = {}
+        self._requests_session: Optional["requests.Session"] = None
+
+    @property
+    def session(self) -> "requests.Session":
+        """Blocking HTTP session for ``load``, created on first use."""
+        if self._requests_session is None:
+            import requests
+
+            self._requests_session = requests.Session()
+            self._requests_session.headers.update(self._default_headers())
+        return self._requests_session
+
+    @staticmethod
+    def _default_headers() -> Dict[str, str]:
+        # Same browser-like headers as WebBaseLoader; imported lazily to keep
+        # langchain_community out of the API's import path
+        from langchain_community.document_loaders.web_base import default_header_template
+        return dict(default_header_template)
+
+    def _entry_path(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def get(self, url: str) -> Optional[Dict]:
+        path = self._entry_path(url)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            log.warning("Corrupt source cache entry ignored", url=url, error=str(e))
+            return None
+
+    def put(self, url: str, entry: Dict) -> None:
+        path = self._entry_path(url)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+
+    def _is_fresh(self, entry: Dict) -> bool:
+        return time.time() - entry.get("fetched_at", 0) < self.ttl_seconds
+
+    @staticmethod
+    def _to_document(entry: Dict) -> Document:
+        metadata = dict(entry["metadata"])
+        metadata["content_hash"] = entry["content_hash"]
+        return Document(page_content=entry["text"], metadata=metadata)
+
+    def _conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _build_entry(self, url: str, body: bytes, headers) -> Dict:
+        from bs4 import BeautifulSoup
+
+        parser = "xml" if url.endswith(".xml") else "html.parser"
+        soup = BeautifulSoup(body, parser)
+        text = soup.get_text()
+
+        return {
+            "url": url,
+            "text": text,
+            "content_hash": content_hash(text),
+            "metadata": _build_metadata(soup, url),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+        }
+
+    def _not_modified(self, url: str, entry: Dict) -> Dict:
+        log.info("Source not modified", url=url)
+        entry["fetched_at"] = time.time()
+        return entry
+
+    def _check_length(self, url: str, declared: Optional[str], received: int) -> None:
+        if (declared and declared.isdigit() and int(declared) > self.max_body_bytes) or received > self.max_body_bytes:
+            raise SourceTooLarge(f"{url} exceeds the {self.max_body_bytes} byte limit")
+
+    def _fetch(self, url: str, entry: Optional[Dict]) -> Dict:
+        with self.session.get(url, headers=self._conditional_headers(entry), stream=True,
+                              timeout=(self.connect_timeout, self.read_timeout)) as response:
+            if response.status_code == 304 and entry:
+                return self._not_modified(url, entry)
+
+            response.raise_for_status()
+            self._check_length(url, response.headers.get("Content-Length"), 0)
+            deadline = time.monotonic() + self.timeout
+            body = bytearray()
+            for chunk in response.iter_content(64 * 1024):
+                body.extend(chunk)
+                self._check_length(url, None, len(body))
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"{url} took longer than {self.timeout}s")
+            return self._build_entry(url, bytes(body), response.headers)
+
+    async def _afetch(self, session: "aiohttp.ClientSession", url: str, entry: Optional[Dict]) -> Dict:
+        async with session.get(url, headers=self._conditional_headers(entry)) as response:
+            if response.status == 304 and entry:
+                return self._not_modified(url, entry)
+            response.raise_for_status()
+            self._check_length(url, response.headers.get("Content-Length"), 0)
+            body = bytearray()
+            async for chunk in response.content.iter_chunked(64 * 1024):
+                body.extend(chunk)
+                self._check_length(url, None, len(body))
+            headers = response.headers
+
+        # BeautifulSoup parsing is CPU-bound
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._build_entry, url, bytes(body), headers)
+
+    def load_one(self, url: str) -> Document:
+        entry = self.get(url)
+        if entry and self._is_fresh(entry):
+            log.info("Source cache hit", url=url)
+            return self._to_document(entry)
+
+        try:
+            entry = self._fetch(url, entry)
+        except Exception as e:
+            if entry:
+                # Serve the stale copy rather than failing the whole check
+                log.warning("Source refresh failed, serving stale copy", url=url, error=str(e))
+                return self._to_document(entry)
+            raise
+
+        self.put(url, entry)
+        return self._to_document(entry)
+
+    async def aload_one(self, session: "aiohttp.ClientSession", url: str) -> Document:
+        # Cache entries are JSON files on disk; read and write them off the event loop
+        entry = await asyncio.to_thread(self.get, url)
+        if entry and self._is_fresh(entry):
+            log.info("Source cache hit", url=url)
+            return self._to_document(entry)
+
+        try:
+            entry = await self._afetch(session, url, entry)
+        except Exception as e:
+            if entry:
+                log.warning("Source refresh failed, serving stale copy", url=url, error=str(e))
+                return self._to_document(entry)
+            raise
+
+        await asyncio.to_thread(self.put, url, entry)
+        return self._to_document(entry)
+
+    def _collect(self, urls: List[str], outcomes: List) -> List[Document]:
+        """Keep successful documents in ``urls`` order; record and skip failures."""
+        docs = []
+        self.failures = {}
+        for url, outcome in zip(urls, outcomes):
+            if isinstance(outcome, BaseException):
+                error = str(outcome) or type(outcome).__name__
+                log.warning("Source skipped", url=url, error=error)
+                self.failures[url] = error
+            else:
+                docs.append(outcome)
+        if urls and not docs:
+            raise RuntimeError(f"None of the {len(urls)} web sources could be loaded")
+        return docs
+
+    def load(self, urls: List[str]) -> List[Document]:
+        try:
+            outcomes = []
+            for url in urls:
+                try:
+                    outcomes.append(self.load_one(url))
+                except Exception as e:
+                    outcomes.append(e)
+            return self._collect(urls, outcomes)
+        except Exception as e:
+            log.error("Failed to load web sources", error=str(e))
+            raise DocumentPortalException("Failed to load web sources", e) from e
+
+    def _client_timeout(self) -> "aiohttp.ClientTimeout":
+        import aiohttp
+
+        return aiohttp.ClientTimeout(total=self.timeout, sock_connect=self.connect_timeout,
+                                     sock_read=self.read_timeout)
+
+    def _session(self) -> "aiohttp.ClientSession":
+        """The pooled session for this configuration, created lazily on the running loop."""
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        key = (self.max_connections, self.per_host_limit, self.timeout, self.connect_timeout, self.read_timeout)
+        owner, session = _sessions.get(key, (None, None))
+        if session is None or session.closed or owner is not loop:
+            # A session is bound to its event loop; one left over from a finished loop is dropped
+            connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.per_host_limit)
+            session = aiohttp.ClientSession(headers=self._default_headers(), timeout=self._client_timeout(),
+                                            connector=connector)
+            _sessions[key] = (loop, session)
+        return session
+
+    async def aload(self, urls: List[str]) -> List[Document]:
+        """Fetch all URLs concurrently; output order matches ``urls``, minus skipped sources."""
+        try:
+            session = self._session()
+            outcomes = await asyncio.gather(*(self.aload_one(session, url) for url in urls),
+                                            return_exceptions=True)
+            return self._collect(urls, outcomes)
+        except Exception as e:
+            log.error("Failed to load web sources", error=str(e))
+            raise DocumentPortalException("Failed to load web sources", e) from e
+
+    def skipped(self) -> List[Dict[str, str]]:
+        return [{"url": url, "error": error} for url, error in self.failures.items()]
@@ -0,0 +1,301 @@
+from logger import GLOBAL_LOGGER as log
+from exception.custom_exception import DocumentPortalException
+from src.data_ingestion.data_ingestion import SourcesDataIngestion, normalize_url, _build_lock
+from src.data_ingestion.faiss_index import build_vectorstore, load_vectorstore
+from src.data_ingestion.source_cache import close_sessions
+from contextlib import ExitStack, contextmanager
+from langchain_core.documents import Document
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, TYPE_CHECKING
+import asyncio
+import json
+import os
+import shutil
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process locks apply
+    fcntl = None
+
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import FAISS
+
+
+# Name of the pointer file holding the live version directory under versions/
+CURRENT = "CURRENT"
+LEGACY_FILES = ("index.faiss", "index.pkl", "manifest.json")
+
+
+def collection_dir(collection_id: int, faiss_base: str = "faiss_index") -> Path:
+    return Path(faiss_base) / "collections" / str(collection_id)
+
+
+@contextmanager
+def _file_lock(path: Path, shared: bool = False, blocking: bool = True) -> Iterator[bool]:
+    """
+    ``flock`` on ``path``, so the lock holds across worker processes as well as
+    threads. Yields False instead of waiting when ``blocking`` is off and the
+    lock is taken.
+    """
+    if fcntl is None:
+        lock = _build_lock(str(path))
+        acquired = lock.acquire(blocking)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                lock.release()
+        return
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as f:
+        flags = (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | (0 if blocking else fcntl.LOCK_NB)
+        try:
+            fcntl.flock(f.fileno(), flags)
+            acquired = True
+        except BlockingIOError:
+            acquired = False
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _lock_path(collection_id: int, faiss_base: str, kind: str) -> Path:
+    # Outside the collection directory, so deleting a collection never deletes a lock someone is waiting on
+    return Path(faiss_base) / "collections" / ".locks" / f"{collection_id}.{kind}.lock"
+
+
+def _write_lock(collection_id: int, faiss_base: str = "faiss_index"):
+    # Serializes add/remove/delete of one collection across threads and worker processes
+    return _file_lock(_lock_path(collection_id, faiss_base, "write"))
+
+
+def _swap_lock(collection_id: int, faiss_base: str = "faiss_index", shared: bool = False):
+    # Shared while a reader resolves CURRENT and pins that version; exclusive while a writer switches it
+    return _file_lock(_lock_path(collection_id, faiss_base, "swap"), shared=shared)
+
+
+def _pin(version: Path, shared: bool = True, blocking: bool = True):
+    # Readers hold a shared pin while they read a version; pruning only removes versions it can pin exclusively
+    return _file_lock(version.parent / f".{version.name}.lock", shared=shared, blocking=blocking)
+
+
+def current_dir(collection_id: int, faiss_base: str = "faiss_index") -> Optional[Path]:
+    """Directory of the live index version, or None when the collection has never been indexed."""
+    root = collection_dir(collection_id, faiss_base)
+    try:
+        return root / "versions" / (root / CURRENT).read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        # Collections saved before versioning keep their files directly in the root
+        return root if (root / "manifest.json").exists() else None
+
+
+@contextmanager
+def _open_current(collection_id: int, faiss_base: str = "faiss_index") -> Iterator[Optional[Path]]:
+    """The live version, pinned until the block exits; the swap lock is held only while resolving it."""
+    with ExitStack() as stack:
+        with _swap_lock(collection_id, faiss_base, shared=True):
+            version = current_dir(collection_id, faiss_base)
+            if version is not None:
+                stack.enter_context(_pin(version))
+        yield version
+
+
+def load_manifest(collection_id: int, faiss_base: str = "faiss_index") -> Dict[str, Dict]:
+    """Read a collection's URL -> {content_hash, chunk_ids} manifest without loading any models."""
+    with _open_current(collection_id, faiss_base) as version:
+        if version is None:
+            return {}
+        with open(version / "manifest.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+def delete_collection_index(collection_id: int, faiss_base: str = "faiss_index") -> None:
+    root = collection_dir(collection_id, faiss_base)
+    with _write_lock(collection_id, faiss_base), _swap_lock(collection_id, faiss_base), ExitStack() as stack:
+        # Wait for readers still loading a version; new ones block on the swap lock
+        for pin in sorted(root.glob("versions/.*.lock")) + sorted(root.parent.glob(f".{collection_id}.lock")):
+            stack.enter_context(_file_lock(pin))
+        shutil.rmtree(root, ignore_errors=True)
+        (root.parent / f".{collection_id}.lock").unlink(missing_ok=True)
+    log.info("Collection index deleted", collection_id=collection_id)
+
+
+class SourceCollectionIngestion(SourcesDataIngestion):
+    """
+    Long-lived FAISS index for a named source collection.
+
+    Chunks are stored with stable ids, and ``manifest.json`` next to the
+    index maps each URL to its content hash and chunk ids. Adding a URL only
+    embeds that URL's chunks. Removing a URL deletes its chunks by id.
+
+    Every save writes a new ``versions/<id>`` directory and then switches the
+    ``CURRENT`` pointer file with ``os.replace``, so readers always see a
+    complete index and manifest. Writers are serialized and readers pin the
+    version they load with file locks, so this also holds across worker
+    processes; old versions are removed once no reader has them pinned.
+    """
+
+    def __init__(self, collection_id: int, faiss_base: str = "faiss_index", **kwargs):
+        super().__init__(sources=[], faiss_base=faiss_base, **kwargs)
+        self.collection_id = collection_id
+        self.faiss_dir = collection_dir(collection_id, faiss_base)
+
+    def _lock(self):
+        return _write_lock(self.collection_id, str(self.faiss_base))
+
+    def _load_manifest(self) -> Dict[str, Dict]:
+        return load_manifest(self.collection_id, str(self.faiss_base))
+
+    def _load_vectorstore(self, read_only: bool = False) -> Optional["FAISS"]:
+        with _open_current(self.collection_id, str(self.faiss_base)) as version:
+            if version is None or not (version / "index.faiss").exists():
+                return None
+            return load_vectorstore(version, self._embeddings(), self.model_loader.config.get("faiss_db", {}),
+                                    read_only=read_only)
+
+    def _delete_chunks(self, vectorstore: "FAISS", ids: List[str]) -> Optional["FAISS"]:
+        """Remove chunks by id; returns the store to keep using, or None when nothing is left."""
+        if not hasattr(vectorstore.index, "hnsw"):
+            vectorstore.delete(ids)
+            return vectorstore if vectorstore.index.ntotal else None
+
+        # faiss cannot remove ids from an HNSW graph, so rebuild it from the chunks that stay
+        drop = set(ids)
+        keep = [cid for cid in vectorstore.index_to_docstore_id.values() if cid not in drop]
+        log.info("Rebuilding HNSW collection index without removed chunks", collection_id=self.collection_id,
+                 removed=len(drop), kept=len(keep))
+        if not keep:
+            return None
+        return build_vectorstore([vectorstore.docstore.search(cid) for cid in keep], self._embeddings(),
+                                 self.model_loader.config.get("faiss_db", {}), ids=keep)
+
+    def _save(self, vectorstore: Optional["FAISS"], manifest: Dict[str, Dict]) -> None:
+        # Write index and manifest together into a fresh version directory, then repoint CURRENT at it
+        versions = self.faiss_dir / "versions"
+        version = uuid.uuid4().hex[:12]
+        tmp = versions / f".{version}.tmp"
+        tmp.mkdir(parents=True)
+        if vectorstore is not None:
+            vectorstore.save_local(str(tmp))
+        with open(tmp / "manifest.json", "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, versions / version)
+
+        pointer = self.faiss_dir / f".{CURRENT}.{version}.tmp"
+        pointer.write_text(version, encoding="utf-8")
+        with _swap_lock(self.collection_id, str(self.faiss_base)):
+            os.replace(pointer, self.faiss_dir / CURRENT)
+
+        # Nobody can pin an old version any more; drop those no reader is still loading
+        with _pin(self.faiss_dir, shared=False, blocking=False) as idle:
+            if idle:
+                for name in LEGACY_FILES:
+                    (self.faiss_dir / name).unlink(missing_ok=True)
+        for old in versions.iterdir():
+            if old.name == version or old.suffix == ".lock":
+                continue
+            with _pin(old, shared=False, blocking=False) as idle:
+                if idle:
+                    shutil.rmtree(old, ignore_errors=True)
+                    (versions / f".{old.name}.lock").unlink(missing_ok=True)
+
+    def add_sources(self, urls: List[str]) -> List[str]:
+        """Blocking ``aadd_sources`` for callers without an event loop."""
+        async def run():
+            try:
+                return await self.aadd_sources(urls)
+            finally:
+                # The pooled HTTP session belongs to this short-lived loop
+                await close_sessions()
+
+        return asyncio.run(run())
+
+    async def aadd_sources(self, urls: List[str]) -> List[str]:
+        """Fetch new or changed URLs concurrently and index them; returns the URLs that were (re)indexed."""
+        try:
+            urls = list({normalize_url(u): u for u in urls}.values())
+            docs = await self.source_cache.aload(urls)
+            # Index I/O and embedding are blocking; the collection lock is only held for this part
+            return await asyncio.to_thread(self._add_documents, docs)
+        except Exception as e:
+            log.error("Failed to add collection sources", error=str(e))
+            raise DocumentPortalException("Failed to add collection sources", e) from e
+
+    def _add_documents(self, docs: List[Document]) -> List[str]:
+        with self._lock():
+            manifest = self._load_manifest()
+            changed = [d for d in docs
+                       if manifest.get(normalize_url(d.metadata["source"]), {}).get("content_hash") != d.metadata["content_hash"]]
+            if not changed:
+                log.info("Collection already up to date", collection_id=self.collection_id)
+                return []
+
+            vectorstore = self._load_vectorstore()
+            stale_ids = [cid for d in changed
+                         for cid in manifest.get(normalize_url(d.metadata["source"]), {}).get("chunk_ids", [])]
+            if vectorstore is not None and stale_ids:
+                vectorstore = self._delete_chunks(vectorstore, stale_ids)
+
+            chunks = self._split(changed)
+            ids = [uuid.uuid4().hex for _ in chunks]
+            if vectorstore is None:
+                vectorstore = build_vectorstore(chunks, self._embeddings(),
+                                                self.model_loader.config.get("faiss_db", {}), ids=ids)
+            else:
+                vectorstore.add_documents(chunks, ids=ids)
+
+            for d in changed:
+                manifest[normalize_url(d.metadata["source"])] = {"content_hash": d.metadata["content_hash"], "chunk_ids": []}
+            for chunk, cid in zip(chunks, ids):
+                manifest[normalize_url(chunk.metadata["source"])]["chunk_ids"].append(cid)
+
+            self._save(vectorstore, manifest)
+            log.info("Collection sources added", collection_id=self.collection_id,
+                     added=len(changed), chunks=len(chunks))
+            return [normalize_url(d.metadata["source"]) for d in changed]
+
+    def remove_sources(self, urls: List[str]) -> List[str]:
+        """Delete every chunk that came from the given URLs; returns the URLs removed."""
+        try:
+            with self._lock():
+                manifest = self._load_manifest()
+                removed = [u for u in (normalize_url(u) for u in urls) if u in manifest]
+                if not removed:
+                    return []
+
+                ids = [cid for u in removed for cid in manifest.pop(u)["chunk_ids"]]
+                vectorstore = self._load_vectorstore()
+                if vectorstore is not None and ids:
+                    vectorstore = self._delete_chunks(vectorstore, ids)
+                if not manifest:
+                    vectorstore = None
+
+                self._save(vectorstore, manifest)
+                log.info("Collection sources removed", collection_id=self.collection_id,
+                         removed=len(removed), chunks=len(ids))
+                return removed
+        except Exception as e:
+            log.error("Failed to remove collection sources", error=str(e))
+            raise DocumentPortalException("Failed to remove collection sources", e) from e
+
+    def build_retriever(self):
+        try:
+            # Queries never modify the index, so it can be shared through mmap
+            vectorstore = self._load_vectorstore(read_only=True)
+            if vectorstore is None:
+                raise ValueError(f"Collection {self.collection_id} has no indexed sources")
+            log.info("Collection index loaded", collection_id=self.collection_id,
+                     chunks=vectorstore.index.ntotal)
+            return self._make_retriever(vectorstore)
+        except Exception as e:
+            log.error("Failed to build retriever", error=str(e))
+            raise DocumentPortalException("Failed to build retriever", e) from e
+
+    async def abuild_retriever(self):
+        # Loading a saved index is disk + unpickling work; keep it off the event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.build_retriever)
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 from pathlib import Path
@@ -59,7 +60,7 @@ if __name__ == "__main__":
         # Explicitly create tables
         from api.database import create_db_and_tables
         import api.models # Ensure models are registered
-        create_db_and_tables()
+        asyncio.run(create_db_and_tables())
              
         test_register_and_login()
         print("\n🎉 API Verification Passed!")
@@ -0,0 +1,138 @@
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+import api.auth as auth
+from api.auth import PrincipalCache, _load_principal, aget_password_hash, averify_password, principal_cache
+from api.database import Base
+from api.models import User
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_principal_cache_hit_and_expiry():
+    clock = FakeClock()
+    cache = PrincipalCache(ttl_seconds=30, clock=clock)
+    user = User(user_name="alice")
+    cache.put("alice", user)
+    assert cache.get("alice") is user
+    clock.now = 29.0
+    assert cache.get("alice") is user
+    clock.now = 31.0
+    assert cache.get("alice") is None
+
+
+def test_principal_cache_is_bounded_and_can_be_disabled():
+    cache = PrincipalCache(ttl_seconds=30, max_entries=2)
+    for name in ("a", "b", "c"):
+        cache.put(name, User(user_name=name))
+    assert cache.get("a") is None and cache.get("c") is not None
+
+    disabled = PrincipalCache(ttl_seconds=0)
+    disabled.put("a", User(user_name="a"))
+    assert disabled.get("a") is None
+
+
+def test_password_hashing_runs_off_the_event_loop():
+    seen = []
+    original = auth.verify_password
+
+    def verify(plain, hashed):
+        seen.append(threading.current_thread().name)
+        return original(plain, hashed)
+
+    async def run():
+        hashed = await aget_password_hash("s3cret")
+        auth.verify_password = verify
+        try:
+            return await averify_password("s3cret", hashed), await averify_password("wrong", hashed)
+        finally:
+            auth.verify_password = original
+
+    assert asyncio.run(run()) == (True, False)
+    assert all(name.startswith("pwd-hash") for name in seen)
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'auth.db'}")
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create())
+    principal_cache.clear()
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    principal_cache.clear()
+    asyncio.run(engine.dispose())
+
+
+async def add_user(factory, name):
+    async with factory() as db:
+        db.add(User(user_name=name, email=f"{name}@example.com", hashed_password="x"))
+        await db.commit()
+
+
+async def cached_user(factory, name):
+    async with factory() as db:
+        return await _load_principal(db, name)
+
+
+def test_cache_serves_repeat_lookups_and_drops_renamed_users(session_factory):
+    async def run():
+        await add_user(session_factory, "alice")
+        first = await cached_user(session_factory, "alice")
+        assert await cached_user(session_factory, "alice") is first
+        async with session_factory() as db:
+            user = await db.get(User, first.id)
+            user.user_name = "alicia"
+            await db.commit()
+        return await cached_user(session_factory, "alice"), await cached_user(session_factory, "alicia")
+
+    old, new = asyncio.run(run())
+    assert old is None
+    assert new.user_name == "alicia"
+
+
+def test_cache_drops_deleted_users(session_factory):
+    async def run():
+        await add_user(session_factory, "bob")
+        user = await cached_user(session_factory, "bob")
+        async with session_factory() as db:
+            await db.delete(await db.get(User, user.id))
+            await db.commit()
+        return await cached_user(session_factory, "bob")
+
+    assert asyncio.run(run()) is None
+
+
+def test_bulk_statements_clear_the_cache(session_factory):
+    async def run():
+        await add_user(session_factory, "carol")
+        await add_user(session_factory, "dave")
+        await cached_user(session_factory, "carol")
+        await cached_user(session_factory, "dave")
+        async with session_factory() as db:
+            await db.execute(update(User).where(User.user_name == "carol").values(full_name="Carol"))
+            await db.execute(delete(User).where(User.user_name == "dave"))
+            await db.commit()
+        return await cached_user(session_factory, "carol"), await cached_user(session_factory, "dave")
+
+    carol, dave = asyncio.run(run())
+    assert carol.full_name == "Carol"
+    assert dave is None
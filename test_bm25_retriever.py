@@ -0,0 +1,106 @@
+import asyncio
+import math
+import sys
+from collections import Counter
+from pathlib import Path
+
+from langchain_core.documents import Document
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from src.data_ingestion.bm25_retriever import BM25Index, BM25Retriever, HybridRetriever, tokenize
+
+TEXTS = [
+    "Tariffs on steel imports were raised in March.",
+    "The summit discussed steel, aluminium and tariffs at length; tariffs dominated.",
+    "Troops were withdrawn from the border region.",
+    "A new trade agreement lowered tariffs on grain.",
+]
+
+
+def docs():
+    return [Document(page_content=t, metadata={"source": f"https://example.com/{i}"}) for i, t in enumerate(TEXTS)]
+
+
+def reference_scores(texts, query, k1=1.5, b=0.75):
+    """Textbook Okapi BM25, one document at a time."""
+    counts = [Counter(tokenize(t)) for t in texts]
+    avg = sum(sum(c.values()) for c in counts) / len(counts)
+    scores = []
+    for c in counts:
+        length = sum(c.values())
+        score = 0.0
+        for term in set(tokenize(query)):
+            df = sum(1 for other in counts if term in other)
+            if not c[term]:
+                continue
+            idf = math.log(1 + (len(texts) - df + 0.5) / (df + 0.5))
+            score += idf * c[term] * (k1 + 1) / (c[term] + k1 * (1 - b + b * length / avg))
+        scores.append(score)
+    return scores
+
+
+def test_scores_match_reference_bm25():
+    index = BM25Index(TEXTS)
+    for query in ("steel tariffs", "border troops", "grain"):
+        expected = reference_scores(TEXTS, query)
+        assert [round(float(s), 4) for s in index.scores(query)] == [round(s, 4) for s in expected]
+
+
+def test_search_ranks_and_skips_non_matching_chunks():
+    index = BM25Index(TEXTS)
+    hits = index.search("tariffs", k=10)
+    assert [i for i, _ in hits][0] == 1
+    assert {i for i, _ in hits} == {0, 1, 3}
+    assert index.search("nonexistent", k=3) == []
+    assert BM25Index([]).search("tariffs", k=3) == []
+
+
+def test_retriever_returns_top_k_documents():
+    retriever = BM25Retriever.from_documents(docs(), k=2)
+    expected = reference_scores(TEXTS, "steel tariffs")
+    best = sorted(range(len(TEXTS)), key=lambda i: expected[i], reverse=True)[:2]
+    found = retriever.invoke("STEEL Tariffs")
+    assert [d.page_content for d in found] == [TEXTS[i] for i in best]
+
+
+class FakeVectorStore:
+    """Relevance scores fixed per chunk index, so fusion is deterministic."""
+
+    def __init__(self, documents, scores):
+        self.ranked = sorted(zip(documents, scores), key=lambda pair: pair[1], reverse=True)
+
+    def similarity_search_with_relevance_scores(self, query, k):
+        return self.ranked[:k]
+
+    async def asimilarity_search_with_relevance_scores(self, query, k):
+        return self.ranked[:k]
+
+
+def test_hybrid_fuses_normalized_scores():
+    chunks = docs()
+    vector = [0.2, 0.3, 0.9, 0.1]
+    vectorstore = FakeVectorStore(chunks, vector)
+    bm25 = BM25Retriever.from_documents(chunks)
+    query = "steel tariffs"
+
+    def ranked(weights):
+        return [TEXTS[i] for i in sorted(range(len(TEXTS)), key=weights.__getitem__, reverse=True)]
+
+    # Chunk 2 has no lexical match, so BM25 leaves it out and it only gets a vector score
+    lexical = reference_scores(TEXTS, query)
+    matched = [s for s in lexical if s > 0]
+    lexical_norm = [(s - min(matched)) / (max(matched) - min(matched)) if s > 0 else 0.0 for s in lexical]
+    vector_norm = [(s - min(vector)) / (max(vector) - min(vector)) for s in vector]
+
+    vector_only = HybridRetriever(bm25=bm25, vectorstore=vectorstore, k=1, alpha=1.0)
+    lexical_only = HybridRetriever(bm25=bm25, vectorstore=vectorstore, k=1, alpha=0.0)
+    assert vector_only.invoke(query)[0].page_content == ranked(vector_norm)[0]
+    assert lexical_only.invoke(query)[0].page_content == ranked(lexical_norm)[0]
+
+    hybrid = HybridRetriever(bm25=bm25, vectorstore=vectorstore, k=4, alpha=0.5)
+    found = [d.page_content for d in hybrid.invoke(query)]
+    # Every chunk appears once even though both sides returned it
+    assert found == ranked([0.5 * v + 0.5 * l for v, l in zip(vector_norm, lexical_norm)])
+    assert [d.page_content for d in asyncio.run(hybrid.ainvoke(query))] == found
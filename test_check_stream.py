@@ -0,0 +1,133 @@
+import asyncio
+import io
+import json
+import sys
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from api.main import app
+from api.routers import check
+from checker_fakes import CLAIMS, SINGLE_VERDICT, FakeLLM, make_checker, make_retriever, make_upload
+
+
+def streaming_checker(llm=None, claims=CLAIMS):
+    checker = make_checker(llm)
+
+    async def extract(uploaded_file):
+        return list(claims)
+
+    checker._extract_claims = extract
+    return checker
+
+
+async def collect(checker):
+    return [event async for event in checker.astream_check_claims(make_upload(), make_retriever())]
+
+
+def test_events_are_claims_then_verdicts_then_done():
+    events = asyncio.run(collect(streaming_checker()))
+
+    assert events[0] == {"type": "claims", "claims": CLAIMS}
+    verdicts = events[1:-1]
+    assert sorted(e["index"] for e in verdicts) == list(range(len(CLAIMS)))
+    assert all(e["type"] == "verdict" and e["verification"] == SINGLE_VERDICT for e in verdicts)
+    assert events[-1] == {"type": "done", "verified": len(CLAIMS)}
+
+
+def test_failed_claim_streams_a_claim_error_event():
+    def answer(claim):
+        if claim == CLAIMS[2]:
+            raise RuntimeError("provider error")
+        return SINGLE_VERDICT
+
+    events = asyncio.run(collect(streaming_checker(FakeLLM(answer=answer))))
+
+    errors = [e for e in events if e["type"] == "claim_error"]
+    assert errors == [{"type": "claim_error", "index": 2, "claim": CLAIMS[2], "error": "provider error"}]
+    assert events[-1] == {"type": "done", "verified": len(CLAIMS) - 1}
+
+
+class HangingLLM(FakeLLM):
+    """Verification calls never finish on their own; records which ones were cancelled."""
+
+    def __init__(self):
+        super().__init__()
+        self.started, self.cancelled = [], []
+
+    async def _aanswer(self, prompt):
+        claim = self._claim(prompt.to_string())
+        self.started.append(claim)
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled.append(claim)
+            raise
+
+
+def test_closing_the_stream_cancels_the_remaining_work():
+    llm = HangingLLM()
+
+    async def run():
+        stream = streaming_checker(llm).astream_check_claims(make_upload(), make_retriever())
+        first = await stream.__anext__()
+        while len(llm.started) < len(CLAIMS):
+            await asyncio.sleep(0.01)
+        # What StreamingResponse does when the client goes away
+        await stream.aclose()
+        while len(llm.cancelled) < len(CLAIMS):
+            await asyncio.sleep(0.01)
+        return first
+
+    first = asyncio.run(asyncio.wait_for(run(), 2.0))
+
+    assert first["type"] == "claims"
+    assert sorted(llm.cancelled) == sorted(CLAIMS)
+
+
+def login(client):
+    name = f"stream_{uuid.uuid4().hex[:8]}"
+    client.post("/auth/register", json={"user_name": name, "email": f"{name}@example.com",
+                                        "password": "secretpassword", "full_name": "Stream Test"})
+    response = client.post("/auth/login-cookie", data={"username": name, "password": "secretpassword"})
+    client.cookies.set("access_token", response.cookies["access_token"])
+
+
+def stream(client):
+    files = {"file": ("doc.pdf", io.BytesIO(b"%PDF-1.4 fake"), "application/pdf")}
+    response = client.post("/check-claims/stream", files=files, data={"sources": '["https://example.com"]'})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_endpoint_streams_ndjson_events_in_order(monkeypatch):
+    async def build():
+        return make_retriever()
+
+    ingestion = SimpleNamespace(abuild_retriever=build, skipped_sources=[{"url": "https://down.example", "error": "x"}])
+    monkeypatch.setattr(check, "_make_ingestion", lambda sources, collection_id: ingestion)
+    monkeypatch.setattr(check, "ClaimsChecker", streaming_checker)
+    with TestClient(app) as client:
+        login(client)
+        events = stream(client)
+
+    assert [e["type"] for e in events] == ["sources_skipped", "claims"] + ["verdict"] * len(CLAIMS) + ["done"]
+
+
+def test_endpoint_streams_an_error_event_when_the_pipeline_fails(monkeypatch):
+    async def build():
+        raise RuntimeError("no sources could be loaded")
+
+    monkeypatch.setattr(check, "_make_ingestion",
+                        lambda sources, collection_id: SimpleNamespace(abuild_retriever=build, skipped_sources=[]))
+    with TestClient(app) as client:
+        login(client)
+        events = stream(client)
+
+    assert events == [{"type": "error", "detail": "no sources could be loaded"}]
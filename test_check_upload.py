@@ -0,0 +1,65 @@
+import io
+import sys
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from api.main import app
+from api.routers import check
+from exception.custom_exception import DocumentPortalException
+from utils.file_io import UploadTooLarge, save_uploaded_file
+
+
+def login(client):
+    name = f"upload_{uuid.uuid4().hex[:8]}"
+    client.post("/auth/register", json={"user_name": name, "email": f"{name}@example.com",
+                                        "password": "secretpassword", "full_name": "Upload Test"})
+    response = client.post("/auth/login-cookie", data={"username": name, "password": "secretpassword"})
+    client.cookies.set("access_token", response.cookies["access_token"])
+
+
+def upload(size):
+    return {"file": ("doc.pdf", io.BytesIO(b"x" * size), "application/pdf")}
+
+
+def test_oversize_upload_is_rejected_before_the_pipeline(monkeypatch):
+    loader = SimpleNamespace(config={"uploads": {"max_bytes": 100}})
+    monkeypatch.setattr(check, "get_model_loader", lambda: loader)
+    with TestClient(app) as client:
+        login(client)
+        data = {"sources": '["https://example.com"]'}
+        assert client.post("/check-claims", files=upload(101), data=data).status_code == 413
+        assert client.post("/check-claims/stream", files=upload(101), data=data).status_code == 413
+
+        # A reloaded config applies to the next request
+        loader.config = {"uploads": {"max_bytes": 50}}
+        response = client.post("/check-claims/stream", files=upload(60), data=data)
+        assert response.status_code == 413
+        assert "50 byte limit" in response.json()["detail"]
+
+
+def test_limit_hit_while_streaming_to_disk_maps_to_413(monkeypatch):
+    # Size unknown up front: the job queue's streaming write is what trips the limit
+    monkeypatch.setattr(check, "_upload_size", lambda file: None)
+    with TestClient(app) as client:
+        login(client)
+        monkeypatch.setattr(app.state.job_queue, "max_upload_bytes", 100)
+        response = client.post("/check-claims", files=upload(101),
+                               data={"sources": '["https://example.com"]', "background": "true"})
+    assert response.status_code == 413
+    assert "100 byte limit" in response.json()["detail"]
+
+
+def test_upload_too_large_is_found_behind_wrapping(tmp_path):
+    try:
+        save_uploaded_file(type("Upload", (io.BytesIO,), {"name": "doc.pdf"})(b"x" * 10), tmp_path, max_bytes=5)
+    except DocumentPortalException as e:
+        assert isinstance(check._upload_too_large(e), UploadTooLarge)
+    else:
+        raise AssertionError("expected the upload to be rejected")
+    assert check._upload_too_large(RuntimeError("other")) is None
@@ -0,0 +1,108 @@
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from checker_fakes import FakeLLM, make_checker, make_upload
+from src.checker.claims_checker import ClaimsChecker
+
+PAGES = ["alpha " * 5, "beta " * 4, "gamma " * 30, "delta"]
+
+
+def windows(pages, window_chars, overlap=0):
+    return list(ClaimsChecker._windows(iter(pages), window_chars, overlap))
+
+
+def test_small_pages_are_grouped_up_to_the_window_size():
+    assert windows(["aaaa", "bbb", "cc", "d"], 8) == ["aaaa\nbbb", "cc\nd"]
+    assert windows(["aaaa", "bbb"], 100) == ["aaaa\nbbb"]
+    assert windows([], 8) == []
+
+
+def test_oversize_pages_are_sliced_without_overlap_by_default():
+    page = "0123456789" * 3
+    assert windows([page], 10) == ["0123456789"] * 3
+    assert windows(["ab", page[:25]], 10) == ["ab", "0123456789", "0123456789", "01234"]
+
+
+def test_slices_of_an_oversize_page_overlap():
+    page = "".join(chr(ord("a") + i) for i in range(25))
+    sliced = windows([page], 10, overlap=4)
+
+    assert sliced == [page[0:10], page[6:16], page[12:22], page[18:25]]
+    for previous, current in zip(sliced, sliced[1:]):
+        assert previous[-4:] == current[:4]
+    # No trailing slice that is already contained in the previous one
+    assert windows(["x" * 20], 10, overlap=5) == ["x" * 10, "x" * 10, "x" * 10]
+    # An overlap as large as the window still advances
+    assert windows(["abc"], 2, overlap=5) == ["ab", "bc"]
+
+
+def test_merge_drops_repeats_across_windows_in_document_order():
+    merged = ClaimsChecker._merge_claims([
+        ["Tariffs rose in 2024.", "Exports fell."],
+        ["tariffs rose in 2024", "Imports grew!"],
+        ["EXPORTS FELL", "", "..."],
+    ])
+    assert merged == ["Tariffs rose in 2024.", "Exports fell.", "Imports grew!"]
+
+
+def extracting_checker(tmp_path, extract, pages=PAGES, **claim_extraction):
+    llm = FakeLLM(extract=extract)
+    checker = make_checker(llm, tmp_path, claim_extraction=claim_extraction)
+    checker._page_texts = lambda path, doc_hash: iter(pages)
+    return checker, llm
+
+
+def test_windowed_extraction_merges_claims_of_every_window(tmp_path):
+    seen = []
+
+    def extract(text):
+        seen.append(text)
+        return f"1. Shared claim.\n2. Window of {len(text)} chars."
+
+    checker, llm = extracting_checker(tmp_path, extract, mode="windowed", window_chars=60, max_concurrency=2)
+    claims = asyncio.run(checker._extract_claims(make_upload()))
+
+    assert llm.extract_calls == len(seen) > 1
+    assert claims[0] == "Shared claim."
+    assert claims[1:] == list(dict.fromkeys(f"Window of {len(text)} chars." for text in seen))
+
+
+def test_windowed_extraction_skips_failed_windows_but_not_all(tmp_path):
+    def flaky(text):
+        if "gamma" in text:
+            raise RuntimeError("provider error")
+        return f"1. About {text.split()[0]}."
+
+    checker, _ = extracting_checker(tmp_path, flaky, mode="windowed", window_chars=60)
+    claims = asyncio.run(checker._extract_claims(make_upload()))
+    assert "About alpha." in claims and not any("gamma" in claim for claim in claims)
+
+    def broken(text):
+        raise RuntimeError("provider error")
+
+    checker, _ = extracting_checker(tmp_path, broken, mode="windowed", window_chars=60)
+    try:
+        asyncio.run(checker._extract_claims(make_upload()))
+    except RuntimeError as e:
+        assert "every window" in str(e)
+    else:
+        raise AssertionError("expected RuntimeError when every window fails")
+
+
+def test_single_mode_extracts_once_over_the_whole_text(tmp_path):
+    seen = []
+
+    def extract(text):
+        seen.append(text)
+        return "1. First claim.\n- Second claim.\nNot a claim"
+
+    checker, llm = extracting_checker(tmp_path, extract, window_chars=60)
+    claims = asyncio.run(checker._extract_claims(make_upload()))
+
+    assert llm.extract_calls == 1
+    assert seen == ["\n".join(PAGES).strip()]
+    assert claims == ["First claim.", "Second claim."]
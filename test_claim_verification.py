@@ -0,0 +1,177 @@
+import asyncio
+import json
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from checker_fakes import CLAIMS, SINGLE_VERDICT, FakeLLM, make_checker, make_retriever
+from src.checker.claims_checker import ClaimsChecker
+from utils.embedding_cache import CachedEmbeddings, EmbeddingCache
+from utils.vector_search import batch_similarity_search
+
+
+def batched(batch_size=5):
+    return {"mode": "batched", "batch_size": batch_size, "max_concurrency": 2}
+
+
+def verify(checker, claims=CLAIMS):
+    return asyncio.run(checker._verify_claims(claims, make_retriever()))
+
+
+def test_one_llm_call_per_batch():
+    llm = FakeLLM()
+    results = verify(make_checker(llm, verification=batched(3)))
+
+    assert [r["claim"] for r in results] == CLAIMS
+    assert all(r["verification"] == "**Verdict**: SUPPORTED\n**Explanation**: batched" for r in results)
+    assert llm.batch_calls == 2
+    assert llm.single_calls == 0
+
+
+def test_missing_and_invalid_entries_fall_back_per_claim():
+    def answer(numbers):
+        return json.dumps([
+            {"index": 1, "verdict": "SUPPORTED", "explanation": "ok"},
+            {"index": 2, "verdict": "PROBABLY", "explanation": "not a verdict"},
+            {"index": 4, "verdict": "CONTRADICTED", "explanation": "no"},
+        ])
+
+    llm = FakeLLM(batch_answer=answer)
+    results = verify(make_checker(llm, verification=batched()))
+
+    verdicts = [r["verification"].split("\n")[0] for r in results]
+    assert verdicts == ["**Verdict**: SUPPORTED", "**Verdict**: NOT_MENTIONED",
+                        "**Verdict**: NOT_MENTIONED", "**Verdict**: CONTRADICTED"]
+    assert llm.batch_calls == 1
+    assert llm.single_calls == 2
+
+
+def test_malformed_batch_output_falls_back_for_every_claim():
+    llm = FakeLLM(batch_answer=lambda numbers: "Sorry, I cannot help with that.")
+    results = verify(make_checker(llm, verification=batched()))
+
+    assert len(results) == len(CLAIMS)
+    assert all(r["verification"] == SINGLE_VERDICT for r in results)
+    assert llm.batch_calls == 1
+    assert llm.single_calls == len(CLAIMS)
+
+
+def test_parse_batch_verdicts_keeps_valid_in_range_entries():
+    raw = 'Here you go:\n' + json.dumps([
+        {"index": 2, "verdict": "CONTRADICTED", "explanation": "wrong year"},
+        {"index": 2, "verdict": "SUPPORTED", "explanation": "duplicate index"},
+        {"index": 3, "verdict": "SUPPORTED", "explanation": "out of range"},
+        {"verdict": "SUPPORTED"},
+    ])
+
+    assert ClaimsChecker._parse_batch_verdicts(raw, 2) == {
+        1: "**Verdict**: CONTRADICTED\n**Explanation**: wrong year",
+    }
+    try:
+        ClaimsChecker._parse_batch_verdicts("no array here", 2)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for output without a JSON array")
+
+
+class NormalizedEmbedding(DeterministicFakeEmbedding):
+    """Claims that differ only in case and punctuation get identical vectors."""
+
+    def embed_documents(self, texts):
+        return [self._get_embedding(seed=self._get_seed(re.sub(r"\W+", " ", t.lower()).strip())) for t in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def test_near_duplicate_claims_are_verified_once():
+    llm = FakeLLM()
+    checker = make_checker(llm, claim_dedup={"enabled": True, "similarity_threshold": 0.99})
+    claims = ["The sky is blue.", "Water boils at 100C.", "the sky is BLUE!"]
+
+    results = asyncio.run(checker._verify_claims(claims, make_retriever(embedding=NormalizedEmbedding(size=8))))
+
+    assert [r["claim"] for r in results] == claims
+    assert llm.single_calls == 2
+    assert results[2]["duplicate_of"] == "The sky is blue."
+    assert results[2]["verification"] == results[0]["verification"]
+    assert "duplicate_of" not in results[0] and "duplicate_of" not in results[1]
+
+
+def test_cluster_claims_respects_threshold_and_switch():
+    checker = make_checker()
+    vectors = np.array([[1.0, 0.0], [0.0, 1.0], [0.95, 0.05], [0.6, 0.8]], dtype=np.float32)
+    claims = ["a", "b", "c", "d"]
+
+    assert checker._cluster_claims(claims, vectors) == {i: [i] for i in range(4)}
+
+    checker.model_loader.config["claim_dedup"] = {"enabled": True, "similarity_threshold": 0.99}
+    assert checker._cluster_claims(claims, vectors) == {0: [0, 2], 1: [1], 3: [3]}
+
+
+def test_results_keep_input_order_when_claims_finish_out_of_order():
+    # Earlier claims take longer, so they complete last
+    delays = {claim: 0.05 * (len(CLAIMS) - i) for i, claim in enumerate(CLAIMS)}
+    llm = FakeLLM(answer=lambda claim: f"**Verdict**: SUPPORTED\n**Explanation**: {claim}", delay=delays.get)
+    checker = make_checker(llm, verification={"mode": "single", "max_concurrency": len(CLAIMS)})
+    finished = []
+
+    async def on_result(index, item):
+        finished.append(index)
+
+    results = asyncio.run(checker._verify_claims(CLAIMS, make_retriever(), on_result))
+
+    assert finished == list(reversed(range(len(CLAIMS))))
+    assert [r["claim"] for r in results] == CLAIMS
+    assert all(r["verification"].endswith(r["claim"]) for r in results)
+
+
+def test_failing_claim_is_reported_without_aborting_the_others():
+    def answer(claim):
+        if claim == CLAIMS[1]:
+            raise RuntimeError("provider error")
+        return SINGLE_VERDICT
+
+    checker = make_checker(FakeLLM(answer=answer))
+    events = {}
+
+    async def on_result(index, item):
+        events[index] = item
+
+    results = asyncio.run(checker._verify_claims(CLAIMS, make_retriever(), on_result))
+
+    assert events[1] == {"claim": CLAIMS[1], "error": "provider error"}
+    assert all("verification" in events[i] for i in (0, 2, 3))
+    # The failed claim is left out of the results; the rest keep their order
+    assert [r["claim"] for r in results] == [CLAIMS[0], CLAIMS[2], CLAIMS[3]]
+
+
+class QueryPrefixEmbedding(DeterministicFakeEmbedding):
+    """Embeds queries differently from documents, like instruction-tuned models do."""
+
+    def embed_query(self, text):
+        return super().embed_query(f"query: {text}")
+
+
+def test_batched_retrieval_matches_per_claim_search(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "fake")
+    embedding = CachedEmbeddings(QueryPrefixEmbedding(size=8), cache)
+    retriever = make_retriever([f"source text {i}" for i in range(20)], embedding, k=3)
+    chunk_rows = cache._row_count()
+    checker = make_checker()
+
+    vectors, searchable = asyncio.run(checker._embed_claims(CLAIMS, retriever.vectorstore))
+    batched_docs = batch_similarity_search(retriever.vectorstore, vectors, 3)
+
+    assert searchable
+    assert batched_docs == [retriever.vectorstore.similarity_search(claim, k=3) for claim in CLAIMS]
+    # Claims are queries, not chunks: they are not written to the chunk embedding cache
+    assert cache._row_count() == chunk_rows
+    cache.close()
@@ -0,0 +1,58 @@
+import asyncio
+import sys
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from api.database import IS_SQLITE, SessionLocal, _database_url, engine, get_db
+
+
+def test_database_url_maps_sync_drivers_to_async_ones(monkeypatch):
+    cases = {
+        "sqlite:///./other.db": "sqlite+aiosqlite",
+        "postgresql://app:secret@db:5432/checkmate": "postgresql+asyncpg",
+        "mysql://app:secret@db/checkmate": "mysql+aiomysql",
+        "postgresql+asyncpg://app@db/checkmate": "postgresql+asyncpg",
+    }
+    for url, driver in cases.items():
+        monkeypatch.setenv("DATABASE_URL", url)
+        assert _database_url().drivername == driver
+    # The password survives the driver swap
+    monkeypatch.setenv("DATABASE_URL", "postgresql://app:secret@db:5432/checkmate")
+    assert _database_url().password == "secret"
+
+    monkeypatch.delenv("DATABASE_URL")
+    assert _database_url().drivername == "sqlite+aiosqlite"
+
+
+def test_sqlite_connections_use_wal_and_busy_timeout():
+    if not IS_SQLITE:
+        return
+
+    async def pragmas():
+        async with engine.connect() as conn:
+            journal = (await conn.exec_driver_sql("PRAGMA journal_mode")).scalar()
+            timeout = (await conn.exec_driver_sql("PRAGMA busy_timeout")).scalar()
+        return journal, timeout
+
+    assert asyncio.run(pragmas()) == ("wal", 5000)
+
+
+def test_get_db_yields_independent_async_sessions():
+    async def run():
+        async def query(i):
+            async for db in get_db():
+                assert isinstance(db, AsyncSession)
+                return (await db.execute(text("SELECT :i"), {"i": i})).scalar()
+
+        results = await asyncio.gather(*(query(i) for i in range(8)))
+        await engine.dispose()
+        return results
+
+    assert asyncio.run(run()) == list(range(8))
+    assert SessionLocal.kw["expire_on_commit"] is False
+
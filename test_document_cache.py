@@ -0,0 +1,102 @@
+import asyncio
+import hashlib
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from checker_fakes import FakeLLM, make_checker, make_upload
+from utils.document_cache import DocumentCache
+
+
+def write_pages(cache, doc_hash, pages):
+    with cache.page_writer(doc_hash) as write:
+        for text in pages:
+            write(text)
+
+
+def test_pages_round_trip_and_partial_writes_are_dropped(tmp_path):
+    cache = DocumentCache(str(tmp_path))
+    write_pages(cache, "a" * 64, ["page one", "page two"])
+    assert list(cache.iter_pages("a" * 64)) == ["page one", "page two"]
+
+    try:
+        with cache.page_writer("b" * 64) as write:
+            write("half")
+            raise RuntimeError("parse error")
+    except RuntimeError:
+        pass
+    assert cache.iter_pages("b" * 64) is None
+    assert not list(cache.pages_dir.glob("*.tmp"))
+
+
+def test_expired_entries_are_ignored_and_removed(tmp_path):
+    cache = DocumentCache(str(tmp_path), ttl_seconds=60)
+    cache.put_claims("key", "doc", ["claim"])
+    assert cache.get_claims("key") == ["claim"]
+
+    path = cache.claims_dir / "key.json"
+    old = time.time() - 120
+    os.utime(path, (old, old))
+    assert cache.get_claims("key") is None
+    assert not path.exists()
+
+
+def test_prune_keeps_recently_used_entries_within_budget(tmp_path):
+    cache = DocumentCache(str(tmp_path), max_bytes=10 ** 9)
+    for n in range(4):
+        cache.put_claims(f"k{n}", "doc", ["x" * 100])
+        stamp = time.time() - 100 + n
+        os.utime(cache.claims_dir / f"k{n}.json", (stamp, stamp))
+    # A hit marks k0 as recently used, so k1 is now the oldest
+    assert cache.get_claims("k0")
+
+    cache.max_bytes = sum((cache.claims_dir / f"{k}.json").stat().st_size for k in ("k0", "k3"))
+    assert cache.prune() == 2
+    assert sorted(p.stem for p in cache.claims_dir.glob("*.json")) == ["k0", "k3"]
+
+
+def make_extracting_checker(tmp_path, answer):
+    """ClaimsChecker wired to a fake extraction model and a real document cache."""
+    checker = make_checker(FakeLLM(extract=answer), tmp_path,
+                           claim_extraction={"mode": "windowed", "window_chars": 10, "max_concurrency": 2})
+    checker.document_cache = DocumentCache(str(tmp_path / "doc_cache"))
+    return checker
+
+
+def extract(checker, pages):
+    payload = b"%PDF-1.4 fake"
+    # Seed the page cache so extraction replays these pages instead of parsing a PDF
+    write_pages(checker.document_cache, hashlib.sha256(payload).hexdigest(), pages)
+    return asyncio.run(checker._extract_claims(make_upload(payload)))
+
+
+def test_partial_windowed_extraction_is_not_cached(tmp_path):
+    def flaky(text):
+        if "second" in text:
+            raise RuntimeError("provider timeout")
+        return f"1. {text}"
+
+    checker = make_extracting_checker(tmp_path, flaky)
+    claims = extract(checker, ["first page", "second pg", "third page"])
+
+    assert claims == ["first page", "third page"]
+    assert not list(checker.document_cache.claims_dir.glob("*.json"))
+
+
+def test_complete_windowed_extraction_is_cached_and_deduplicated(tmp_path):
+    calls = []
+
+    def answer(text):
+        calls.append(text)
+        return "1. Water boils at 100C.\n2. " + text
+
+    checker = make_extracting_checker(tmp_path, answer)
+    first = extract(checker, ["first page", "second pg"])
+    assert first == ["Water boils at 100C.", "first page", "second pg"]
+
+    assert extract(checker, ["first page", "second pg"]) == first
+    assert len(calls) == 2  # second run is served from the claims cache
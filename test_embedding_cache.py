@@ -0,0 +1,100 @@
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from utils.embedding_cache import EmbeddingCache, CachedEmbeddings, text_hash
+
+
+DIM = 8
+
+
+def vectors_for(prefix, count):
+    # Every vector encodes its own key, so a mis-mapped row is detectable
+    return [f"{prefix}-{i}" for i in range(count)], np.array(
+        [[hash(f"{prefix}-{i}") % 1000 + j for j in range(DIM)] for i in range(count)], dtype=np.float32
+    )
+
+
+def test_round_trip(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "model")
+    keys, vecs = vectors_for("a", 3)
+    cache.put_many(keys, vecs)
+    found = cache.get_many(keys + ["missing"])
+    assert set(found) == set(keys)
+    assert np.array_equal(found["a-1"], vecs[1])
+    cache.close()
+
+
+def test_shared_returns_one_instance_per_directory(tmp_path):
+    first = EmbeddingCache.shared(str(tmp_path), "model")
+    assert EmbeddingCache.shared(str(tmp_path), "model") is first
+    assert EmbeddingCache.shared(str(tmp_path), "other") is not first
+    first.close()
+    assert EmbeddingCache.shared(str(tmp_path), "model") is not first
+
+
+def test_concurrent_put_many_keeps_rows_aligned(tmp_path):
+    # Separate instances stand in for separate processes: they share only the files
+    caches = [EmbeddingCache(str(tmp_path), "model") for _ in range(4)]
+    batches = [vectors_for(f"w{n}", 50) for n in range(len(caches))]
+    barrier = threading.Barrier(len(caches))
+
+    def write(cache, keys, vecs):
+        barrier.wait()
+        for start in range(0, len(keys), 5):
+            cache.put_many(keys[start:start + 5], vecs[start:start + 5])
+
+    threads = [threading.Thread(target=write, args=(c, *b)) for c, b in zip(caches, batches)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    reader = EmbeddingCache(str(tmp_path), "model")
+    for keys, vecs in batches:
+        found = reader.get_many(keys)
+        assert len(found) == len(keys)
+        for key, vec in zip(keys, vecs):
+            assert np.array_equal(found[key], vec), key
+    for cache in caches + [reader]:
+        cache.close()
+
+
+def test_eviction_compacts_and_keeps_recent_rows(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "model", max_bytes=DIM * 4 * 10)
+    keys, vecs = vectors_for("e", 12)
+    for key, vec in zip(keys, vecs):
+        cache.put_many([key], vec[None, :])
+    assert cache.vectors_path.stat().st_size <= DIM * 4 * 10
+    found = cache.get_many(keys)
+    assert keys[-1] in found and keys[0] not in found
+    assert np.array_equal(found[keys[-1]], vecs[-1])
+    cache.close()
+
+
+class CountingEmbeddings:
+    def __init__(self):
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(t))] * DIM for t in texts]
+
+    def embed_query(self, text):
+        return [0.0] * DIM
+
+
+def test_cached_embeddings_only_embeds_misses(tmp_path):
+    inner = CountingEmbeddings()
+    embeddings = CachedEmbeddings(inner, EmbeddingCache(str(tmp_path), "model"))
+    embeddings.embed_documents(["one", "two", "two"])
+    result = embeddings.embed_documents(["two", "three"])
+    assert inner.embedded == ["one", "two", "three"]
+    assert result[0] == [3.0] * DIM
+    assert embeddings.cache.get_many([text_hash("three")])
+    embeddings.cache.close()
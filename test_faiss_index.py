@@ -0,0 +1,74 @@
+import sys
+from pathlib import Path
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from src.data_ingestion.faiss_index import build_vectorstore, factory_string, index_settings, load_vectorstore
+from test_source_collections import PAGES, make_collection
+
+
+def settings(**cfg):
+    return index_settings(cfg)
+
+
+def test_factory_string_degrades_for_small_corpora():
+    assert factory_string(settings(), 8, 10) == "Flat"
+    assert factory_string(settings(index_type="hnsw", hnsw_m=16), 8, 10) == "HNSW16,Flat"
+    # nlist is capped so every centroid gets ~39 training points; too few for even one falls back to Flat
+    assert factory_string(settings(index_type="ivf_flat", nlist=1024), 8, 39 * 10) == "IVF10,Flat"
+    assert factory_string(settings(index_type="ivf_flat"), 8, 20) == "Flat"
+
+
+def test_factory_string_falls_back_from_pq():
+    enough = 39 * 2 ** 8
+    assert factory_string(settings(index_type="ivf_pq", nlist=64, pq_m=4), 8, enough) == "IVF64,PQ4x8"
+    # Dimension not divisible by pq_m, or too few vectors to train the codebooks
+    assert factory_string(settings(index_type="ivf_pq", nlist=64, pq_m=3), 8, enough) == "IVF64,Flat"
+    assert factory_string(settings(index_type="ivf_pq", nlist=64, pq_m=4), 8, 39 * 4) == "IVF4,Flat"
+
+
+def test_unknown_index_type_is_rejected():
+    try:
+        index_settings({"index_type": "lsh"})
+    except ValueError as e:
+        assert "lsh" in str(e)
+    else:
+        raise AssertionError("expected ValueError for an unsupported index type")
+
+
+def chunks(count):
+    return [Document(page_content=f"chunk {i} about topic {i % 7}", metadata={"source": f"s{i}"}) for i in range(count)]
+
+
+def test_build_and_mmap_load_round_trip(tmp_path):
+    cfg = {"index_type": "ivf_flat", "nlist": 4, "nprobe": 4}
+    embeddings = DeterministicFakeEmbedding(size=8)
+    built = build_vectorstore(chunks(200), embeddings, cfg, ids=[f"id{i}" for i in range(200)])
+    assert type(built.index).__name__ == "IndexIVFFlat"
+    built.save_local(str(tmp_path))
+
+    loaded = load_vectorstore(tmp_path, embeddings, cfg)
+    assert loaded.index.ntotal == 200 and loaded.index.nprobe == 4
+    for query in ("chunk 3 about topic 3", "chunk 150 about topic 3"):
+        assert [d.page_content for d in loaded.similarity_search(query, k=3)] == \
+               [d.page_content for d in built.similarity_search(query, k=3)]
+    assert loaded.index_to_docstore_id[0] == "id0"
+
+
+def test_collections_use_configured_index_and_rebuild_hnsw_on_removal(tmp_path):
+    collection = make_collection(tmp_path, PAGES)
+    collection.model_loader.config["faiss_db"] = {"index_type": "hnsw", "hnsw_m": 8}
+
+    collection.add_sources(list(PAGES))
+    assert type(collection._load_vectorstore().index).__name__ == "IndexHNSWFlat"
+
+    removed = list(PAGES)[:2]
+    assert collection.remove_sources(removed) == removed
+    vectorstore = collection.build_retriever().vectorstore
+    assert type(vectorstore.index).__name__ == "IndexHNSWFlat"
+    assert vectorstore.index.ntotal == len(PAGES) - 2
+    assert {d.metadata["source"] for d in vectorstore.docstore._dict.values()} == set(list(PAGES)[2:])
@@ -0,0 +1,83 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+import src.data_ingestion.data_ingestion as data_ingestion
+from src.data_ingestion.data_ingestion import SourcesDataIngestion
+from src.data_ingestion.source_cache import content_hash
+from utils.config_loader import load_config
+
+PAGES = {f"https://example.com/{n}": f"Page {n} says the answer is {n}." for n in range(3)}
+
+
+def web_docs(pages=PAGES):
+    return [Document(page_content=text, metadata={"source": url, "content_hash": content_hash(text)})
+            for url, text in pages.items()]
+
+
+def make_ingestion(tmp_path, chunk_size=200):
+    config = load_config()
+    config["embedding_cache"] = {"dir": str(tmp_path / "embedding_cache")}
+    config["retriever"] = {"mode": "vector", "top_k": 2}
+    ingestion = SourcesDataIngestion.__new__(SourcesDataIngestion)
+    ingestion.faiss_base = tmp_path / "faiss"
+    ingestion.chunk_size, ingestion.chunk_overlap = chunk_size, 0
+    ingestion.model_loader = SimpleNamespace(config=config, load_embeddings=lambda: DeterministicFakeEmbedding(size=8))
+    return ingestion
+
+
+def test_fingerprint_ignores_url_spelling_and_order(tmp_path):
+    ingestion = make_ingestion(tmp_path)
+    fingerprint = ingestion._fingerprint(web_docs())
+
+    respelled = {url.replace("https://example.com", "HTTPS://Example.COM") + "/": text for url, text in PAGES.items()}
+    assert ingestion._fingerprint(web_docs(dict(reversed(list(respelled.items()))))) == fingerprint
+
+    changed = dict(PAGES, **{"https://example.com/0": "Page 0 changed its answer."})
+    assert ingestion._fingerprint(web_docs(changed)) != fingerprint
+    assert make_ingestion(tmp_path, chunk_size=500)._fingerprint(web_docs()) != fingerprint
+
+    ingestion.model_loader.config["embedding_model"] = dict(ingestion.model_loader.config["embedding_model"],
+                                                            model_name="another-model")
+    assert ingestion._fingerprint(web_docs()) != fingerprint
+
+
+def test_saved_index_is_reused_for_the_same_sources(tmp_path, monkeypatch):
+    builds = []
+    build = data_ingestion.build_vectorstore
+
+    def counting_build(*args, **kwargs):
+        builds.append(args[0])
+        return build(*args, **kwargs)
+
+    monkeypatch.setattr(data_ingestion, "build_vectorstore", counting_build)
+
+    first = make_ingestion(tmp_path)._index(web_docs())
+    second = make_ingestion(tmp_path)._index(web_docs())
+
+    assert len(builds) == 1
+    assert len(list((tmp_path / "faiss").iterdir())) == 1
+    query = "Page 1 says the answer is 1."
+    assert [d.page_content for d in second.invoke(query)] == [d.page_content for d in first.invoke(query)]
+
+    changed = dict(PAGES, **{"https://example.com/2": "Page 2 now says something else."})
+    make_ingestion(tmp_path)._index(web_docs(changed))
+    assert len(builds) == 2
+    assert len(list((tmp_path / "faiss").iterdir())) == 2
+
+
+def test_build_locks_are_dropped_after_the_build(tmp_path):
+    ingestion = make_ingestion(tmp_path)
+    held = data_ingestion._build_lock("in-use")
+    for n in range(3):
+        ingestion._index(web_docs({f"https://example.com/{n}": f"Only page {n}."}))
+
+    # A lock stays shared while someone holds a reference to it
+    assert data_ingestion._build_lock("in-use") is held
+    assert list(data_ingestion._build_locks) == ["in-use"]
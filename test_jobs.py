@@ -0,0 +1,127 @@
+import asyncio
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+import api.jobs as jobs
+from api.database import Base, _add_missing_columns
+from api.jobs import JobQueue, QUEUED, RUNNING, FAILED, _now
+from api.models import CheckJob
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create())
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(jobs, "SessionLocal", factory)
+    yield factory
+    asyncio.run(engine.dispose())
+
+
+async def add_job(factory, job_id, **fields):
+    async with factory() as db:
+        db.add(CheckJob(id=job_id, owner_id=1, file_path=f"/nonexistent/{job_id}/doc.pdf", **fields))
+        await db.commit()
+
+
+async def get_job(factory, job_id):
+    async with factory() as db:
+        return await db.get(CheckJob, job_id)
+
+
+def test_only_one_worker_claims_a_job(session_factory):
+    # Two queues stand in for two API processes sharing the table
+    first, second = JobQueue(), JobQueue()
+
+    async def run():
+        await add_job(session_factory, "job-1", status=QUEUED)
+        claims = await asyncio.gather(*(q._claim_next(f"{q.instance_id}/{i}")
+                                        for q in (first, second) for i in range(3)))
+        return [c for c in claims if c], await get_job(session_factory, "job-1")
+
+    claimed, job = asyncio.run(run())
+    assert len(claimed) == 1
+    assert job.status == RUNNING and job.attempts == 1
+    assert job.worker_id == claimed[0]["worker_id"]
+    assert job.heartbeat_at is not None
+
+
+def test_recover_requeues_only_stale_jobs(session_factory):
+    queue = JobQueue(max_attempts=3, stale_after_seconds=60)
+    old = _now() - timedelta(seconds=120)
+
+    async def run():
+        await add_job(session_factory, "live", status=RUNNING, worker_id="other/0", heartbeat_at=_now(), attempts=1)
+        await add_job(session_factory, "stale", status=RUNNING, worker_id="dead/0", heartbeat_at=old, attempts=1)
+        await add_job(session_factory, "exhausted", status=RUNNING, worker_id="dead/1", heartbeat_at=old, attempts=3)
+        await queue._recover()
+        return {job_id: await get_job(session_factory, job_id) for job_id in ("live", "stale", "exhausted")}
+
+    found = asyncio.run(run())
+    assert found["live"].status == RUNNING and found["live"].worker_id == "other/0"
+    assert found["stale"].status == QUEUED and found["stale"].worker_id is None
+    assert found["exhausted"].status == FAILED
+
+
+def test_heartbeat_reports_lost_claim(session_factory):
+    queue = JobQueue(stale_after_seconds=60)
+
+    async def run():
+        await add_job(session_factory, "job-1", status=QUEUED)
+        job = await queue._claim_next("me/0")
+        assert await queue._heartbeat(job)
+        # Claim goes stale, is recovered and picked up by another worker
+        async with session_factory() as db:
+            row = await db.get(CheckJob, "job-1")
+            row.heartbeat_at = _now() - timedelta(seconds=120)
+            await db.commit()
+        await queue._recover()
+        taken = await JobQueue()._claim_next("other/0")
+        return job, taken, await queue._heartbeat(job)
+
+    job, taken, still_owned = asyncio.run(run())
+    assert taken["id"] == job["id"]
+    assert still_owned is False
+
+
+def test_stop_hands_back_running_jobs(session_factory):
+    queue = JobQueue()
+
+    async def run():
+        await add_job(session_factory, "mine", status=QUEUED)
+        await add_job(session_factory, "theirs", status=RUNNING, worker_id="other/0", heartbeat_at=_now())
+        await queue._claim_next(f"{queue.instance_id}/0")
+        await queue.stop()
+        return await get_job(session_factory, "mine"), await get_job(session_factory, "theirs")
+
+    mine, theirs = asyncio.run(run())
+    assert mine.status == QUEUED and mine.worker_id is None
+    assert theirs.status == RUNNING
+
+
+def test_missing_columns_are_added(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'old.db'}")
+
+    async def run():
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE check_jobs (id VARCHAR PRIMARY KEY, status VARCHAR)"))
+            await conn.run_sync(_add_missing_columns)
+            columns = (await conn.execute(text("PRAGMA table_info(check_jobs)"))).all()
+        await engine.dispose()
+        return {c[1] for c in columns}
+
+    columns = asyncio.run(run())
+    assert {"worker_id", "heartbeat_at", "attempts"} <= columns
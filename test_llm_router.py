@@ -0,0 +1,121 @@
+import asyncio
+import sys
+from pathlib import Path
+
+from langchain_core.runnables import RunnableLambda
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from checker_fakes import make_checker
+from utils.llm_router import LLMRouter
+
+
+class FakeProvider:
+    """Local stand-in for an LLM provider with a fixed latency and optional failures."""
+
+    def __init__(self, name, latency, fail=False):
+        self.name = name
+        self.latency = latency
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    async def _call(self, prompt):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError(f"{self.name} is down")
+        return f"{self.name}:{prompt}"
+
+    def runnable(self):
+        return RunnableLambda(lambda prompt: None, afunc=self._call)
+
+
+def make_router(*providers, **kwargs):
+    kwargs.setdefault("hedge_initial_delay", 10.0)
+    return LLMRouter({p.name: p.runnable() for p in providers}, **kwargs)
+
+
+def test_prefers_fastest_provider():
+    # Wide gap so a scheduling hiccup on a loaded machine can't flip the ranking
+    fast, slow = FakeProvider("fast", 0.01), FakeProvider("slow", 0.3)
+    router = make_router(slow, fast, min_samples=1)
+
+    async def run():
+        # First two calls measure both providers, the rest go to the faster one
+        return [await router.ainvoke(i) for i in range(6)]
+
+    results = asyncio.run(run())
+    assert results[-1] == "fast:5"
+    assert slow.calls == 1
+    assert router.ranking()[0] == "fast"
+
+
+def test_hedges_slow_primary_and_cancels_loser():
+    primary, backup = FakeProvider("primary", 1.0), FakeProvider("backup", 0.01)
+    router = make_router(primary, backup, hedge_initial_delay=0.05)
+
+    async def run():
+        result = await router.ainvoke("q")
+        # The cancelled loser has finished by the time ainvoke returns
+        return result, asyncio.all_tasks() - {asyncio.current_task()}
+
+    result, leftover = asyncio.run(run())
+
+    assert result == "backup:q"
+    assert not leftover
+    assert router.hedges == 1
+    assert primary.cancelled == 1
+    assert router.stats["primary"].errors == 0
+
+
+def test_windowed_claim_extraction_is_hedged():
+    primary, backup = FakeProvider("primary", 1.0), FakeProvider("backup", 0.01)
+    router = make_router(primary, backup, hedge_initial_delay=0.05)
+    checker = make_checker()
+    chain = RunnableLambda(lambda inputs: inputs["text"]) | router | RunnableLambda(lambda out: f"1. {out}")
+    pages = iter(["first page", "second page"])
+
+    claims, failed = asyncio.run(checker._extract_windowed(chain, pages, {"window_chars": 12, "max_concurrency": 2}))
+
+    assert claims == ["backup:first page", "backup:second page"]
+    assert failed == 0
+    assert router.hedges == 2
+
+
+def test_fails_over_and_ejects_degraded_provider():
+    broken, healthy = FakeProvider("broken", 0.0, fail=True), FakeProvider("healthy", 0.02)
+    router = make_router(broken, healthy, failure_threshold=2, cooldown_seconds=60)
+
+    async def run():
+        return [await router.ainvoke(i) for i in range(4)]
+
+    assert asyncio.run(run()) == [f"healthy:{i}" for i in range(4)]
+    # Ejected after two consecutive errors, so later calls skip it entirely
+    assert broken.calls == 2
+    assert router.failovers == 2
+    assert router.routing_stats()["providers"]["broken"]["healthy"] is False
+
+
+def test_raises_when_every_provider_fails():
+    router = make_router(FakeProvider("a", 0.0, fail=True), FakeProvider("b", 0.0, fail=True))
+    try:
+        asyncio.run(router.ainvoke("q"))
+    except RuntimeError as e:
+        assert "is down" in str(e)
+    else:
+        raise AssertionError("expected the last provider error")
+
+
+def test_sync_invoke_fails_over():
+    def down(prompt):
+        raise RuntimeError("down")
+
+    router = LLMRouter({"broken": RunnableLambda(down), "ok": RunnableLambda(lambda p: f"ok:{p}")})
+    assert router.invoke("q") == "ok:q"
+    assert router.stats["broken"].errors == 1
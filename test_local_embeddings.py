@@ -0,0 +1,84 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from checker_fakes import FakeLLM, make_checker, make_retriever
+from utils import model_loader
+from utils.local_embeddings import HashingEmbeddings
+
+TEXTS = ["Tariffs on steel rose in 2024.", "Exports of grain fell sharply.", "tariffs ON STEEL rose in 2024!"]
+
+
+def test_embeddings_are_deterministic_and_normalized():
+    embeddings = HashingEmbeddings(dimensions=64)
+    vectors = np.asarray(embeddings.embed_documents(TEXTS))
+
+    assert vectors.shape == (3, 64)
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+    # Same features in a fresh instance (hashing is stable, not per-process)
+    assert np.array_equal(vectors, np.asarray(HashingEmbeddings(dimensions=64).embed_documents(TEXTS)))
+    assert np.allclose(embeddings.embed_query(TEXTS[0]), vectors[0])
+    # Tokenization ignores case and punctuation; different text lands elsewhere
+    assert np.allclose(vectors[0], vectors[2])
+    assert vectors[0] @ vectors[1] < 0.5
+
+
+def test_bigrams_distinguish_word_order():
+    with_bigrams = HashingEmbeddings(dimensions=256)
+    unigrams = HashingEmbeddings(dimensions=256, bigrams=False)
+    texts = ["exports rose imports fell", "imports rose exports fell"]
+
+    assert np.allclose(*unigrams.embed_documents(texts))
+    assert not np.allclose(*with_bigrams.embed_documents(texts))
+
+
+def test_text_without_tokens_is_the_zero_vector():
+    vectors = HashingEmbeddings(dimensions=16).embed_documents(["", "  ...  ", "word"])
+
+    assert vectors[0] == [0.0] * 16 and vectors[1] == [0.0] * 16
+    assert np.isclose(np.linalg.norm(vectors[2]), 1.0)
+    assert HashingEmbeddings(dimensions=16).embed_documents([]) == []
+
+
+@pytest.fixture
+def local_loader(monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-google-key")
+    monkeypatch.setenv("GROQ_API_KEY", "test-groq-key")
+    monkeypatch.setattr(model_loader, "load_dotenv", lambda **kwargs: None)
+    loader = model_loader.ModelLoader()
+    loader.config["embedding_model"] = {"provider": "local", "model_name": "hashing", "dimensions": 32}
+    return loader
+
+
+def test_local_provider_loads_hashing_embeddings(local_loader):
+    embeddings = local_loader.load_embeddings()
+
+    assert isinstance(embeddings, HashingEmbeddings)
+    assert embeddings.dimensions == 32
+    # Built once and reused
+    assert local_loader.load_embeddings() is embeddings
+
+
+def test_unknown_provider_is_rejected(local_loader):
+    local_loader.config["embedding_model"] = {"provider": "openai", "model_name": "text-embedding-3-small"}
+    with pytest.raises(Exception, match="Failed to load embedding model"):
+        local_loader.load_embeddings()
+
+
+def test_checker_verifies_against_local_embeddings():
+    llm = FakeLLM()
+    checker = make_checker(llm, claim_dedup={"enabled": True, "similarity_threshold": 0.99})
+    retriever = make_retriever([f"page {i} on trade policy" for i in range(6)], HashingEmbeddings(dimensions=64))
+
+    results = asyncio.run(checker._verify_claims(TEXTS, retriever))
+
+    assert [r["claim"] for r in results] == TEXTS
+    # The two spellings of the first claim hash to the same vector and are verified once
+    assert llm.single_calls == 2
+    assert results[2]["duplicate_of"] == TEXTS[0]
@@ -0,0 +1,48 @@
+import asyncio
+import os
+import signal
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from api import main
+from utils import model_loader
+
+
+@pytest.fixture
+def api_keys(monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-google-key")
+    monkeypatch.setenv("GROQ_API_KEY", "test-groq-key")
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="SIGHUP is POSIX only")
+def test_sighup_swaps_the_shared_model_loader(api_keys, monkeypatch):
+    # Keep the test's dummy keys even if a local .env defines real ones
+    monkeypatch.setattr(model_loader, "load_dotenv", lambda **kwargs: None)
+
+    async def run():
+        before = model_loader.get_model_loader()
+        async with main.lifespan(main.app):
+            os.kill(os.getpid(), signal.SIGHUP)
+            for _ in range(50):
+                if model_loader.get_model_loader() is not before:
+                    break
+                await asyncio.sleep(0.01)
+            during = model_loader.get_model_loader()
+        return before, during
+
+    before, during = asyncio.run(run())
+    assert during is not before
+    assert model_loader.get_model_loader() is during
+
+
+def test_failed_reload_keeps_current_loader(api_keys, monkeypatch):
+    current = model_loader.get_model_loader()
+    monkeypatch.delenv("GOOGLE_API_KEY")
+    monkeypatch.setattr(model_loader, "load_dotenv", lambda **kwargs: None)
+    main._reload_models()
+    assert model_loader.get_model_loader() is current
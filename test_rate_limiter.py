@@ -0,0 +1,200 @@
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from utils.rate_limiter import AIMDConcurrency, ProviderLimiter, TokenBucket, is_rate_limited, retry_after
+
+
+class FakeClock:
+    """Monotonic clock that only moves when something sleeps on it."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    async def asleep(self, seconds):
+        self.sleep(seconds)
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, message="too many requests", retry_after=None):
+        super().__init__(message)
+        self.response = type("Response", (), {"headers": {"retry-after": retry_after} if retry_after else {}})()
+
+
+def make_limiter(clock, **kwargs):
+    return ProviderLimiter("fake", clock=clock, sleep=clock.sleep, asleep=clock.asleep, **kwargs)
+
+
+def test_token_bucket_bursts_then_paces():
+    clock = FakeClock()
+    bucket = TokenBucket(60, clock)  # one per second, burst of 60
+    assert [bucket.reserve(1) for _ in range(60)] == [0.0] * 60
+    assert bucket.reserve(1) == 1.0
+    assert bucket.reserve(1) == 2.0
+    clock.now += 2.0
+    assert bucket.reserve(1) == 1.0
+
+
+def test_token_bucket_caps_oversize_requests_and_refunds():
+    bucket = TokenBucket(100, FakeClock())
+    assert bucket.reserve(500) == 0.0  # larger than the bucket: takes it all instead of waiting forever
+    assert bucket.reserve(30) == 18.0
+    bucket.adjust(30)
+    assert bucket.tokens == 0.0
+
+
+def test_aimd_halves_once_per_cooldown_and_recovers():
+    clock = FakeClock()
+    aimd = AIMDConcurrency(8, minimum=1, maximum=8, cooldown=5.0, clock=clock)
+    aimd.on_overload()
+    aimd.on_overload()
+    assert aimd.limit == 4.0
+    clock.now += 5.0
+    aimd.on_overload()
+    assert aimd.limit == 2.0
+    for _ in range(10):
+        aimd.on_success()
+    assert 4.0 < aimd.limit <= 8.0
+
+
+def test_aimd_blocks_sync_waiters_until_release():
+    aimd = AIMDConcurrency(1)
+    aimd.acquire()
+    acquired = threading.Event()
+    waiter = threading.Thread(target=lambda: (aimd.acquire(), acquired.set()))
+    waiter.start()
+    assert not acquired.wait(0.05)
+    aimd.release()
+    assert acquired.wait(1.0)
+    waiter.join()
+    assert aimd.in_flight == 1
+
+
+def test_aimd_wakes_async_waiters_in_order_and_skips_cancelled():
+    aimd = AIMDConcurrency(1)
+
+    async def run():
+        order = []
+
+        async def worker(name):
+            await aimd.aacquire()
+            order.append(name)
+
+        aimd.acquire()
+        first = asyncio.create_task(worker("first"))
+        cancelled = asyncio.create_task(worker("cancelled"))
+        last = asyncio.create_task(worker("last"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        aimd.release()
+        await first
+        aimd.release()
+        await last
+        return order
+
+    assert asyncio.run(asyncio.wait_for(run(), 1.0)) == ["first", "last"]
+
+
+def test_aimd_passes_on_wakeup_of_waiter_cancelled_after_wake():
+    aimd = AIMDConcurrency(1)
+
+    async def run():
+        aimd.acquire()
+        woken = asyncio.create_task(aimd.aacquire())
+        other = asyncio.create_task(aimd.aacquire())
+        await asyncio.sleep(0)
+        aimd.release()
+        # Let _wake resolve the first waiter's future, then cancel it before it resumes
+        await asyncio.sleep(0)
+        woken.cancel()
+        await asyncio.gather(woken, return_exceptions=True)
+        await other
+        return aimd.in_flight
+
+    assert asyncio.run(asyncio.wait_for(run(), 1.0)) == 1
+
+
+def test_retry_after_sources():
+    assert retry_after(RateLimitError(retry_after="3")) == 3.0
+    assert retry_after(Exception('429 RESOURCE_EXHAUSTED {"retryDelay": "7s"}')) == 7.0
+    assert retry_after(Exception("boom")) is None
+    assert is_rate_limited(RateLimitError())
+    assert not is_rate_limited(ValueError("bad request"))
+
+
+def test_backoff_is_jittered_capped_and_honours_retry_after():
+    limiter = make_limiter(FakeClock(), base_delay=1.0, max_delay=4.0)
+    for attempt in range(6):
+        assert 0.0 <= limiter._backoff(RateLimitError(), attempt) <= min(4.0, 2 ** attempt)
+    assert limiter._backoff(RateLimitError(retry_after="30"), 0) >= 30.0
+
+
+def test_retries_reserve_budget_once():
+    clock = FakeClock()
+    limiter = make_limiter(clock, requests_per_minute=60, tokens_per_minute=600, base_delay=0.5)
+    attempts = []
+
+    def call():
+        attempts.append(clock.now)
+        if len(attempts) < 3:
+            raise RateLimitError(retry_after="2")
+        return "ok"
+
+    assert limiter.run(call, est_tokens=100) == "ok"
+    assert len(attempts) == 3
+    # One reservation for the logical call, not one per attempt (buckets refill lazily on reserve)
+    assert limiter.requests.tokens == 59.0
+    assert limiter.tokens.tokens == 500.0
+    assert all(wait >= 2.0 for wait in clock.sleeps[1:])
+
+
+def test_failed_call_refunds_tokens():
+    clock = FakeClock()
+    limiter = make_limiter(clock, tokens_per_minute=600, max_retries=1, base_delay=0.0)
+
+    async def call():
+        raise RateLimitError()
+
+    try:
+        asyncio.run(limiter.arun(call, est_tokens=200))
+    except RateLimitError:
+        pass
+    else:
+        raise AssertionError("expected the rate limit error")
+    assert limiter.tokens.tokens == 600.0
+    assert limiter.concurrency.in_flight == 0
+
+
+def test_async_calls_respect_concurrency_limit():
+    limiter = ProviderLimiter("fake", max_concurrency=2)
+    active, peak = [0], [0]
+
+    async def call():
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        await asyncio.sleep(0.01)
+        active[0] -= 1
+        return "ok"
+
+    async def run():
+        return await asyncio.gather(*(limiter.arun(call) for _ in range(8)))
+
+    start = time.monotonic()
+    assert asyncio.run(run()) == ["ok"] * 8
+    assert peak[0] == 2
+    assert time.monotonic() - start < 1.0
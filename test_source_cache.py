@@ -0,0 +1,121 @@
+import asyncio
+import sys
+from pathlib import Path
+
+from aiohttp import web
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from src.data_ingestion import source_cache
+from src.data_ingestion.source_cache import SourceCache, close_sessions
+
+
+class SourceServer:
+    """Local HTTP server that tracks concurrency and honours If-None-Match."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.requests = 0
+        self.not_modified = 0
+
+    async def handle(self, request):
+        self.requests += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            etag = f'"{request.match_info["name"]}-v1"'
+            if request.headers.get("If-None-Match") == etag:
+                self.not_modified += 1
+                return web.Response(status=304)
+            body = f"<html><title>{request.match_info['name']}</title><body>text</body></html>"
+            return web.Response(text=body, content_type="text/html", headers={"ETag": etag})
+        finally:
+            self.active -= 1
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/{name}", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+
+def test_per_host_limit_spans_requests_and_session_is_pooled(tmp_path):
+    server = SourceServer(delay=0.05)
+
+    async def run():
+        base = await server.start()
+        caches = [SourceCache(str(tmp_path / f"c{n}"), per_host_limit=2) for n in range(3)]
+        try:
+            # Three concurrent "requests", each fetching four pages from the same host
+            results = await asyncio.gather(*(c.aload([f"{base}/p{n}-{i}" for i in range(4)])
+                                             for n, c in enumerate(caches)))
+            sessions = {id(c._session()) for c in caches}
+        finally:
+            await close_sessions()
+            await server.runner.cleanup()
+        return results, sessions
+
+    results, sessions = asyncio.run(run())
+    assert [len(docs) for docs in results] == [4, 4, 4]
+    assert len(sessions) == 1
+    assert server.peak <= 2
+    assert not source_cache._sessions
+
+
+def test_fresh_entries_skip_network_and_stale_ones_revalidate(tmp_path):
+    server = SourceServer()
+
+    async def run():
+        base = await server.start()
+        cache = SourceCache(str(tmp_path), ttl_seconds=3600)
+        try:
+            first = await cache.aload([f"{base}/page"])
+            await cache.aload([f"{base}/page"])
+            cache.ttl_seconds = 0
+            again = await cache.aload([f"{base}/page"])
+        finally:
+            await close_sessions()
+            await server.runner.cleanup()
+        return first, again
+
+    first, again = asyncio.run(run())
+    assert server.requests == 2 and server.not_modified == 1
+    assert first[0].metadata["title"] == "page"
+    assert again[0].metadata["content_hash"] == first[0].metadata["content_hash"]
+
+
+def test_failed_sources_are_skipped(tmp_path):
+    async def run():
+        cache = SourceCache(str(tmp_path), connect_timeout=1, timeout=2)
+        server = SourceServer()
+        base = await server.start()
+        try:
+            docs = await cache.aload([f"{base}/ok", "http://127.0.0.1:9/unreachable"])
+        finally:
+            await close_sessions()
+            await server.runner.cleanup()
+        return cache, docs
+
+    cache, docs = asyncio.run(run())
+    assert len(docs) == 1
+    assert [s["url"] for s in cache.skipped()] == ["http://127.0.0.1:9/unreachable"]
+
+
+def test_session_is_recreated_for_a_new_event_loop(tmp_path):
+    cache = SourceCache(str(tmp_path))
+
+    async def session():
+        return cache._session()
+
+    first = asyncio.run(session())
+    second = asyncio.run(session())
+    assert first is not second
+    source_cache._sessions.clear()
@@ -0,0 +1,148 @@
+import json
+import multiprocessing
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from src.data_ingestion.source_cache import content_hash
+from src.data_ingestion.source_collections import (
+    CURRENT, SourceCollectionIngestion, _open_current, collection_dir, current_dir, delete_collection_index,
+    load_manifest,
+)
+from utils.config_loader import load_config
+
+
+class FakeSources:
+    """Stands in for SourceCache: serves page text from a dict instead of the network; async only."""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    async def aload(self, urls):
+        return [Document(page_content=self.pages[u], metadata={"source": u, "content_hash": content_hash(self.pages[u])})
+                for u in urls]
+
+
+def make_collection(tmp_path, pages, collection_id=1):
+    config = load_config()
+    config["embedding_cache"] = {"dir": str(tmp_path / "embedding_cache")}
+    config["retriever"] = {"mode": "vector", "top_k": 2}
+    ingestion = SourceCollectionIngestion.__new__(SourceCollectionIngestion)
+    ingestion.collection_id = collection_id
+    ingestion.faiss_base = tmp_path / "faiss"
+    ingestion.faiss_dir = collection_dir(collection_id, str(ingestion.faiss_base))
+    ingestion.chunk_size, ingestion.chunk_overlap = 200, 0
+    ingestion.source_cache = FakeSources(pages)
+    ingestion.model_loader = SimpleNamespace(config=config, load_embeddings=lambda: DeterministicFakeEmbedding(size=8))
+    return ingestion
+
+
+PAGES = {f"https://example.com/{n}": f"Page {n} says the answer is {n}." for n in range(6)}
+
+
+def test_add_and_remove_switch_versions(tmp_path):
+    collection = make_collection(tmp_path, PAGES)
+    base = str(collection.faiss_base)
+
+    assert collection.add_sources(list(PAGES)[:2]) == list(PAGES)[:2]
+    first = current_dir(1, base)
+    assert collection.add_sources(list(PAGES)[:3]) == [list(PAGES)[2]]
+    second = current_dir(1, base)
+    assert first != second and not first.exists()  # no reader had it pinned
+
+    assert collection.remove_sources([list(PAGES)[0]]) == [list(PAGES)[0]]
+    assert not second.exists()
+    assert sorted(load_manifest(1, base)) == list(PAGES)[1:3]
+    assert [p.name for p in (collection.faiss_dir / "versions").iterdir() if p.is_dir()] == [current_dir(1, base).name]
+    assert collection.build_retriever().invoke("answer")
+
+    delete_collection_index(1, base)
+    assert current_dir(1, base) is None and load_manifest(1, base) == {}
+
+
+def test_legacy_layout_is_read_and_migrated(tmp_path):
+    collection = make_collection(tmp_path, PAGES)
+    collection.add_sources(list(PAGES)[:2])
+    # Flatten the live version into the collection root, as saved before versioning
+    version = current_dir(1, str(collection.faiss_base))
+    for path in version.iterdir():
+        path.rename(collection.faiss_dir / path.name)
+    (collection.faiss_dir / CURRENT).unlink()
+
+    assert current_dir(1, str(collection.faiss_base)) == collection.faiss_dir
+    assert collection.add_sources([list(PAGES)[2]])
+    assert not (collection.faiss_dir / "manifest.json").exists()
+    assert sorted(load_manifest(1, str(collection.faiss_base))) == list(PAGES)[:3]
+
+
+def test_readers_never_see_a_missing_or_partial_index(tmp_path):
+    collection = make_collection(tmp_path, PAGES)
+    collection.add_sources(list(PAGES)[:1])
+    urls = list(PAGES)
+    errors, stop = [], threading.Event()
+
+    def write():
+        try:
+            for n in range(1, len(urls)):
+                collection.add_sources(urls[:n + 1])
+                collection.remove_sources([urls[n]])
+        finally:
+            stop.set()
+
+    def read():
+        reader = make_collection(tmp_path, PAGES)
+        while not stop.is_set():
+            try:
+                manifest = load_manifest(1, str(reader.faiss_base))
+                assert urls[0] in manifest
+                assert reader.build_retriever().invoke("answer")
+            except Exception as e:
+                errors.append(e)
+                return
+
+    threads = [threading.Thread(target=write)] + [threading.Thread(target=read) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors, errors
+
+
+def test_pruning_skips_versions_a_reader_has_pinned(tmp_path):
+    collection = make_collection(tmp_path, PAGES)
+    base = str(collection.faiss_base)
+    collection.add_sources(list(PAGES)[:1])
+
+    with _open_current(1, base) as pinned:
+        collection.add_sources(list(PAGES)[:2])
+        assert current_dir(1, base) != pinned
+        assert (pinned / "manifest.json").exists()
+
+    collection.add_sources(list(PAGES)[:3])
+    assert not pinned.exists()
+
+
+def add_in_process(tmp_path, urls):
+    make_collection(tmp_path, PAGES).add_sources(urls)
+
+
+def test_writers_in_different_processes_do_not_lose_updates(tmp_path):
+    collection = make_collection(tmp_path, PAGES)
+    collection.add_sources(list(PAGES)[:1])
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=add_in_process, args=(tmp_path, [url])) for url in list(PAGES)[1:]]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert all(worker.exitcode == 0 for worker in workers)
+    assert sorted(load_manifest(1, str(collection.faiss_base))) == sorted(PAGES)
+    assert collection.build_retriever().vectorstore.index.ntotal == len(PAGES)
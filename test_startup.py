@@ -0,0 +1,51 @@
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent
+
+# Cumulative import time budgets in seconds, measured with `python -X importtime`.
+# Set just above current times (about 1.5s and 0.9s) and below the eager-import
+# baseline (about 2.0s and 1.4s), so re-adding an eager heavy import fails.
+# Override with STARTUP_BUDGET_<MODULE> (dots replaced by underscores) on slow CI hosts.
+BUDGETS = {
+    "api.main": 1.9,
+    "src.checker.claims_checker": 1.15,
+}
+
+# Provider SDKs, vector stores, HTTP clients and parsers must only load on first use
+# (requests is left out: langchain_core imports it through langsmith)
+HEAVY_MODULES = ["langchain_community", "langchain_google_genai", "langchain_groq", "faiss", "pypdf",
+                 "aiohttp", "bs4"]
+
+
+def _import_seconds(module: str) -> float:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    pattern = re.compile(rf"^import time:\s+\d+ \|\s+(\d+) \| {re.escape(module)}$", re.M)
+    match = pattern.search(result.stderr)
+    assert match, f"No importtime entry for {module}"
+    return int(match.group(1)) / 1_000_000
+
+
+@pytest.mark.parametrize("module", list(BUDGETS))
+def test_import_time_budget(module):
+    budget = float(os.getenv(f"STARTUP_BUDGET_{module.replace('.', '_').upper()}", BUDGETS[module]))
+    # Best of three smooths out disk-cache and scheduler noise
+    elapsed = min(_import_seconds(module) for _ in range(3))
+    print(f"\n[STARTUP] import {module}: {elapsed:.3f}s (budget {budget}s)")
+    assert elapsed <= budget, f"import {module} took {elapsed:.3f}s, budget is {budget}s"
+
+
+@pytest.mark.parametrize("module", list(BUDGETS))
+def test_heavy_modules_not_imported(module):
+    code = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    loaded = result.stdout.strip().splitlines()[-1] if result.stdout.strip() else ""
+    assert not loaded, f"import {module} eagerly loaded: {loaded}"
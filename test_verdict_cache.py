@@ -0,0 +1,97 @@
+import asyncio
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from checker_fakes import CLAIMS, FakeLLM, make_checker, make_retriever
+from utils.verdict_cache import VerdictCache
+
+VERDICT = "**Verdict**: SUPPORTED\n**Explanation**: cached"
+
+
+def age(path, key, seconds):
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE verdicts SET created_at = ? WHERE key = ?", (time.time() - seconds, key))
+
+
+def test_verdicts_persist_across_instances(tmp_path):
+    path = str(tmp_path / "verdicts.db")
+    VerdictCache(path).put("k", VERDICT)
+
+    cache = VerdictCache(path)
+    assert cache.get("k") == VERDICT
+    assert cache.get("other") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "memory_entries": 1}
+
+
+def test_expired_verdicts_are_missed_and_purged(tmp_path):
+    path = str(tmp_path / "verdicts.db")
+    writer = VerdictCache(path, ttl_seconds=60)
+    writer.put("old", VERDICT)
+    writer.put("also-old", VERDICT)
+    writer.put("new", VERDICT)
+    age(path, "old", 120)
+    age(path, "also-old", 120)
+
+    cache = VerdictCache(path, ttl_seconds=60)
+    assert cache.get("old") is None
+    assert cache.get("new") == VERDICT
+    assert cache.purge_expired() == 1
+    assert VerdictCache(path, ttl_seconds=3600).get("also-old") is None
+
+
+def test_key_ignores_formatting_but_not_prompt_or_model():
+    key = VerdictCache.make_key("The sky is blue.", "ctx", "v1", "model-a")
+    assert VerdictCache.make_key("  the SKY is blue!", "ctx", "v1", "model-a") == key
+    assert VerdictCache.make_key("The sky is blue.", "other-ctx", "v1", "model-a") != key
+    assert VerdictCache.make_key("The sky is blue.", "ctx", "v2", "model-a") != key
+    assert VerdictCache.make_key("The sky is blue.", "ctx", "v1", "model-b") != key
+
+
+def test_memory_tier_is_bounded_and_shared_per_path(tmp_path):
+    cache = VerdictCache(str(tmp_path / "verdicts.db"), memory_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, VERDICT)
+    assert list(cache._memory) == ["b", "c"]
+    # Evicted from memory but still on disk
+    assert cache.get("a") == VERDICT
+
+    path = str(tmp_path / "shared.db")
+    assert VerdictCache.shared(path) is VerdictCache.shared(path)
+
+
+def test_second_verification_is_served_from_cache(tmp_path):
+    llm = FakeLLM()
+    checker = make_checker(llm)
+    checker.verdict_cache = VerdictCache(str(tmp_path / "verdicts.db"))
+    retriever = make_retriever()
+
+    first = asyncio.run(checker._verify_claims(CLAIMS, retriever))
+    second = asyncio.run(checker._verify_claims(CLAIMS, retriever))
+
+    assert llm.single_calls == len(CLAIMS)
+    assert [r["verification"] for r in second] == [r["verification"] for r in first]
+    assert all(r.get("cached") for r in second)
+    assert not any(r.get("cached") for r in first)
+
+
+def test_fallback_verdicts_are_cached_under_the_single_claim_prompt(tmp_path):
+    llm = FakeLLM(batch_answer=lambda numbers: "not json")
+    checker = make_checker(llm, verification={"mode": "batched", "batch_size": 5, "max_concurrency": 2})
+    checker.verdict_cache = VerdictCache(str(tmp_path / "verdicts.db"))
+    retriever = make_retriever()
+
+    asyncio.run(checker._verify_claims(CLAIMS, retriever))
+    assert (llm.batch_calls, llm.single_calls) == (1, len(CLAIMS))
+
+    # Served to single-claim runs, which use the same prompt, and to later batched runs
+    again = asyncio.run(checker._verify_claims(CLAIMS, retriever))
+    checker.model_loader.config["verification"] = {"mode": "single", "max_concurrency": 2}
+    single = asyncio.run(checker._verify_claims(CLAIMS, retriever))
+
+    assert (llm.batch_calls, llm.single_calls) == (1, len(CLAIMS))
+    assert all(r.get("cached") for r in again + single)
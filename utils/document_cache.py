@@ -0,0 +1,123 @@
+import os
+import json
+import time
+import hashlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+from logger import GLOBAL_LOGGER as log
+
+
+class DocumentCache:
+    """
+    On-disk cache of work derived from an uploaded document, keyed by its SHA-256.
+
+    ``pages/<doc_hash>.jsonl`` holds the parsed page text, one JSON string per
+    line, so it can be written and replayed without holding the whole document.
+    ``claims/<key>.json`` holds the extracted claims; its key also covers the
+    extraction prompt version, the model and the extraction settings.
+
+    Entries older than ``ttl_seconds`` are ignored and removed. Each write
+    prunes the least recently used entries (by mtime, refreshed on hits)
+    until the directory fits in ``max_bytes``.
+    """
+
+    def __init__(self, cache_dir: str = "document_cache", ttl_seconds: int = 7 * 86400,
+                 max_bytes: int = 1024 * 1024 * 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.cache_dir = Path(cache_dir)
+        self.pages_dir = self.cache_dir / "pages"; self.pages_dir.mkdir(parents=True, exist_ok=True)
+        self.claims_dir = self.cache_dir / "claims"; self.claims_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def claims_key(doc_hash: str, prompt_version: str, model: str, settings: str = "") -> str:
+        raw = "\0".join([doc_hash, prompt_version, model, settings])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _pages_path(self, doc_hash: str) -> Path:
+        return self.pages_dir / f"{doc_hash}.jsonl"
+
+    def _fresh(self, path: Path) -> bool:
+        """True for a live entry (its mtime is bumped so pruning sees it as recently used)."""
+        try:
+            if time.time() - path.stat().st_mtime >= self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                return False
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def prune(self) -> int:
+        """Drop expired entries, then the least recently used ones until under ``max_bytes``."""
+        now = time.time()
+        entries = []
+        for directory, pattern in ((self.pages_dir, "*.jsonl"), (self.claims_dir, "*.json")):
+            for path in directory.glob(pattern):
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+
+        removed = 0
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in sorted(entries, key=lambda e: e[0]):
+            if now - mtime < self.ttl_seconds and total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        if removed:
+            log.info("Document cache pruned", removed=removed, bytes=total)
+        return removed
+
+    def iter_pages(self, doc_hash: str) -> Optional[Iterator[str]]:
+        """Replay cached page text lazily, or None when the document was never parsed."""
+        path = self._pages_path(doc_hash)
+        if not self._fresh(path):
+            return None
+
+        def pages():
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    yield json.loads(line)
+
+        log.info("Document page cache hit", doc_hash=doc_hash[:12])
+        return pages()
+
+    @contextmanager
+    def page_writer(self, doc_hash: str) -> Iterator[Callable[[str], None]]:
+        """Append pages as they are parsed; the entry only appears if every page was written."""
+        path = self._pages_path(doc_hash)
+        tmp = path.with_suffix(f".{os.getpid()}.{id(self)}.tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                yield lambda text: f.write(json.dumps(text) + "\n")
+            os.replace(tmp, path)
+        except BaseException:
+            # Parsing failed or the consumer stopped early: drop the partial entry
+            tmp.unlink(missing_ok=True)
+            raise
+        self.prune()
+
+    def get_claims(self, key: str) -> Optional[List[str]]:
+        path = self.claims_dir / f"{key}.json"
+        if not self._fresh(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)["claims"]
+        except (OSError, ValueError, KeyError) as e:
+            log.warning("Corrupt claims cache entry ignored", key=key, error=str(e))
+            return None
+
+    def put_claims(self, key: str, doc_hash: str, claims: List[str]) -> None:
+        path = self.claims_dir / f"{key}.json"
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"doc_hash": doc_hash, "claims": claims, "created_at": time.time()}, f)
+        os.replace(tmp, path)
+        self.prune()
@@ -1,28 +1,32 @@
-from typing import Iterable, List
+from typing import Iterable, Iterator, List
 from pathlib import Path
 from logger import GLOBAL_LOGGER as log
 from exception.custom_exception import DocumentPortalException
-from langchain_community.document_loaders import PyPDFLoader
 from langchain_core.documents import Document
 
 
 SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt", ".pptx", ".ppt", ".xlsx", ".xls", ".csv", ".md", ".sql", ".jpg", ".jpeg", ".png"}
 
-def load_documents(path: Path) -> List[Document]:
-    """Load docs using appropriate loader based on extension."""
-    docs: List[Document] = []
+def lazy_load(path: Path) -> Iterator[Document]:
+    """Yield documents one page at a time so callers never hold the whole file."""
     try:
-        
-        ext = path.suffix.lower()
         ext = path.suffix.lower()
         if ext == ".pdf":
+            from langchain_community.document_loaders import PyPDFLoader
             loader = PyPDFLoader(str(path))
         else:
             log.warning("Unsupported extension skipped", path=str(path))
-            return docs
-        docs.extend(loader.load())
-        log.info("Documents loaded", count=len(docs))
-        return docs
+            return
+        count = 0
+        for doc in loader.lazy_load():
+            count += 1
+            yield doc
+        log.info("Documents loaded", count=count)
     except Exception as e:
         log.error("Failed loading documents", error=str(e))
-        raise DocumentPortalException("Error loading documents", e) from e
\ No newline at end of file
+        raise DocumentPortalException("Error loading documents", e) from e
+
+
+def load_documents(path: Path) -> List[Document]:
+    """Load docs using appropriate loader based on extension."""
+    return list(lazy_load(path))
@@ -0,0 +1,211 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock applies
+    fcntl = None
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from logger import GLOBAL_LOGGER as log
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Disk-backed store of float32 embedding vectors keyed by (model, text hash).
+
+    Every model gets its own directory holding one append-only ``vectors.f32``
+    file, read through a numpy memmap, and a SQLite index mapping text hashes
+    to rows. When the vector file grows past ``max_bytes`` the least recently
+    used rows are dropped and the file is compacted.
+
+    Appends, compaction and reads all run under an exclusive ``flock`` on the
+    model directory, so several processes (or instances) sharing one cache
+    never append at the same offset or read a file mid-compaction. Use
+    ``shared()`` to get one instance per directory within a process.
+    """
+
+    _instances: Dict[Path, "EmbeddingCache"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, cache_dir: str = "embedding_cache", model_name: str = "default", max_bytes: int = 512 * 1024 * 1024):
+        self.model_name = model_name
+        self.max_bytes = max_bytes
+        model_key = hashlib.sha256(model_name.encode("utf-8")).hexdigest()[:16]
+        self.dir = Path(cache_dir) / model_key; self.dir.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.dir / "vectors.f32"
+        self._lock = threading.Lock()
+        self._lock_file = open(self.dir / ".lock", "a+b")
+
+        self._conn = sqlite3.connect(self.dir / "index.db", check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries (text_hash TEXT PRIMARY KEY, row INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.execute("INSERT OR IGNORE INTO meta VALUES ('model_name', ?)", (model_name,))
+        self._conn.commit()
+        self.dim = self._read_dim()
+
+    @classmethod
+    def shared(cls, cache_dir: str = "embedding_cache", model_name: str = "default", **kwargs) -> "EmbeddingCache":
+        """One instance per model directory, so concurrent ingestions share its lock and connection."""
+        model_key = hashlib.sha256(model_name.encode("utf-8")).hexdigest()[:16]
+        key = (Path(cache_dir) / model_key).resolve()
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(cache_dir, model_name, **kwargs)
+            return cls._instances[key]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+            self._lock_file.close()
+        with self._instances_lock:
+            for key, instance in list(self._instances.items()):
+                if instance is self:
+                    del self._instances[key]
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._lock:
+            if fcntl:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _read_dim(self) -> int | None:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+        return int(row[0]) if row else None
+
+    def _row_count(self) -> int:
+        if not self.dim or not self.vectors_path.exists():
+            return 0
+        return self.vectors_path.stat().st_size // (self.dim * 4)
+
+    def _memmap(self) -> np.memmap:
+        return np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(self._row_count(), self.dim))
+
+    def get_many(self, hashes: Sequence[str]) -> Dict[str, np.ndarray]:
+        if not hashes:
+            return {}
+        with self._locked():
+            # Another process may have written the first vectors since we opened
+            self.dim = self.dim or self._read_dim()
+            if not self.dim:
+                return {}
+            found: Dict[str, int] = {}
+            unique = list(dict.fromkeys(hashes))
+            for start in range(0, len(unique), 500):
+                batch = unique[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                for h, row in self._conn.execute(
+                    f"SELECT text_hash, row FROM entries WHERE text_hash IN ({placeholders})", batch
+                ):
+                    found[h] = row
+            if not found:
+                return {}
+
+            vectors = self._memmap()
+            out = {h: np.array(vectors[row]) for h, row in found.items()}
+            now = time.time()
+            self._conn.executemany("UPDATE entries SET last_used = ? WHERE text_hash = ?", [(now, h) for h in found])
+            self._conn.commit()
+            return out
+
+    def put_many(self, hashes: Sequence[str], vectors: np.ndarray) -> None:
+        if not len(hashes):
+            return
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self._locked():
+            self.dim = self.dim or self._read_dim()
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('dim', ?)", (str(self.dim),))
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimension changed from {self.dim} to {vectors.shape[1]} for {self.model_name}")
+
+            first_row = self._row_count()
+            with open(self.vectors_path, "ab") as f:
+                # Drop a torn row left by a writer that crashed mid-append
+                f.truncate(first_row * self.dim * 4)
+                f.write(vectors.tobytes())
+            now = time.time()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries (text_hash, row, last_used) VALUES (?, ?, ?)",
+                [(h, first_row + i, now) for i, h in enumerate(hashes)],
+            )
+            self._conn.commit()
+
+            if self.vectors_path.stat().st_size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Keep the most recently used rows up to ~80% of the budget, then compact
+        row_bytes = self.dim * 4
+        keep_rows = max(int(self.max_bytes * 0.8) // row_bytes, 0)
+        kept = self._conn.execute(
+            "SELECT text_hash, row FROM entries ORDER BY last_used DESC LIMIT ?", (keep_rows,)
+        ).fetchall()
+
+        vectors = self._memmap()
+        tmp = self.vectors_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            for _, row in kept:
+                f.write(vectors[row].tobytes())
+        del vectors
+        os.replace(tmp, self.vectors_path)
+
+        self._conn.execute("DELETE FROM entries")
+        self._conn.executemany(
+            "INSERT INTO entries (text_hash, row, last_used) VALUES (?, ?, ?)",
+            [(h, i, time.time()) for i, (h, _) in enumerate(kept)],
+        )
+        self._conn.commit()
+        log.info("Embedding cache compacted", model=self.model_name, rows=len(kept))
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that only sends cache misses to the underlying model.
+    Query embeddings are passed straight through.
+    """
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache):
+        self.embeddings = embeddings
+        self.cache = cache
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes = [text_hash(t) for t in texts]
+        cached = self.cache.get_many(hashes)
+
+        misses: Dict[str, str] = {}
+        for h, t in zip(hashes, texts):
+            if h not in cached and h not in misses:
+                misses[h] = t
+
+        log.info("Embedding cache lookup", hits=sum(h in cached for h in hashes), misses=len(misses))
+
+        if misses:
+            fresh = np.asarray(self.embeddings.embed_documents(list(misses.values())), dtype=np.float32)
+            self.cache.put_many(list(misses.keys()), fresh)
+            cached.update(zip(misses.keys(), fresh))
+
+        return [cached[h].tolist() for h in hashes]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
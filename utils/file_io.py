@@ -1,5 +1,6 @@
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
+import hashlib
 import re
 import uuid
 from datetime import datetime
@@ -20,28 +21,61 @@ def generate_session_id(prefix: str = "session") -> str:
     return f"{prefix}_{datetime.now(ist).strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
 
 
-def save_uploaded_file(uploaded_file, target_dir: Path) -> str:
-    """Save uploaded files and return local paths."""
+class UploadTooLarge(ValueError):
+    pass
+
+
+def _read_chunks(uploaded_file, chunk_size: int):
+    if not hasattr(uploaded_file, "read"):
+        yield bytes(uploaded_file.getbuffer())  # fallback
+        return
+    try:
+        chunk = uploaded_file.read(chunk_size)
+    except TypeError:
+        # File-likes whose read() takes no size: nothing to stream
+        yield uploaded_file.read()
+        return
+    while chunk:
+        yield chunk
+        chunk = uploaded_file.read(chunk_size)
+
+
+def save_uploaded_file(uploaded_file, target_dir: Path, max_bytes: Optional[int] = None,
+                       chunk_size: int = 1024 * 1024) -> str:
+    """Stream an upload to disk in ``chunk_size`` pieces and return the local path.
+    Raises UploadTooLarge (wrapped) once more than ``max_bytes`` have been written."""
+    return save_uploaded_file_hashed(uploaded_file, target_dir, max_bytes, chunk_size)[0]
+
+
+def save_uploaded_file_hashed(uploaded_file, target_dir: Path, max_bytes: Optional[int] = None,
+                              chunk_size: int = 1024 * 1024) -> Tuple[Optional[Path], Optional[str]]:
+    """Like save_uploaded_file, but also returns the SHA-256 of the bytes, computed while writing."""
     try:
         target_dir.mkdir(parents=True, exist_ok=True)
         name = getattr(uploaded_file, "name", None) or getattr(uploaded_file, "filename", "file")
         ext = Path(name).suffix.lower()
         if ext not in SUPPORTED_EXTENSIONS:
             log.warning("Unsupported file skipped", filename=name)
-            return
+            return None, None
         safe_name = re.sub(r'[^a-zA-Z0-9_\-]', '_', Path(name).stem).lower()
         fname = f"{safe_name}_{uuid.uuid4().hex[:6]}{ext}"
         fname = f"{uuid.uuid4().hex[:8]}{ext}"
         out = target_dir / fname
-        with open(out, "wb") as f:
-            if hasattr(uploaded_file, "read"):
-                f.write(uploaded_file.read())
-            else:
-                f.write(uploaded_file.getbuffer())  # fallback
-        log.info("File saved for ingestion", uploaded=name, saved_as=str(out))
-        return out
+        written = 0
+        digest = hashlib.sha256()
+        try:
+            with open(out, "wb") as f:
+                for chunk in _read_chunks(uploaded_file, chunk_size):
+                    written += len(chunk)
+                    if max_bytes is not None and written > max_bytes:
+                        raise UploadTooLarge(f"Upload exceeds the {max_bytes} byte limit")
+                    digest.update(chunk)
+                    f.write(chunk)
+        except BaseException:
+            out.unlink(missing_ok=True)
+            raise
+        log.info("File saved for ingestion", uploaded=name, saved_as=str(out), bytes=written)
+        return out, digest.hexdigest()
     except Exception as e:
         log.error("Failed to save uploaded files", error=str(e), dir=str(target_dir))
         raise DocumentPortalException("Failed to save uploaded files", e) from e
-
-
@@ -0,0 +1,232 @@
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from logger import GLOBAL_LOGGER as log
+
+
+class ProviderStats:
+    """Rolling latency window, EWMA error rate and a simple circuit breaker for one provider."""
+
+    def __init__(self, window: int = 50, error_alpha: float = 0.2):
+        self.latencies: deque = deque(maxlen=window)
+        self.error_alpha = error_alpha
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.wins = 0
+        self._lock = threading.Lock()
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if not self.latencies:
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.latencies.append(latency)
+            self.error_rate *= 1 - self.error_alpha
+            self.consecutive_failures = 0
+            self.ejected_until = 0.0
+
+    def record_failure(self, failure_threshold: int, cooldown: float) -> bool:
+        """Returns True when this failure ejects the provider."""
+        with self._lock:
+            self.requests += 1
+            self.errors += 1
+            self.error_rate = self.error_rate * (1 - self.error_alpha) + self.error_alpha
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= failure_threshold:
+                self.ejected_until = time.monotonic() + cooldown
+                self.consecutive_failures = 0
+                return True
+            return False
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "wins": self.wins,
+            "error_rate": round(self.error_rate, 3),
+            "p50_ms": None if p50 is None else round(p50 * 1000, 1),
+            "p95_ms": None if p95 is None else round(p95 * 1000, 1),
+            "healthy": self.healthy(time.monotonic()),
+        }
+
+
+class LLMRouter(Runnable):
+    """
+    Sends each call to the fastest healthy provider, hedges to the next one
+    when the primary runs past its own p95 latency, and fails over on errors.
+
+    Providers are ranked by median latency inflated by their error rate;
+    providers with no samples yet rank first so they get measured. After
+    ``failure_threshold`` consecutive errors a provider is ejected for
+    ``cooldown_seconds``. The losing request of a hedge is cancelled.
+    """
+
+    def __init__(self, providers: Dict[str, Runnable], window: int = 50, hedge_percentile: float = 0.95,
+                 hedge_min_delay: float = 0.5, hedge_initial_delay: float = 5.0, min_samples: int = 5,
+                 max_hedges: int = 1, failure_threshold: int = 3, cooldown_seconds: float = 30.0,
+                 explore_ratio: float = 0.0):
+        if not providers:
+            raise ValueError("LLMRouter needs at least one provider")
+        self.providers = providers
+        self.stats = {name: ProviderStats(window) for name in providers}
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_initial_delay = hedge_initial_delay
+        self.min_samples = min_samples
+        self.max_hedges = max_hedges
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.explore_ratio = explore_ratio
+        self.hedges = 0
+        self.failovers = 0
+
+    @classmethod
+    def from_config(cls, providers: Dict[str, Runnable], cfg: Dict[str, Any]) -> "LLMRouter":
+        return cls(
+            providers,
+            window=cfg.get("window", 50),
+            hedge_percentile=cfg.get("hedge_percentile", 0.95),
+            hedge_min_delay=cfg.get("hedge_min_delay_seconds", 0.5),
+            hedge_initial_delay=cfg.get("hedge_initial_delay_seconds", 5.0),
+            min_samples=cfg.get("min_samples", 5),
+            max_hedges=cfg.get("max_hedges", 1),
+            failure_threshold=cfg.get("failure_threshold", 3),
+            cooldown_seconds=cfg.get("cooldown_seconds", 30.0),
+            explore_ratio=cfg.get("explore_ratio", 0.0),
+        )
+
+    def _score(self, name: str) -> float:
+        stats = self.stats[name]
+        median = stats.percentile(0.5)
+        if median is None:
+            return 0.0
+        return median / max(0.05, 1.0 - stats.error_rate)
+
+    def ranking(self) -> List[str]:
+        """Healthy providers fastest first, then ejected ones in order of recovery as a last resort."""
+        now = time.monotonic()
+        healthy = sorted((n for n in self.providers if self.stats[n].healthy(now)), key=self._score)
+        ejected = sorted((n for n in self.providers if not self.stats[n].healthy(now)),
+                         key=lambda n: self.stats[n].ejected_until)
+        if len(healthy) > 1 and random.random() < self.explore_ratio:
+            # Occasionally lead with a slower provider so its statistics stay current
+            healthy.insert(0, healthy.pop(random.randrange(1, len(healthy))))
+        return healthy + ejected
+
+    def hedge_delay(self, name: str) -> float:
+        stats = self.stats[name]
+        if len(stats.latencies) < self.min_samples:
+            return self.hedge_initial_delay
+        return max(self.hedge_min_delay, stats.percentile(self.hedge_percentile))
+
+    def _failed(self, name: str, error: Exception) -> None:
+        ejected = self.stats[name].record_failure(self.failure_threshold, self.cooldown_seconds)
+        log.warning("LLM provider call failed", provider=name, error=str(error)[:200], ejected=ejected)
+
+    async def _attempt(self, name: str, input: Any, config: Optional[RunnableConfig], kwargs: Dict[str, Any]):
+        start = time.monotonic()
+        try:
+            result = await self.providers[name].ainvoke(input, config, **kwargs)
+        except asyncio.CancelledError:
+            # Lost a hedge race; not the provider's fault
+            raise
+        except Exception as e:
+            self._failed(name, e)
+            raise
+        self.stats[name].record_success(time.monotonic() - start)
+        return result
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        queue = self.ranking()
+        pending: Dict[asyncio.Task, str] = {}
+        hedged = 0
+        last_error: Optional[Exception] = None
+        start = time.monotonic()
+        hedge_at = 0.0
+
+        def launch() -> None:
+            nonlocal hedge_at
+            name = queue.pop(0)
+            pending[asyncio.ensure_future(self._attempt(name, input, config, kwargs))] = name
+            hedge_at = time.monotonic() + self.hedge_delay(name)
+
+        launch()
+        try:
+            while pending:
+                can_hedge = queue and hedged < self.max_hedges
+                timeout = max(0.0, hedge_at - time.monotonic()) if can_hedge else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged += 1
+                    self.hedges += 1
+                    log.info("LLM request hedged", slow_provider=list(pending.values())[-1], hedge_provider=queue[0],
+                             after_ms=round((time.monotonic() - start) * 1000, 1))
+                    launch()
+                    continue
+
+                for task in done:
+                    name = pending.pop(task)
+                    if task.exception() is None:
+                        self.stats[name].wins += 1
+                        log.info("LLM request routed", provider=name, hedged=hedged > 0,
+                                 latency_ms=round((time.monotonic() - start) * 1000, 1))
+                        return task.result()
+                    last_error = task.exception()
+
+                if not pending and queue:
+                    self.failovers += 1
+                    log.warning("LLM failover", to_provider=queue[0], error=str(last_error)[:200])
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                # Let the losers finish cancelling so none is left pending or with an unobserved error
+                await asyncio.gather(*pending, return_exceptions=True)
+        raise last_error
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        # Sync callers get ordered failover only; hedging needs concurrent requests
+        last_error: Optional[Exception] = None
+        for attempt, name in enumerate(self.ranking()):
+            if attempt:
+                self.failovers += 1
+                log.warning("LLM failover", to_provider=name, error=str(last_error)[:200])
+            start = time.monotonic()
+            try:
+                result = self.providers[name].invoke(input, config, **kwargs)
+            except Exception as e:
+                self._failed(name, e)
+                last_error = e
+                continue
+            self.stats[name].record_success(time.monotonic() - start)
+            self.stats[name].wins += 1
+            log.info("LLM request routed", provider=name, hedged=False,
+                     latency_ms=round((time.monotonic() - start) * 1000, 1))
+            return result
+        raise last_error
+
+    def routing_stats(self) -> Dict[str, Any]:
+        return {
+            "hedges": self.hedges,
+            "failovers": self.failovers,
+            "providers": {name: stats.snapshot() for name, stats in self.stats.items()},
+        }
@@ -0,0 +1,77 @@
+import re
+import hashlib
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+@lru_cache(maxsize=200_000)
+def _bucket(feature: str, dimensions: int) -> Tuple[int, float]:
+    # Stable across processes (unlike hash()), so saved indexes stay valid
+    h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+    # Low bit picks the sign, the rest the bucket: a sparse random projection
+    return (h >> 1) % dimensions, (1.0 if h & 1 else -1.0)
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Network-free embeddings: signed feature hashing of word unigrams and
+    bigrams with sublinear TF weighting, L2-normalized.
+
+    Equivalent to a TF vectorizer followed by a sparse random projection to
+    ``dimensions``. Lower recall than a neural model, but deterministic,
+    free and fast; a whole batch is encoded into one NumPy matrix.
+    """
+
+    def __init__(self, dimensions: int = 512, bigrams: bool = True):
+        self.dimensions = dimensions
+        self.bigrams = bigrams
+
+    def _features(self, text: str) -> List[str]:
+        tokens = _TOKEN.findall(text.lower())
+        if self.bigrams:
+            return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        return tokens
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        rows, cols, signs = [], [], []
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                bucket, sign = _bucket(feature, self.dimensions)
+                rows.append(row)
+                cols.append(bucket)
+                signs.append(sign)
+
+        counts = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        # Signed term counts per bucket, accumulated for the whole batch at once
+        np.add.at(counts, (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)),
+                  np.asarray(signs, dtype=np.float32))
+        vectors = np.sign(counts) * np.log1p(np.abs(counts))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.clip(norms, 1e-12, None)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.encode(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.encode([text])[0].tolist()
+
+
+class SentenceTransformerEmbeddings(Embeddings):
+    """Small on-CPU model from a local sentence-transformers install."""
+
+    def __init__(self, model_name: str, batch_size: int = 64):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.batch_size = batch_size
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.model.encode(texts, batch_size=self.batch_size, normalize_embeddings=True).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
@@ -1,10 +1,10 @@
 import os
 import sys
 import json
+import threading
+from typing import Any, Dict, Optional, Tuple
 from dotenv import load_dotenv
 from utils.config_loader import load_config
-from langchain_google_genai import GoogleGenerativeAIEmbeddings, ChatGoogleGenerativeAI
-from langchain_groq import ChatGroq
 from logger import GLOBAL_LOGGER as log
 from exception.custom_exception import DocumentPortalException
 
@@ -53,52 +53,143 @@ class ApiKeyManager:
 class ModelLoader:
     """
     Loads embedding models and LLMs based on config and environment.
+
+    Clients are built once per (provider, model, params) and reused, so their
+    HTTP connection pools survive across calls. Remote clients are wrapped
+    with the provider's shared limiter from the ``rate_limits`` block. Use
+    ``get_model_loader()`` to share one loader across the process.
     """
 
-    def __init__(self):
+    def __init__(self, override_env: bool = False):
         if os.getenv("ENV", "local").lower() != "production":
-            load_dotenv()
+            # override_env: a reload takes edited .env values over the ones loaded at startup
+            load_dotenv(override=override_env)
             log.info("Running in LOCAL mode: .env loaded")
         else:
             log.info("Running in PRODUCTION mode")
 
         self.api_key_mgr = ApiKeyManager()
         self.config = load_config()
+        self._clients: Dict[Tuple, Any] = {}
+        # Re-entrant: the router build loads its provider clients through _client
+        self._clients_lock = threading.RLock()
         log.info("YAML config loaded", config_keys=list(self.config.keys()))
 
+    def _client(self, key: Tuple, build):
+        with self._clients_lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = build()
+                self._clients[key] = client
+            return client
+
+    def _rate_limited(self, limiter_key: str, client, wrapper: str):
+        """Wrap ``client`` with the process-wide limiter for ``limiter_key``, if one is configured."""
+        limits = self.config.get("rate_limits", {}).get(limiter_key)
+        if not limits:
+            return client
+        from utils import rate_limiter
+
+        log.info("Rate limiting enabled", provider=limiter_key, limits=limits)
+        return getattr(rate_limiter, wrapper)(client, rate_limiter.get_limiter(limiter_key, limits))
+
     def load_embeddings(self):
         """
         Load and return embedding model from Google Generative AI.
         """
         try:
-            model_name = self.config["embedding_model"]["model_name"]
-            log.info("Loading embedding model", model=model_name)
-            return GoogleGenerativeAIEmbeddings(model=model_name,
-                                                google_api_key=self.api_key_mgr.get("GOOGLE_API_KEY")) #type: ignore
+            embedding_cfg = self.config["embedding_model"]
+            provider = embedding_cfg.get("provider", "google")
+            model_name = embedding_cfg["model_name"]
+
+            if provider == "local":
+                return self._client(("embeddings", provider, model_name, embedding_cfg.get("dimensions")),
+                                    lambda: self._build_local_embeddings(embedding_cfg))
+            if provider != "google":
+                raise ValueError(f"Unsupported embedding provider: {provider}")
+
+            def build():
+                from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+                log.info("Loading embedding model", model=model_name)
+                embeddings = GoogleGenerativeAIEmbeddings(model=model_name,
+                                                          google_api_key=self.api_key_mgr.get("GOOGLE_API_KEY")) #type: ignore
+                return self._rate_limited("google_embeddings", embeddings, "RateLimitedEmbeddings")
+
+            return self._client(("embeddings", model_name), build)
         except Exception as e:
             log.error("Error loading embedding model", error=str(e))
             raise DocumentPortalException("Failed to load embedding model", sys)
 
-    def load_llm(self):
-        """
-        Load and return the configured LLM model.
-        """
+    @staticmethod
+    def _build_local_embeddings(embedding_cfg: dict):
+        """Network-free embeddings: feature hashing, or a locally installed sentence-transformers model."""
+        model_name = embedding_cfg["model_name"]
+        log.info("Loading local embedding model", model=model_name)
+        if model_name == "hashing":
+            from utils.local_embeddings import HashingEmbeddings
+            return HashingEmbeddings(dimensions=embedding_cfg.get("dimensions", 512))
+        from utils.local_embeddings import SentenceTransformerEmbeddings
+        return SentenceTransformerEmbeddings(model_name)
+
+    def _routing_config(self) -> dict:
+        routing = self.config.get("llm_routing", {})
+        return routing if routing.get("enabled") else {}
+
+    def _llm_config(self, provider_key: Optional[str] = None) -> dict:
         llm_block = self.config["llm"]
-        provider_key = os.getenv("LLM_PROVIDER", "google")
+        provider_key = provider_key or os.getenv("LLM_PROVIDER", "google")
 
         if provider_key not in llm_block:
             log.error("LLM provider not found in config", provider=provider_key)
             raise ValueError(f"LLM provider '{provider_key}' not found in config")
 
-        llm_config = llm_block[provider_key]
+        return llm_block[provider_key]
+
+    @staticmethod
+    def _describe(llm_config: dict) -> str:
+        return f"{llm_config.get('provider')}/{llm_config.get('model_name')}/t={llm_config.get('temperature', 0.2)}"
+
+    def llm_identity(self) -> str:
+        """Stable description of the configured LLM, used in cache keys."""
+        routing = self._routing_config()
+        if routing:
+            return "router[" + ",".join(self._describe(self._llm_config(k)) for k in routing["providers"]) + "]"
+        return self._describe(self._llm_config())
+
+    def load_llm(self):
+        """
+        Load and return the configured LLM model, or an LLMRouter over several
+        providers when ``llm_routing.enabled`` is set.
+        """
+        routing = self._routing_config()
+        if routing:
+            return self._client(("llm_router", tuple(routing["providers"])), lambda: self._build_router(routing))
+        return self._load_provider_llm(self._llm_config())
+
+    def _load_provider_llm(self, llm_config: dict):
         provider = llm_config.get("provider")
         model_name = llm_config.get("model_name")
         temperature = llm_config.get("temperature", 0.2)
         max_tokens = llm_config.get("max_output_tokens", 2048)
 
+        return self._client(("llm", provider, model_name, temperature, max_tokens),
+                            lambda: self._rate_limited(provider, self._build_llm(provider, model_name, temperature, max_tokens),
+                                                       "RateLimitedLLM"))
+
+    def _build_router(self, routing: dict):
+        from utils.llm_router import LLMRouter
+
+        providers = {key: self._load_provider_llm(self._llm_config(key)) for key in routing["providers"]}
+        log.info("LLM routing enabled", providers=list(providers))
+        return LLMRouter.from_config(providers, routing)
+
+    def _build_llm(self, provider, model_name, temperature, max_tokens):
         log.info("Loading LLM", provider=provider, model=model_name)
 
+        # Provider SDKs are imported on first use; they dominate import time
         if provider == "google":
+            from langchain_google_genai import ChatGoogleGenerativeAI
             return ChatGoogleGenerativeAI(
                 model=model_name,
                 google_api_key=self.api_key_mgr.get("GOOGLE_API_KEY"),
@@ -107,6 +198,7 @@ class ModelLoader:
             )
 
         elif provider == "groq":
+            from langchain_groq import ChatGroq
             return ChatGroq(
                 model=model_name,
                 api_key=self.api_key_mgr.get("GROQ_API_KEY"), #type: ignore
@@ -126,8 +218,35 @@ class ModelLoader:
             raise ValueError(f"Unsupported LLM provider: {provider}")
 
 
+_shared_loader: Optional[ModelLoader] = None
+_shared_lock = threading.Lock()
+
+
+def get_model_loader() -> ModelLoader:
+    """Process-wide ModelLoader: .env, API keys and config are read once."""
+    global _shared_loader
+    with _shared_lock:
+        if _shared_loader is None:
+            _shared_loader = ModelLoader()
+        return _shared_loader
+
+
+def reload_model_loader() -> ModelLoader:
+    """
+    Re-read .env, API keys and config.yaml and drop every cached client.
+    Callers that already hold a loader keep using the old clients until done.
+    The API calls this on SIGHUP (see api/main.py).
+    """
+    global _shared_loader
+    loader = ModelLoader(override_env=True)
+    with _shared_lock:
+        _shared_loader = loader
+    log.info("ModelLoader reloaded")
+    return loader
+
+
 if __name__ == "__main__":
-    loader = ModelLoader()
+    loader = get_model_loader()
 
     # Test Embedding
     embeddings = loader.load_embeddings()
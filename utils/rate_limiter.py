@@ -0,0 +1,345 @@
+import re
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from logger import GLOBAL_LOGGER as log
+
+T = TypeVar("T")
+Clock = Callable[[], float]
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token; only used to pace the tokens-per-minute bucket
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:
+    """Refills ``per_minute`` units per minute up to one minute's worth of burst."""
+
+    def __init__(self, per_minute: float, clock: Clock = time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` (possibly going negative) and return how long to wait before using it."""
+        with self._lock:
+            self._refill(self.clock())
+            # A single request larger than the bucket would otherwise never fit
+            self.tokens -= min(amount, self.capacity)
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def adjust(self, amount: float) -> None:
+        """Credit back (positive) or debit (negative) once the real cost is known."""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class AIMDConcurrency:
+    """
+    Additive-increase / multiplicative-decrease concurrency limit.
+
+    Every success grows the limit by ``1 / limit`` (about +1 per round of
+    requests); a rate-limit response multiplies it by ``decrease``, at most
+    once per ``cooldown`` seconds so one burst of 429s only halves it once.
+
+    Callers block until a slot frees up: threads on a ``threading.Condition``,
+    coroutines on a future that ``release()`` resolves (thread-safely, since
+    sync and async clients of one provider share the limiter).
+    """
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = 32,
+                 decrease: float = 0.5, cooldown: float = 5.0, clock: Clock = time.monotonic):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.clock = clock
+        self.in_flight = 0
+        self._last_decrease = None
+        self._cond = threading.Condition()
+        self._async_waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    def _take(self) -> bool:
+        if self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return True
+        return False
+
+    def _notify(self) -> None:
+        # Caller holds the lock; wake as many waiters as there are free slots
+        free = int(self.limit) - self.in_flight
+        if free <= 0:
+            return
+        self._cond.notify(free)
+        for _ in range(min(free, len(self._async_waiters))):
+            loop, future = self._async_waiters.popleft()
+            loop.call_soon_threadsafe(self._wake, future)
+
+    def _wake(self, future: asyncio.Future) -> None:
+        if future.done():
+            # The waiter was cancelled after being picked; pass the slot on
+            with self._cond:
+                self._notify()
+        else:
+            future.set_result(None)
+
+    def try_acquire(self) -> bool:
+        with self._cond:
+            return self._take()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while not self._take():
+                self._cond.wait()
+
+    async def aacquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._take():
+                    return
+                waiter = (loop, loop.create_future())
+                self._async_waiters.append(waiter)
+            try:
+                await waiter[1]
+            except asyncio.CancelledError:
+                with self._cond:
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
+                    elif waiter[1].done() and not waiter[1].cancelled():
+                        # Woken for a free slot but cancelled before taking it; wake someone else
+                        self._notify()
+                raise
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._notify()
+
+    def on_success(self) -> None:
+        with self._cond:
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self._notify()
+
+    def on_overload(self) -> None:
+        with self._cond:
+            now = self.clock()
+            if self._last_decrease is None or now - self._last_decrease >= self.cooldown:
+                self.limit = max(self.minimum, self.limit * self.decrease)
+                self._last_decrease = now
+                log.warning("Provider overloaded, reducing concurrency", limit=round(self.limit, 2))
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    status = getattr(exc, "status_code", None) or getattr(exc, "code", None)
+    if status in (429, 503) or type(exc).__name__ in ("RateLimitError", "ResourceExhausted", "TooManyRequests"):
+        return True
+    text = str(exc).lower()
+    return "429" in text or "resource_exhausted" in text or "rate limit" in text or "quota" in text
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """Server-provided wait, from a Retry-After header or a Gemini-style retryDelay."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    match = re.search(r'retry[ _-]?(?:after|delay|in)["\':\s]*(?:seconds:\s*)?([\d.]+)\s*s?', str(exc), re.I)
+    return float(match.group(1)) if match else None
+
+
+class ProviderLimiter:
+    """
+    Shared pacing for one provider: request and token buckets per minute,
+    AIMD concurrency, and retries with full-jitter exponential backoff that
+    waits at least as long as the provider's Retry-After.
+
+    The budget is reserved once per logical call, before the first attempt;
+    retries after a 429 reuse that reservation, and a call that finally
+    fails refunds its estimated tokens.
+    """
+
+    def __init__(self, name: str, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None, max_concurrency: int = 8,
+                 min_concurrency: int = 1, max_retries: int = 5,
+                 base_delay: float = 1.0, max_delay: float = 60.0, clock: Clock = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep,
+                 asleep: Callable[[float], Awaitable[None]] = asyncio.sleep):
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute, clock) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute, clock) if tokens_per_minute else None
+        self.concurrency = AIMDConcurrency(max_concurrency, minimum=min_concurrency, maximum=max_concurrency,
+                                           clock=clock)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._sleep = sleep
+        self._asleep = asleep
+
+    @classmethod
+    def from_config(cls, name: str, cfg: Dict[str, Any]) -> "ProviderLimiter":
+        return cls(
+            name,
+            requests_per_minute=cfg.get("requests_per_minute"),
+            tokens_per_minute=cfg.get("tokens_per_minute"),
+            max_concurrency=cfg.get("max_concurrency", 8),
+            min_concurrency=cfg.get("min_concurrency", 1),
+            max_retries=cfg.get("max_retries", 5),
+            base_delay=cfg.get("base_delay_seconds", 1.0),
+            max_delay=cfg.get("max_delay_seconds", 60.0),
+        )
+
+    def _pace(self, est_tokens: int) -> float:
+        wait = self.requests.reserve(1) if self.requests else 0.0
+        if self.tokens:
+            wait = max(wait, self.tokens.reserve(est_tokens))
+        return wait
+
+    def _settle(self, est_tokens: int, used_tokens: Optional[int]) -> None:
+        if self.tokens and used_tokens:
+            self.tokens.adjust(est_tokens - used_tokens)
+
+    def _refund(self, est_tokens: int) -> None:
+        # The call never produced output; give its token estimate back to other callers
+        if self.tokens:
+            self.tokens.adjust(est_tokens)
+
+    def _backoff(self, exc: BaseException, attempt: int) -> float:
+        self.concurrency.on_overload()
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        server = retry_after(exc)
+        if server is not None:
+            delay = max(delay, server)
+        log.warning("Rate limited, backing off", provider=self.name, attempt=attempt + 1,
+                    delay=round(delay, 2), error=str(exc)[:200])
+        return delay
+
+    async def arun(self, call: Callable[[], Awaitable[T]], est_tokens: int = 1,
+                   usage: Callable[[T], Optional[int]] = lambda _: None) -> T:
+        await self._asleep(self._pace(est_tokens))
+        for attempt in range(self.max_retries + 1):
+            await self.concurrency.aacquire()
+            try:
+                result = await call()
+            except Exception as e:
+                if not is_rate_limited(e) or attempt == self.max_retries:
+                    self._refund(est_tokens)
+                    raise
+                delay = self._backoff(e, attempt)
+            else:
+                self.concurrency.on_success()
+                self._settle(est_tokens, usage(result))
+                return result
+            finally:
+                self.concurrency.release()
+            await self._asleep(delay)
+        raise RuntimeError("unreachable")
+
+    def run(self, call: Callable[[], T], est_tokens: int = 1,
+            usage: Callable[[T], Optional[int]] = lambda _: None) -> T:
+        self._sleep(self._pace(est_tokens))
+        for attempt in range(self.max_retries + 1):
+            self.concurrency.acquire()
+            try:
+                result = call()
+            except Exception as e:
+                if not is_rate_limited(e) or attempt == self.max_retries:
+                    self._refund(est_tokens)
+                    raise
+                delay = self._backoff(e, attempt)
+            else:
+                self.concurrency.on_success()
+                self._settle(est_tokens, usage(result))
+                return result
+            finally:
+                self.concurrency.release()
+            self._sleep(delay)
+        raise RuntimeError("unreachable")
+
+
+def _message_tokens(message: Any) -> Optional[int]:
+    usage = getattr(message, "usage_metadata", None) or {}
+    return usage.get("total_tokens")
+
+
+def _input_text(value: Any) -> str:
+    return value.to_string() if hasattr(value, "to_string") else str(value)
+
+
+class RateLimitedLLM(Runnable):
+    """Chat model wrapper that routes every call through a ProviderLimiter; composes with ``|`` as before."""
+
+    def __init__(self, llm: Runnable, limiter: ProviderLimiter):
+        self.llm = llm
+        self.limiter = limiter
+
+    def __getattr__(self, name: str) -> Any:
+        # Model attributes (model_name, temperature, ...) stay reachable
+        return getattr(self.llm, name)
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        return self.limiter.run(lambda: self.llm.invoke(input, config, **kwargs),
+                                estimate_tokens(_input_text(input)), _message_tokens)
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        return await self.limiter.arun(lambda: self.llm.ainvoke(input, config, **kwargs),
+                                       estimate_tokens(_input_text(input)), _message_tokens)
+
+
+class RateLimitedEmbeddings(Embeddings):
+    """Embeddings wrapper sharing a ProviderLimiter; one request per call."""
+
+    def __init__(self, embeddings: Embeddings, limiter: ProviderLimiter):
+        self.embeddings = embeddings
+        self.limiter = limiter
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.limiter.run(lambda: self.embeddings.embed_documents(texts),
+                                sum(estimate_tokens(t) for t in texts))
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.limiter.run(lambda: self.embeddings.embed_query(text), estimate_tokens(text))
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.limiter.arun(lambda: self.embeddings.aembed_documents(texts),
+                                       sum(estimate_tokens(t) for t in texts))
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await self.limiter.arun(lambda: self.embeddings.aembed_query(text), estimate_tokens(text))
+
+
+_limiters: Dict[str, Tuple[Dict[str, Any], ProviderLimiter]] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(name: str, cfg: Dict[str, Any]) -> ProviderLimiter:
+    """
+    One limiter per provider for the whole process, so every client of that
+    provider shares its quota. A changed config block gets a fresh limiter.
+    """
+    with _limiters_lock:
+        entry = _limiters.get(name)
+        if entry is None or entry[0] != cfg:
+            entry = (dict(cfg), ProviderLimiter.from_config(name, cfg))
+            _limiters[name] = entry
+        return entry[1]
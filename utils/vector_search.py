@@ -0,0 +1,55 @@
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStoreRetriever
+
+
+def batch_searchable(retriever: Any) -> Optional[Any]:
+    """
+    Return the FAISS store behind a plain top-k similarity retriever, or None.
+
+    Retrievers with filters, MMR or score thresholds keep going through
+    ``ainvoke`` one query at a time, since a raw index search would ignore them.
+    """
+    if not isinstance(retriever, VectorStoreRetriever):
+        return None
+    vectorstore = retriever.vectorstore
+    if not all(hasattr(vectorstore, a) for a in ("index", "docstore", "index_to_docstore_id")):
+        return None
+    if retriever.search_type != "similarity":
+        return None
+    if set(retriever.search_kwargs) - {"k"}:
+        return None
+    return vectorstore
+
+
+def search_embeddings(vectorstore) -> Optional[Embeddings]:
+    """The embedding model a FAISS store was built with, if it is an Embeddings object."""
+    return getattr(vectorstore, "embeddings", None)
+
+
+def batch_similarity_search(vectorstore, vectors: Sequence[Sequence[float]], k: int) -> List[List[Document]]:
+    """One ``index.search`` for every query vector; same results as per-query similarity_search."""
+    if len(vectors) == 0:
+        return []
+    queries = np.array(vectors, dtype=np.float32)
+    if getattr(vectorstore, "_normalize_L2", False):
+        import faiss
+        faiss.normalize_L2(queries)
+
+    _, indices = vectorstore.index.search(queries, k)
+    results = []
+    for row in indices:
+        docs = []
+        for i in row:
+            if i == -1:
+                # Fewer than k vectors in the index
+                continue
+            doc = vectorstore.docstore.search(vectorstore.index_to_docstore_id[i])
+            if not isinstance(doc, Document):
+                raise ValueError(f"Could not find document for index {i}")
+            docs.append(doc)
+        results.append(docs)
+    return results
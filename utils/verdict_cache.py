@@ -0,0 +1,117 @@
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from langchain_core.documents import Document
+
+from logger import GLOBAL_LOGGER as log
+
+
+def normalize_claim(claim: str) -> str:
+    return re.sub(r'\W+', ' ', claim.lower()).strip()
+
+
+def context_fingerprint(docs: Iterable[Document]) -> str:
+    """Hash of the retrieved evidence: sources and text, in retrieval order."""
+    h = hashlib.sha256()
+    for doc in docs:
+        h.update(str(doc.metadata.get("source", "")).encode("utf-8"))
+        h.update(b"\0")
+        h.update(doc.page_content.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class VerdictCache:
+    """
+    Persistent verdict cache: SQLite on disk with an in-memory LRU in front.
+
+    Keys combine the normalized claim, the retrieved-context fingerprint, the
+    prompt version and the model, so editing the prompt or switching models
+    never serves stale verdicts. Entries expire after ``ttl_seconds``.
+    """
+
+    _instances: Dict[str, "VerdictCache"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: str = "verdict_cache/verdicts.db", ttl_seconds: int = 86400, memory_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts (key TEXT PRIMARY KEY, verdict TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def shared(cls, path: str = "verdict_cache/verdicts.db", **kwargs) -> "VerdictCache":
+        """One instance per database file, so the in-memory LRU is shared across requests."""
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path, **kwargs)
+            return cls._instances[path]
+
+    @staticmethod
+    def make_key(claim: str, context_hash: str, prompt_version: str, model: str) -> str:
+        raw = "\0".join([normalize_claim(claim), context_hash, prompt_version, model])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            hit = self._memory.get(key)
+            if hit is None:
+                row = self._conn.execute("SELECT verdict, created_at FROM verdicts WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    hit = (row[0], row[1])
+                    self._remember(key, hit)
+            else:
+                self._memory.move_to_end(key)
+
+            if hit is not None and now - hit[1] < self.ttl_seconds:
+                self.hits += 1
+                return hit[0]
+
+            if hit is not None:
+                # Expired: drop it from both tiers
+                self._memory.pop(key, None)
+                self._conn.execute("DELETE FROM verdicts WHERE key = ?", (key,))
+                self._conn.commit()
+            self.misses += 1
+            return None
+
+    def put(self, key: str, verdict: str) -> None:
+        entry = (verdict, time.time())
+        with self._lock:
+            self._remember(key, entry)
+            self._conn.execute("INSERT OR REPLACE INTO verdicts (key, verdict, created_at) VALUES (?, ?, ?)",
+                               (key, verdict, entry[1]))
+            self._conn.commit()
+
+    def _remember(self, key: str, entry: Tuple[str, float]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "memory_entries": len(self._memory)}
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM verdicts WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            self._conn.commit()
+            log.info("Expired verdicts purged", removed=cur.rowcount)
+            return cur.rowcount